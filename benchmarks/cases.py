@@ -0,0 +1,131 @@
+"""
+Benchmark cases. Each case runs against the simulated-latency provider, so
+timings reflect this library's overhead plus the configured provider latency.
+"""
+from io import StringIO
+from django import forms
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory
+from django_ai_validator.cache import LLMCacheManager
+from django_ai_validator.facade import AICleaningFacade
+from django_ai_validator.forms import AIConcurrentValidationMixin
+from django_ai_validator.tasks import ai_clean_model_batch
+from django_ai_validator.validators import AISemanticValidator
+from sandbox_app.admin import MockModelAdmin
+from sandbox_app.models import AsyncMockModel, DirtyMockModel, MockModel
+
+from .harness import benchmark
+
+PROMPT = "Clean this"
+VALUES = [f"dirty value {i}" for i in range(20)]
+ROWS = 200
+
+def cold_cache():
+    cache.clear()
+    LLMCacheManager().clear_local()
+
+def warm_cache():
+    cold_cache()
+    facade = AICleaningFacade()
+    for value in VALUES:
+        facade.validate(value, PROMPT)
+        facade.clean(value, PROMPT)
+
+def seed_rows(model, rows=ROWS, distinct=20):
+    """Rows with ``distinct`` dirty values, written without triggering any cleaning."""
+    cold_cache()
+    model.objects.all().delete()
+    # bulk_create skips post_save, and empty values are never cleaned by pre_save
+    model.objects.bulk_create([model() for _ in range(rows)])
+    pks = list(model.objects.order_by('pk').values_list('pk', flat=True))
+    for i in range(distinct):
+        model.objects.filter(pk__in=pks[i::distinct]).update(content=f"dirty row {i}")
+    return pks
+
+# --- Single calls -----------------------------------------------------------
+
+@benchmark('facade.validate.miss', operations=len(VALUES), setup=cold_cache)
+def validate_miss(_):
+    facade = AICleaningFacade()
+    for value in VALUES:
+        facade.validate(value, PROMPT)
+
+@benchmark('facade.validate.hit', operations=len(VALUES) * 50, setup=warm_cache)
+def validate_hit(_):
+    facade = AICleaningFacade()
+    for _ in range(50):
+        for value in VALUES:
+            facade.validate(value, PROMPT)
+
+@benchmark('facade.clean.miss', operations=len(VALUES), setup=cold_cache)
+def clean_miss(_):
+    facade = AICleaningFacade()
+    for value in VALUES:
+        facade.clean(value, PROMPT)
+
+@benchmark('facade.clean.hit', operations=len(VALUES) * 50, setup=warm_cache)
+def clean_hit(_):
+    facade = AICleaningFacade()
+    for _ in range(50):
+        for value in VALUES:
+            facade.clean(value, PROMPT)
+
+@benchmark('facade.clean_many.miss', operations=len(VALUES), setup=cold_cache)
+def clean_many_miss(_):
+    AICleaningFacade().clean_many(VALUES, PROMPT)
+
+@benchmark(
+    'facade.validate.rate_limited',
+    operations=len(VALUES),
+    setup=cold_cache,
+    simulation={'rate_limit_probability': 0.1, 'retry_after': 0.01},
+)
+def validate_rate_limited(_):
+    facade = AICleaningFacade()
+    for value in VALUES:
+        try:
+            facade.validate(value, PROMPT)
+        except Exception:
+            pass
+
+# --- Forms ------------------------------------------------------------------
+
+FORM_FIELDS = 5
+
+def _form_fields():
+    return {
+        f'field_{i}': forms.CharField(validators=[AISemanticValidator(prompt_template=f"Check field {i}")])
+        for i in range(FORM_FIELDS)
+    }
+
+SerialForm = type('SerialForm', (forms.Form,), _form_fields())
+ConcurrentForm = type('ConcurrentForm', (AIConcurrentValidationMixin, forms.Form), _form_fields())
+FORM_DATA = {f'field_{i}': f"value {i}" for i in range(FORM_FIELDS)}
+
+@benchmark('form.validate.serial', operations=1, setup=cold_cache)
+def form_serial(_):
+    SerialForm(data=FORM_DATA).is_valid()
+
+@benchmark('form.validate.concurrent', operations=1, setup=cold_cache)
+def form_concurrent(_):
+    ConcurrentForm(data=FORM_DATA).is_valid()
+
+# --- Bulk paths ---------------------------------------------------------------
+
+ADMIN_ROWS = 50
+
+@benchmark('admin.run_ai_cleanup_on_selected', operations=ADMIN_ROWS, setup=lambda: seed_rows(MockModel, rows=ADMIN_ROWS, distinct=10), repeat=3)
+def admin_bulk_action(_):
+    model_admin = MockModelAdmin(MockModel, AdminSite())
+    model_admin.message_user = lambda *args, **kwargs: None
+    model_admin.run_ai_cleanup_on_selected(RequestFactory().post('/'), MockModel.objects.all())
+
+@benchmark('tasks.ai_clean_model_batch', operations=ROWS, setup=lambda: seed_rows(AsyncMockModel), repeat=3)
+def celery_batch(pks):
+    ai_clean_model_batch('sandbox_app', 'asyncmockmodel', 'content', PROMPT, pks)
+
+@benchmark('command.ai_clean', operations=ROWS, setup=lambda: seed_rows(DirtyMockModel), repeat=3)
+def management_command(_):
+    call_command('ai_clean', 'sandbox_app.DirtyMockModel', '--field', 'content', '--batch-size', '100', stdout=StringIO())
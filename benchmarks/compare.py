@@ -0,0 +1,45 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare base.json head.json [--threshold 0.10]
+
+Exits with status 1 when any benchmark's median time grew by more than the
+threshold (a fraction of the base median).
+"""
+import argparse
+import json
+import sys
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    print(f"base {base.get('commit') or '?'}  ->  head {head.get('commit') or '?'}")
+    regressions = []
+    for name in sorted(set(base['results']) | set(head['results'])):
+        if name not in base['results'] or name not in head['results']:
+            print(f"{name:<40} only in {'head' if name in head['results'] else 'base'}")
+            continue
+        before = base['results'][name]['median']
+        after = head['results'][name]['median']
+        change = (after - before) / before if before else 0.0
+        marker = ''
+        if change > args.threshold:
+            marker = '  REGRESSION'
+            regressions.append(name)
+        elif change < -args.threshold:
+            marker = '  improved'
+        print(f"{name:<40} {before * 1000:9.2f} ms -> {after * 1000:9.2f} ms  {change:+7.1%}{marker}")
+
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Minimal benchmark harness: registers benchmark functions, runs them against
+the sandbox project with the simulated-latency provider and collects timings
+plus provider and cache statistics.
+"""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'sandbox'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sandbox_proj.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.test.utils import override_settings, setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+from django_ai_validator.cache import LLMCacheManager  # noqa: E402
+from django_ai_validator.llm.registry import AdapterRegistry, reset_adapter_registry  # noqa: E402
+
+# Fast enough for the whole suite to finish in well under a minute, slow
+# enough that provider latency dominates like it does in production.
+DEFAULT_SIMULATION = {
+    'latency_ms': 20.0,
+    'jitter_ms': 5.0,
+    'distribution': 'lognormal',
+    'seed': 1234,
+}
+
+BENCHMARKS = {}
+
+def benchmark(name, operations=1, setup=None, simulation=None, repeat=5):
+    """
+    Register ``func`` as a benchmark. ``setup`` runs before every repetition
+    (outside the timed section); ``operations`` is the number of logical
+    operations per run, used to report throughput.
+    """
+    def decorator(func):
+        BENCHMARKS[name] = {
+            'func': func,
+            'operations': operations,
+            'setup': setup,
+            'simulation': {**DEFAULT_SIMULATION, **(simulation or {})},
+            'repeat': repeat,
+        }
+        return func
+    return decorator
+
+def simulated_adapter():
+    adapter = AdapterRegistry().get_client('simulated')
+    # Unwrap the caching and resilience proxies
+    while hasattr(adapter, 'adapter'):
+        adapter = adapter.adapter
+    return adapter
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def run_benchmark(name, repeat=None):
+    spec = BENCHMARKS[name]
+    repeat = repeat or spec['repeat']
+    with override_settings(AI_CLEANER_DEFAULT_PROVIDER='simulated', AI_CLEANER_SIMULATION=spec['simulation']):
+        reset_adapter_registry()
+        cache.clear()
+        manager = LLMCacheManager()
+        manager.clear_local()
+
+        samples, provider_totals, cache_totals = [], {}, {}
+        for _ in range(repeat):
+            context = spec['setup']() if spec['setup'] else None
+            adapter = simulated_adapter()
+            adapter.reset_stats()
+            manager.reset_stats()
+
+            started = time.perf_counter()
+            spec['func'](context)
+            samples.append(time.perf_counter() - started)
+
+            for key, value in adapter.stats.items():
+                provider_totals[key] = provider_totals.get(key, 0) + value
+            for key, value in manager.stats().items():
+                cache_totals[key] = cache_totals.get(key, 0) + value
+
+    median = statistics.median(samples)
+    return {
+        'repeat': repeat,
+        'operations': spec['operations'],
+        'min': min(samples),
+        'median': median,
+        'mean': statistics.mean(samples),
+        'p95': _percentile(samples, 0.95),
+        'ops_per_second': spec['operations'] / median if median else None,
+        'provider': {key: value / repeat for key, value in provider_totals.items()},
+        'cache': {key: value / repeat for key, value in cache_totals.items()},
+    }
+
+class benchmark_database:
+    """Context manager creating the sandbox test database for the run."""
+    def __enter__(self):
+        setup_test_environment()
+        self._old_config = setup_databases(verbosity=0, interactive=False)
+        return self
+
+    def __exit__(self, *exc_info):
+        teardown_databases(self._old_config, verbosity=0)
@@ -0,0 +1,58 @@
+"""
+Run the benchmark suite and save the results as JSON.
+
+    python -m benchmarks.run --output results.json [--filter form.] [--repeat 5]
+
+Compare two result files with ``python -m benchmarks.compare``.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from .harness import BENCHMARKS, ROOT, benchmark_database, run_benchmark
+from . import cases  # noqa: F401  (registers the benchmarks)
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help="Write results to this JSON file.")
+    parser.add_argument('--filter', default='', help="Only run benchmarks whose name contains this string.")
+    parser.add_argument('--repeat', type=int, default=None, help="Override the number of repetitions per benchmark.")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = {}
+    with benchmark_database():
+        for name in names:
+            result = run_benchmark(name, repeat=args.repeat)
+            results[name] = result
+            print(
+                f"{name:<40} median {result['median'] * 1000:9.2f} ms  "
+                f"p95 {result['p95'] * 1000:9.2f} ms  "
+                f"{result['ops_per_second']:10.1f} ops/s  "
+                f"{result['provider'].get('requests', 0):6.1f} requests"
+            )
+
+    report = {
+        'commit': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from django_ai_validator.facade import AICleaningFacade
-from django_ai_validator.cache import LLMCacheManager
+from django_ai_validator.cache import LLMCacheManager, build_cache_key
 from django.core.cache import cache
 import time
 
@@ -22,7 +22,7 @@ manager = LLMCacheManager()
 # Reconstruct key logic from Proxy
 prompt_template = "Clean this"
 value = "dirty data"
-cache_key_content = f"CLEAN:{prompt_template}:{value}"
+cache_key_content = build_cache_key("clean", prompt_template, value)
 # Mock adapter model is 'mock-model'
 model = "mock-model"
 cached_val = manager.get(cache_key_content, model)
@@ -5,7 +5,8 @@ class SandboxAppConfig(AppConfig):
     name = 'sandbox_app'
 
     def ready(self):
-        # Register the mock provider so it's available in shell and tests
+        # Register the mock providers so they're available in shell, tests and benchmarks
         from django_ai_validator.llm.factory import LLMFactory
-        from django_ai_validator.llm.mock_factory import MockFactory
+        from django_ai_validator.llm.mock_factory import MockFactory, SimulatedLatencyFactory
         LLMFactory.register('mock', MockFactory)
+        LLMFactory.register('simulated', SimulatedLatencyFactory)
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:06
+
+import django_ai_validator.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sandbox_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirtyMockModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_dirty', models.BooleanField(default=False, help_text='Flag indicating if the data needs AI cleaning/validation.')),
+                ('content', django_ai_validator.fields.AICleanedField(blank=True, cleaning_prompt='Clean this')),
+                ('title', django_ai_validator.fields.AICleanedField(blank=True, cleaning_prompt='Clean this title')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
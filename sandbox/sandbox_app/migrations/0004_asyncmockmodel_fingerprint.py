@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:08
+
+import django_ai_validator.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sandbox_app', '0003_asyncmockmodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asyncmockmodel',
+            name='content_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='asyncmockmodel',
+            name='content',
+            field=django_ai_validator.fields.AICleanedField(blank=True, cleaning_prompt='Clean this', fingerprint_field='content_fingerprint', use_async=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:33
+
+import django_ai_validator.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sandbox_app', '0004_asyncmockmodel_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkMockModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', django_ai_validator.fields.AICleanedField(blank=True, cleaning_prompt='Clean this')),
+                ('title', django_ai_validator.fields.AICleanedField(blank=True, cleaning_prompt='Clean this title')),
+                ('note', models.CharField(blank=True, max_length=100)),
+            ],
+        ),
+    ]
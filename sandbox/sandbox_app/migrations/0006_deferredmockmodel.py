@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:35
+
+import django_ai_validator.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sandbox_app', '0005_bulkmockmodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeferredMockModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_dirty', models.BooleanField(default=False, help_text='Flag indicating if the data needs AI cleaning/validation.')),
+                ('dirty_reason', models.TextField(blank=True, default='', help_text='Why the row is flagged, e.g. a failed AI validation.')),
+                ('name', models.CharField(blank=True, max_length=100, validators=[django_ai_validator.validators.AISemanticValidator('Validate this', code='limit_value', deferred=True)])),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='asyncmockmodel',
+            name='dirty_reason',
+            field=models.TextField(blank=True, default='', help_text='Why the row is flagged, e.g. a failed AI validation.'),
+        ),
+        migrations.AddField(
+            model_name='dirtymockmodel',
+            name='dirty_reason',
+            field=models.TextField(blank=True, default='', help_text='Why the row is flagged, e.g. a failed AI validation.'),
+        ),
+    ]
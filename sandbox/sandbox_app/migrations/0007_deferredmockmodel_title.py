@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:38
+
+import django_ai_validator.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sandbox_app', '0006_deferredmockmodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deferredmockmodel',
+            name='title',
+            field=models.CharField(blank=True, max_length=100, validators=[django_ai_validator.validators.AISemanticValidator('Validate this title', code='limit_value')]),
+        ),
+    ]
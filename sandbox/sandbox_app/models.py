@@ -1,6 +1,8 @@
 from django.db import models
 from django_ai_validator.validators import AISemanticValidator
 from django_ai_validator.fields import AICleanedField
+from django_ai_validator.managers import AIManager
+from django_ai_validator.models import AIDirtyMixin
 
 class MockModel(models.Model):
     content = AICleanedField(cleaning_prompt="Clean this", blank=True)
@@ -9,3 +11,30 @@ class MockModel(models.Model):
         validators=[AISemanticValidator(prompt_template="Validate this")],
         blank=True
     )
+
+class DirtyMockModel(AIDirtyMixin, models.Model):
+    content = AICleanedField(cleaning_prompt="Clean this", blank=True)
+    title = AICleanedField(cleaning_prompt="Clean this title", blank=True)
+
+class AsyncMockModel(AIDirtyMixin, models.Model):
+    content = AICleanedField(cleaning_prompt="Clean this", use_async=True, fingerprint_field='content_fingerprint', blank=True)
+    content_fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+
+class BulkMockModel(models.Model):
+    content = AICleanedField(cleaning_prompt="Clean this", blank=True)
+    title = AICleanedField(cleaning_prompt="Clean this title", blank=True)
+    note = models.CharField(max_length=100, blank=True)
+
+    objects = AIManager()
+
+class DeferredMockModel(AIDirtyMixin, models.Model):
+    name = models.CharField(
+        max_length=100,
+        validators=[AISemanticValidator(prompt_template="Validate this", deferred=True)],
+        blank=True
+    )
+    title = models.CharField(
+        max_length=100,
+        validators=[AISemanticValidator(prompt_template="Validate this title")],
+        blank=True
+    )
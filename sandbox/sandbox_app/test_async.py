@@ -0,0 +1,68 @@
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django_ai_validator.facade import AICleaningFacade
+from django_ai_validator.llm.adapters import OpenAIAdapter, OllamaAdapter
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.llm.proxy import CachingLLMProxy
+from django_ai_validator.validators import AISemanticValidator
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class AsyncValidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    async def test_facade_async_methods(self):
+        facade = AICleaningFacade()
+        self.assertEqual(await facade.aclean("dirty value", "Clean this"), "clean value")
+        self.assertEqual(await facade.avalidate("bad value", "Check this"), (False, "Value contains 'bad'"))
+
+    async def test_validator_acall(self):
+        validator = AISemanticValidator(prompt_template="Check this")
+        await validator.acall("good value")
+        with self.assertRaises(ValidationError):
+            await validator.acall("bad value")
+
+    async def test_avalidate_fields_collects_errors_per_field(self):
+        validator = AISemanticValidator(prompt_template="Check this")
+        with self.assertRaises(ValidationError) as cm:
+            await AISemanticValidator.avalidate_fields({
+                'title': (validator, "good title"),
+                'body': (validator, "bad body"),
+                'summary': (validator, "bad summary"),
+            })
+        self.assertEqual(set(cm.exception.error_dict), {'body', 'summary'})
+
+    async def test_proxy_caches_async_results(self):
+        adapter = MockAdapter()
+        proxy = CachingLLMProxy(adapter)
+        with patch.object(adapter, 'clean', wraps=adapter.clean) as mock_clean:
+            await proxy.aclean("dirty async", "Clean this")
+            await proxy.aclean("dirty async", "Clean this")
+        mock_clean.assert_called_once()
+
+class AsyncAdapterTests(TestCase):
+    async def test_openai_async_client(self):
+        mock_openai = MagicMock()
+        with patch.dict(sys.modules, {'openai': mock_openai}):
+            mock_async_client = MagicMock()
+            mock_openai.AsyncOpenAI.return_value = mock_async_client
+            mock_completion = MagicMock()
+            mock_completion.choices[0].message.content = "VALID"
+            mock_async_client.chat.completions.create = AsyncMock(return_value=mock_completion)
+
+            adapter = OpenAIAdapter(api_key="fake-key")
+            self.assertEqual(await adapter.avalidate("test", "prompt"), (True, None))
+            mock_openai.OpenAI.return_value.chat.completions.create.assert_not_called()
+
+    async def test_ollama_async_client(self):
+        mock_ollama = MagicMock()
+        with patch.dict(sys.modules, {'ollama': mock_ollama}):
+            mock_async_client = MagicMock()
+            mock_ollama.AsyncClient.return_value = mock_async_client
+            mock_async_client.chat = AsyncMock(return_value={'message': {'content': ' cleaned '}})
+
+            adapter = OllamaAdapter(host="fake-host")
+            self.assertEqual(await adapter.aclean("dirty", "prompt"), "cleaned")
@@ -0,0 +1,193 @@
+import json
+import shutil
+import sys
+import tempfile
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django_ai_validator.facade import AICleaningFacade
+from django_ai_validator.llm.batch import BATCH_COMPLETED, LocalBatchBackend, OpenAIBatchBackend, get_batch_backend
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.models import AIBatchJob
+from django_ai_validator.pipeline import BatchPipeline
+from .models import BulkMockModel, DirtyMockModel
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class BatchPipelineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.batch_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.batch_dir)
+        settings_override = override_settings(AI_CLEANER_BATCH_DIR=self.batch_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        DirtyMockModel.objects.bulk_create([DirtyMockModel() for _ in range(4)])
+        # Write dirty values directly, as an import would
+        for row, content in zip(DirtyMockModel.objects.order_by('pk'), ["dirty a", "dirty b", "dirty a", ""]):
+            DirtyMockModel.objects.filter(pk=row.pk).update(content=content, is_dirty=True)
+
+    def make_job(self):
+        return AIBatchJob.objects.create(
+            target='sandbox_app.DirtyMockModel.content', prompt_template="Clean this", backend='local', provider='mock',
+        )
+
+    def test_run_cleans_distinct_values_and_fills_the_cache(self):
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=MockAdapter.clean) as mock_clean:
+            job = BatchPipeline(self.make_job()).run(poll_interval=0)
+            self.assertEqual(sorted(call.args[1] for call in mock_clean.call_args_list), ["dirty a", "dirty b"])
+
+            self.assertEqual(job.status, AIBatchJob.STATUS_APPLIED)
+            self.assertEqual((job.request_count, job.rows_updated, job.failed_count), (2, 3, 0))
+            self.assertEqual(
+                list(DirtyMockModel.objects.order_by('pk').values_list('content', 'is_dirty')),
+                [("clean a", False), ("clean b", False), ("clean a", False), ("", True)],
+            )
+            # The per-request path now finds the batch results in the cache
+            self.assertEqual(AICleaningFacade().clean("dirty b", "Clean this"), "clean b")
+            self.assertEqual(mock_clean.call_count, 2)
+
+    def test_interrupted_jobs_resume_where_they_stopped(self):
+        job = self.make_job()
+        pipeline = BatchPipeline(job, chunk_size=1)
+        original = pipeline._apply_chunk
+        def apply_then_die(cleaned, position):
+            if position > 1:
+                raise RuntimeError("killed")
+            original(cleaned, position)
+        with patch.object(pipeline, '_apply_chunk', side_effect=apply_then_die):
+            with self.assertRaises(RuntimeError):
+                pipeline.run(poll_interval=0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.results_applied), (AIBatchJob.STATUS_COMPLETED, 1))
+
+        with patch.object(MockAdapter, 'clean') as mock_clean:
+            BatchPipeline(job, chunk_size=1).run(poll_interval=0)
+        # Results come from the finished batch; nothing is processed again
+        mock_clean.assert_not_called()
+        self.assertEqual((job.status, job.results_applied), (AIBatchJob.STATUS_APPLIED, 2))
+        self.assertEqual(set(DirtyMockModel.objects.values_list('content', flat=True)), {"clean a", "clean b", ""})
+
+    def test_rows_edited_during_the_job_keep_their_value(self):
+        first = DirtyMockModel.objects.order_by('pk').first()
+        clean = MockAdapter.clean
+        def edit_while_cleaning(adapter, value, prompt_template):
+            DirtyMockModel.objects.filter(pk=first.pk).update(content="edited")
+            return clean(adapter, value, prompt_template)
+
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=edit_while_cleaning):
+            job = BatchPipeline(self.make_job()).run(poll_interval=0)
+        self.assertEqual(job.rows_updated, 2)
+        self.assertEqual(
+            list(DirtyMockModel.objects.order_by('pk').values_list('content', flat=True)), ["edited", "clean b", "clean a", ""]
+        )
+
+    def test_failed_results_are_counted_and_left_alone(self):
+        with patch.object(MockAdapter, 'clean', side_effect=RuntimeError("down")):
+            job = BatchPipeline(self.make_job()).run(poll_interval=0)
+        self.assertEqual((job.status, job.failed_count, job.rows_updated), (AIBatchJob.STATUS_APPLIED, 2, 0))
+        self.assertEqual(DirtyMockModel.objects.filter(content="dirty a").count(), 2)
+
+    def test_no_wait_leaves_running_batches_submitted(self):
+        job = self.make_job()
+        with patch.object(LocalBatchBackend, 'poll', return_value=('running', None)):
+            BatchPipeline(job).run(wait=False)
+        self.assertEqual(job.status, AIBatchJob.STATUS_SUBMITTED)
+        self.assertEqual(len(job.batch_ids), 1)
+
+        BatchPipeline(job).run(wait=False)
+        self.assertEqual(job.status, AIBatchJob.STATUS_APPLIED)
+
+    def test_large_jobs_are_split_into_several_batches(self):
+        row = DirtyMockModel.objects.create()
+        DirtyMockModel.objects.filter(pk=row.pk).update(content="dirty c")
+        backend = get_batch_backend('local')
+        backend.max_requests = 2
+        job = BatchPipeline(self.make_job(), backend=backend).run(poll_interval=0)
+        self.assertEqual((job.status, job.request_count, len(job.batch_ids)), (AIBatchJob.STATUS_APPLIED, 3, 2))
+        self.assertEqual(job.rows_updated, 4)
+
+        backend.max_requests, backend.max_bytes = None, 1
+        pipeline = BatchPipeline(self.make_job(), backend=backend)
+        pipeline.prepare()
+        # A request over the size limit still gets a batch of its own
+        self.assertEqual(len(pipeline.request_paths), 3)
+
+    def test_partly_submitted_jobs_submit_the_rest(self):
+        backend = get_batch_backend('local')
+        backend.max_requests = 1
+        job = self.make_job()
+        submit = backend.submit
+        def submit_once(path):
+            if job.batch_ids:
+                raise RuntimeError("killed")
+            return submit(path)
+        with patch.object(backend, 'submit', side_effect=submit_once):
+            with self.assertRaises(RuntimeError):
+                BatchPipeline(job, backend=backend).run(poll_interval=0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, len(job.batch_ids)), (AIBatchJob.STATUS_PENDING, 1))
+
+        first_batch = job.batch_ids[0]
+        with patch.object(backend, 'submit', wraps=submit) as mock_submit:
+            BatchPipeline(job, backend=backend).run(poll_interval=0)
+        mock_submit.assert_called_once()
+        self.assertEqual((job.status, job.batch_ids[0], job.rows_updated), (AIBatchJob.STATUS_APPLIED, first_batch, 3))
+
+    def test_command_with_ai_manager(self):
+        BulkMockModel.objects.bulk_create([BulkMockModel(note="x"), BulkMockModel(note="y")])
+        QuerySet(BulkMockModel).update(content="dirty text")
+        out = StringIO()
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=MockAdapter.clean) as mock_clean:
+            call_command('ai_batch_clean', 'sandbox_app.BulkMockModel.content', backend='local', poll_interval=0, stdout=out)
+        # The AIManager's update() does not clean the batch results again
+        self.assertEqual(mock_clean.call_count, 1)
+        self.assertEqual(set(BulkMockModel.objects.values_list('content', flat=True)), {"clean text"})
+        self.assertIn("2 row(s) updated", out.getvalue())
+
+        job = AIBatchJob.objects.get()
+        call_command('ai_batch_clean', resume=job.pk, stdout=out)
+        self.assertIn(f"Batch job {job.pk} applied", out.getvalue())
+
+    def test_command_errors(self):
+        with self.assertRaisesMessage(CommandError, "app_label.ModelName.field"):
+            call_command('ai_batch_clean')
+        with self.assertRaisesMessage(CommandError, "no cleaning prompt"):
+            call_command('ai_batch_clean', 'sandbox_app.BulkMockModel.note')
+        with self.assertRaisesMessage(CommandError, "does not exist"):
+            call_command('ai_batch_clean', resume=999)
+
+    @override_settings(AI_CLEANER_DEFAULT_PROVIDER='ollama')
+    def test_unknown_backends_leave_no_job_behind(self):
+        with self.assertRaisesMessage(CommandError, "Unknown batch backend: ollama"):
+            call_command('ai_batch_clean', 'sandbox_app.BulkMockModel.content')
+        self.assertFalse(AIBatchJob.objects.exists())
+
+class OpenAIBatchBackendTests(TestCase):
+    def make_backend(self):
+        with patch.dict(sys.modules, {'openai': MagicMock()}):
+            return get_batch_backend('openai')
+
+    def test_requests_match_the_per_request_path(self):
+        backend = self.make_backend()
+        self.assertIsInstance(backend, OpenAIBatchBackend)
+        request = backend.build_request("id-1", 'clean', "dirty a", "Clean this")
+        self.assertEqual(request['url'], '/v1/chat/completions')
+        self.assertEqual(request['body']['model'], backend.model)
+        self.assertEqual(request['body']['messages'][1]['content'], backend.adapter._cleaning_prompt("dirty a", "Clean this"))
+
+    def test_results_are_streamed_and_parsed(self):
+        backend = self.make_backend()
+        client = backend.adapter.client
+        client.batches.retrieve.return_value = MagicMock(status='completed', output_file_id='file-out', error_file_id=None)
+        lines = [
+            json.dumps({'custom_id': "a", 'response': {'body': {'choices': [{'message': {'content': "VALID"}}]}}}),
+            json.dumps({'custom_id': "b", 'response': None, 'error': {'message': "bad request"}}),
+        ]
+        client.files.with_streaming_response.content.return_value.__enter__.return_value.iter_lines.return_value = lines
+        self.assertEqual(backend.poll("batch-1"), (BATCH_COMPLETED, None))
+        self.assertEqual(list(backend.results("batch-1", 'validate')), [("a", (True, None)), ("b", None)])
@@ -0,0 +1,112 @@
+import json
+import sys
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator.facade import AICleaningFacade
+from django_ai_validator.llm.adapters import AnthropicAdapter, GeminiAdapter, OllamaAdapter, OpenAIAdapter, estimate_tokens
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.llm.proxy import CachingLLMProxy
+
+def completion(content):
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+class BatchedAdapterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.mock_openai = MagicMock()
+        patcher = patch.dict(sys.modules, {'openai': self.mock_openai})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.create = self.mock_openai.OpenAI.return_value.chat.completions.create
+        self.adapter = OpenAIAdapter(api_key="fake-key")
+
+    def test_clean_many_uses_one_request(self):
+        self.create.return_value = completion(json.dumps([
+            {"index": 1, "value": "B"},
+            {"index": 0, "value": "A"},
+            {"index": 2, "value": "C"},
+        ]))
+        self.assertEqual(self.adapter.clean_many(["a", "b", "c"], "Uppercase"), ["A", "B", "C"])
+        self.create.assert_called_once()
+
+    def test_validate_many_falls_back_for_unparsed_items(self):
+        self.create.side_effect = [
+            completion('```json\n[{"index": 0, "valid": true}, {"index": 1, "valid": "maybe"}]\n```'),
+            completion("Not a real name."),
+        ]
+        results = self.adapter.validate_many(["Ada Lovelace", "asdf"], "Check name")
+        self.assertEqual(results, [(True, None), (False, "Not a real name.")])
+        self.assertEqual(self.create.call_count, 2)
+
+    @override_settings(AI_CLEANER_BATCH_SIZE=2)
+    def test_values_are_chunked(self):
+        self.create.side_effect = [
+            completion('[{"index": 0, "value": "A"}, {"index": 1, "value": "B"}]'),
+            completion('C'),
+        ]
+        self.assertEqual(self.adapter.clean_many(["a", "b", "c"], "Uppercase"), ["A", "B", "C"])
+        self.assertEqual(self.create.call_count, 2)
+
+    def test_chunks_fit_the_token_budget(self):
+        values = ["x" * 40] * 4
+        item_tokens = estimate_tokens(json.dumps({"index": 0, "input": values[0]}))
+        with override_settings(AI_CLEANER_BATCH_TOKEN_BUDGET=item_tokens * 2):
+            self.assertEqual(self.adapter._chunk_values(values), [[0, 1], [2, 3]])
+
+    def test_proxy_sends_only_distinct_misses(self):
+        proxy = CachingLLMProxy(self.adapter)
+        self.create.return_value = completion("A")
+        proxy.clean("a", "Uppercase")
+
+        self.create.reset_mock()
+        self.create.return_value = completion('[{"index": 0, "value": "B"}, {"index": 1, "value": "C"}]')
+        self.assertEqual(proxy.clean_many(["a", "b", "c", "b"], "Uppercase"), ["A", "B", "C", "B"])
+        self.create.assert_called_once()
+        self.assertIn('"input": "b"', self.create.call_args.kwargs['messages'][1]['content'])
+        self.assertNotIn('"input": "a"', self.create.call_args.kwargs['messages'][1]['content'])
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class FacadeBatchTests(TestCase):
+    def test_adapter_without_batching_falls_back_to_single_calls(self):
+        cache.clear()
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=MockAdapter.clean) as mock_clean:
+            results = AICleaningFacade().clean_many(["dirty 1", "dirty 2"], "Clean this")
+        self.assertEqual(results, ["clean 1", "clean 2"])
+        self.assertEqual(mock_clean.call_count, 2)
+
+# Batch prompts rely on their system prompt and a larger max_tokens on every provider
+class ProviderCompletionTests(TestCase):
+    def test_openai(self):
+        with patch.dict(sys.modules, {'openai': MagicMock()}):
+            adapter = OpenAIAdapter(api_key="fake-key")
+        adapter._complete("prompt", system="Answer in JSON.", max_tokens=4096)
+        kwargs = adapter.client.chat.completions.create.call_args.kwargs
+        self.assertEqual((kwargs['messages'][0]['content'], kwargs['max_tokens']), ("Answer in JSON.", 4096))
+
+    def test_anthropic(self):
+        with patch.dict(sys.modules, {'anthropic': MagicMock()}):
+            adapter = AnthropicAdapter(api_key="fake-key")
+        adapter._complete("prompt", system="Answer in JSON.", max_tokens=4096)
+        kwargs = adapter.client.messages.create.call_args.kwargs
+        self.assertEqual((kwargs['system'], kwargs['max_tokens']), ("Answer in JSON.", 4096))
+
+    def test_gemini(self):
+        genai = MagicMock()
+        with patch.dict(sys.modules, {'google': MagicMock(generativeai=genai), 'google.generativeai': genai}):
+            adapter = GeminiAdapter(api_key="fake-key")
+        adapter._complete("prompt", system="Answer in JSON.", max_tokens=4096)
+        call = adapter.client.generate_content.call_args
+        self.assertEqual(call.args[0], "Answer in JSON.\n\nprompt")
+        self.assertEqual(call.kwargs['generation_config'], {'max_output_tokens': 4096})
+
+    def test_ollama(self):
+        with patch.dict(sys.modules, {'ollama': MagicMock()}):
+            adapter = OllamaAdapter(host="fake-host")
+        adapter.client.chat.return_value = {'message': {'content': "[]"}}
+        adapter._complete("prompt", system="Answer in JSON.", max_tokens=4096)
+        kwargs = adapter.client.chat.call_args.kwargs
+        self.assertEqual(kwargs['messages'][0], {'role': 'system', 'content': "Answer in JSON."})
+        self.assertEqual(kwargs['options'], {'num_predict': 4096})
@@ -0,0 +1,141 @@
+import time
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django_ai_validator.budget import (
+    BudgetExceededError, LatencyBudgetMiddleware, cap_timeout, get_budget, latency_budget,
+)
+from django_ai_validator.llm.adapters import _request_timeout
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.llm.resilience import CircuitBreaker, ResilientLLMProxy
+from django_ai_validator.signals import validation_skipped
+from django_ai_validator.tasks import ai_validate_deferred
+from django_ai_validator.validators import AISemanticValidator, prefetched_validations
+from .models import DeferredMockModel
+
+class RetryableTimeout(Exception):
+    pass
+
+class LatencyBudgetTests(TestCase):
+    def test_timeouts_are_capped_to_the_time_left(self):
+        self.assertEqual(cap_timeout(10), 10)
+        with latency_budget(5):
+            self.assertLessEqual(cap_timeout(10), 5)
+            self.assertLessEqual(cap_timeout(None), 5)
+            token = _request_timeout.set(10)
+            try:
+                self.assertLessEqual(MockAdapter()._timeout_kwargs()['timeout'], 5)
+            finally:
+                _request_timeout.reset(token)
+
+    def test_nested_budgets_never_outlive_the_outer_one(self):
+        with latency_budget(1) as outer:
+            with latency_budget(60) as inner:
+                self.assertLessEqual(inner.deadline, outer.deadline)
+                inner.record_skip("validator", "value")
+        self.assertEqual(outer.skipped, [("validator", "value")])
+
+    def test_spent_budget_stops_provider_calls(self):
+        adapter = MagicMock(model="mock-model")
+        proxy = ResilientLLMProxy(adapter, breaker=CircuitBreaker(min_requests=1))
+        with latency_budget(0):
+            with self.assertRaises(BudgetExceededError):
+                proxy.validate("value", "Validate this")
+        adapter.validate.assert_not_called()
+
+    def test_retries_stop_at_the_deadline(self):
+        adapter = MagicMock(model="mock-model")
+        adapter.validate.side_effect = RetryableTimeout("slow")
+        sleep = MagicMock()
+        proxy = ResilientLLMProxy(adapter, max_attempts=5, backoff_base=1.0, breaker=CircuitBreaker(min_requests=1), sleep=sleep)
+        # A fixed jitter, so the backoff always outlasts the budget
+        with latency_budget(0.05), patch('django_ai_validator.llm.resilience.random.uniform', return_value=0.5):
+            with self.assertRaises(RetryableTimeout):
+                proxy.validate("value", "Validate this")
+        sleep.assert_not_called()
+
+    def test_middleware_opens_a_budget_per_request(self):
+        seen = []
+        def view(request):
+            seen.append((get_budget(), request.ai_latency_budget))
+            return "response"
+        with override_settings(AI_CLEANER_LATENCY_BUDGET=0.3):
+            self.assertEqual(LatencyBudgetMiddleware(view)(RequestFactory().get('/')), "response")
+        budget, request_budget = seen[0]
+        self.assertIs(budget, request_budget)
+        self.assertEqual(budget.seconds, 0.3)
+        self.assertIsNone(get_budget())
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class BudgetedValidatorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_validators_are_skipped_once_the_budget_is_spent(self):
+        validator = AISemanticValidator("Validate this")
+        receiver = MagicMock()
+        validation_skipped.connect(receiver)
+        self.addCleanup(validation_skipped.disconnect, receiver)
+        with patch.object(MockAdapter, 'validate') as mock_validate:
+            with latency_budget(0, on_exhausted='skip') as budget:
+                validator("bad value")
+        mock_validate.assert_not_called()
+        self.assertEqual(budget.skipped, [(validator, "bad value")])
+        self.assertEqual(receiver.call_args.kwargs['policy'], 'skip')
+
+    def test_calls_cut_short_are_skipped(self):
+        def slow_validate(value, prompt_template):
+            time.sleep(0.06)
+            raise TimeoutError("timed out")
+        validator = AISemanticValidator("Validate this", budget=0.05)
+        with patch.object(MockAdapter, 'validate', side_effect=slow_validate):
+            validator("bad value")
+
+    def test_prefetch_stops_once_the_budget_is_spent(self):
+        validator = AISemanticValidator("Validate this")
+        with patch.object(MockAdapter, 'validate') as mock_validate:
+            with latency_budget(0, on_exhausted='skip') as budget:
+                with prefetched_validations([(validator, "bad value"), (validator, "other value")]):
+                    validator("bad value")
+        mock_validate.assert_not_called()
+        self.assertCountEqual(budget.skipped, [(validator, "bad value"), (validator, "other value")])
+
+    def test_prefetch_honors_validator_budgets(self):
+        def slow_validate(value, prompt_template):
+            time.sleep(0.06)
+            raise TimeoutError("timed out")
+        validator = AISemanticValidator("Validate this", budget=0.05)
+        with patch.object(MockAdapter, 'validate', side_effect=slow_validate) as mock_validate:
+            with latency_budget(60) as budget:
+                with prefetched_validations([(validator, "bad value")]):
+                    validator("bad value")
+        # Cut short by the validator's own budget, then skipped instead of retried live
+        self.assertEqual(mock_validate.call_count, 1)
+        self.assertEqual(budget.skipped, [(validator, "bad value")])
+
+    def test_failures_within_budget_still_raise(self):
+        with patch.object(MockAdapter, 'validate', side_effect=RuntimeError("down")):
+            with latency_budget(60):
+                with self.assertRaises(RuntimeError):
+                    AISemanticValidator("Validate this")("bad value")
+
+    def test_deferred_checks_flag_the_row(self):
+        with latency_budget(0, on_exhausted='defer'):
+            row = DeferredMockModel(title="bad title")
+            row.full_clean()
+            with patch('django_ai_validator.tasks.ai_validate_deferred.delay', side_effect=ai_validate_deferred) as mock_delay:
+                with self.captureOnCommitCallbacks(execute=True):
+                    row.save()
+        self.assertEqual(mock_delay.call_args.args[3], ['title'])
+        row.refresh_from_db()
+        self.assertEqual((row.is_dirty, row.dirty_reason), (True, "title: Value contains 'bad'"))
+
+    def test_skipped_checks_leave_the_row_alone(self):
+        with latency_budget(0, on_exhausted='skip'):
+            row = DeferredMockModel(title="bad title")
+            row.full_clean()
+            with patch('django_ai_validator.tasks.ai_validate_deferred.delay') as mock_delay:
+                with self.captureOnCommitCallbacks(execute=True):
+                    row.save()
+        mock_delay.assert_not_called()
+        self.assertFalse(row.is_dirty)
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django_ai_validator.cache import LLMCacheManager, LocalLRUCache
+
+TWO_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+    'llm': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'llm'},
+}
+
+class LocalLRUCacheTests(TestCase):
+    def test_evicts_least_recently_used_entry(self):
+        local = LocalLRUCache(max_entries=2)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+        self.assertEqual((local.get('a'), local.get('b'), local.get('c')), (1, None, 3))
+
+    def test_evicts_by_size_in_bytes(self):
+        local = LocalLRUCache(max_entries=100, max_bytes=200)
+        local.set('a', 'x' * 120)
+        local.set('b', 'y' * 120)
+        self.assertIsNone(local.get('a'))
+        self.assertEqual(len(local), 1)
+
+    def test_entries_expire(self):
+        local = LocalLRUCache(timeout=60)
+        local.set('a', 1, timeout=-1)
+        self.assertIsNone(local.get('a'))
+
+@override_settings(AI_CLEANER_LOCAL_CACHE={'MAX_ENTRIES': 10, 'TIMEOUT': 60})
+class TwoTierCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = LLMCacheManager()
+        self.manager.clear_local()
+        self.manager.reset_stats()
+
+    def test_hits_are_served_from_local_tier(self):
+        self.manager.set("CLEAN:p:v", "model", "cleaned")
+        with patch.object(type(self.manager.backend), 'get') as backend_get:
+            self.assertEqual(self.manager.get("CLEAN:p:v", "model"), "cleaned")
+        backend_get.assert_not_called()
+        self.assertEqual(self.manager.stats()['l1_hits'], 1)
+
+    def test_backend_hits_populate_local_tier(self):
+        cache.set(self.manager._generate_key("CLEAN:p:w", "model"), "from redis")
+        self.assertEqual(self.manager.get("CLEAN:p:w", "model"), "from redis")
+        self.assertEqual(self.manager.get("CLEAN:p:w", "model"), "from redis")
+        self.assertEqual(
+            self.manager.stats(),
+            {'l1_hits': 1, 'l1_misses': 1, 'l2_hits': 1, 'l2_misses': 0, 'store_hits': 0, 'store_misses': 0},
+        )
+
+    def test_get_many_counts_each_tier(self):
+        self.manager.set("a", "model", 1)
+        cache.set(self.manager._generate_key("b", "model"), 2)
+        self.manager.clear_local()
+        self.manager.set("c", "model", 3)
+        self.assertEqual(self.manager.get_many(["a", "b", "c", "d"], "model"), {"a": 1, "b": 2, "c": 3})
+        self.assertEqual(
+            self.manager.stats(),
+            {'l1_hits': 1, 'l1_misses': 3, 'l2_hits': 2, 'l2_misses': 1, 'store_hits': 0, 'store_misses': 0},
+        )
+
+@override_settings(CACHES=TWO_CACHES, AI_CLEANER_CACHE_ALIAS='llm')
+class CacheAliasTests(TestCase):
+    def test_entries_are_stored_in_configured_alias(self):
+        manager = LLMCacheManager()
+        manager.set("CLEAN:p:alias", "model", "cleaned")
+        key = manager._generate_key("CLEAN:p:alias", "model")
+        self.assertEqual(caches['llm'].get(key), "cleaned")
+        self.assertIsNone(caches['default'].get(key))
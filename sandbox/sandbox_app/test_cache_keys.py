@@ -0,0 +1,74 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator.cache import (
+    LLMCacheManager, build_cache_key, cache_key_options, get_cache_timeout, normalize_value,
+)
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.llm.proxy import CachingLLMProxy
+from django_ai_validator.validators import AISemanticValidator
+
+class CacheKeyTests(TestCase):
+    def test_normalizers(self):
+        self.assertEqual(normalize_value("  Acme   Corp ", ['collapse_whitespace', 'casefold']), "acme corp")
+        self.assertEqual(normalize_value("ＡＣＭＥ", ['nfkc']), "ACME")
+        self.assertEqual(normalize_value("Acme", [str.upper]), "ACME")
+
+    def test_keys_are_namespaced_by_prompt_and_version(self):
+        key = build_cache_key('clean', "Clean this", "value")
+        self.assertTrue(key.startswith("CLEAN:"))
+        self.assertNotEqual(key, build_cache_key('clean', "Clean this, please", "value"))
+        with cache_key_options(version=2):
+            self.assertNotEqual(key, build_cache_key('clean', "Clean this", "value"))
+
+    @override_settings(AI_CLEANER_CACHE_NORMALIZERS=['strip', 'lower'])
+    def test_global_normalizers_and_per_call_override(self):
+        self.assertEqual(build_cache_key('validate', "p", " Acme"), build_cache_key('validate', "p", "acme"))
+        with cache_key_options(normalizers=[]):
+            self.assertNotEqual(build_cache_key('validate', "p", " Acme"), build_cache_key('validate', "p", "acme"))
+
+    @override_settings(AI_CLEANER_CACHE_TIMEOUT=600, AI_CLEANER_CACHE_TIMEOUTS={'validate': 60})
+    def test_per_operation_timeouts(self):
+        self.assertEqual(get_cache_timeout('validate'), 60)
+        self.assertEqual(get_cache_timeout('clean'), 600)
+
+@override_settings(AI_CLEANER_LOCAL_CACHE=None)
+class NormalizedCachingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.adapter = MockAdapter()
+        self.proxy = CachingLLMProxy(self.adapter)
+
+    def test_normalized_values_share_an_entry(self):
+        with cache_key_options(normalizers=['collapse_whitespace', 'casefold']):
+            self.proxy.validate("Acme  Corp", "Is this a company?")
+            with patch.object(self.adapter, 'validate') as mock_validate:
+                self.proxy.validate(" acme corp ", "Is this a company?")
+        mock_validate.assert_not_called()
+
+    def test_batch_sends_one_value_per_normalized_key(self):
+        with cache_key_options(normalizers=['casefold']):
+            with patch.object(self.adapter, 'clean_many', return_value=["clean"]) as mock_clean_many:
+                results = self.proxy.clean_many(["Dirty", "dirty", "DIRTY"], "Clean this")
+        mock_clean_many.assert_called_once_with(["Dirty"], "Clean this")
+        self.assertEqual(results, ["clean", "clean", "clean"])
+
+    @override_settings(AI_CLEANER_CACHE_TIMEOUTS={'clean': 120})
+    def test_stores_with_operation_timeout(self):
+        with patch.object(LLMCacheManager, 'set') as mock_set:
+            self.proxy.clean("dirty", "Clean this")
+        self.assertEqual(mock_set.call_args.args[-1], 120)
+
+    @patch('django_ai_validator.facade.AICleaningFacade.validate')
+    def test_validator_applies_its_cache_options(self, mock_validate):
+        seen = []
+        mock_validate.side_effect = lambda value, prompt: seen.append(build_cache_key('validate', prompt, value)) or (True, None)
+        AISemanticValidator("Is this a company?", cache_normalizers=['lower'], cache_version='v2')("ACME")
+        with cache_key_options(['lower'], 'v2'):
+            self.assertEqual(seen, [build_cache_key('validate', "Is this a company?", "acme")])
+
+    def test_validator_deconstruct(self):
+        validator = AISemanticValidator("p", cache_normalizers=['strip'], cache_version=3)
+        _, _, kwargs = validator.deconstruct()
+        self.assertEqual((kwargs['cache_normalizers'], kwargs['cache_version']), (['strip'], 3))
+        self.assertNotEqual(validator, AISemanticValidator("p", cache_normalizers=['strip'], cache_version=4))
@@ -0,0 +1,100 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator import instrumentation
+from django_ai_validator.llm.cascade import CascadeAdapter, escalate_on_unsure
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.llm.registry import AdapterRegistry, reset_adapter_registry
+from django_ai_validator.signals import llm_cascade_decision
+from django_ai_validator.validators import AISemanticValidator
+
+class ScriptedAdapter(MockAdapter):
+    def __init__(self, answers):
+        super().__init__()
+        self.answers = answers
+        self.prompts = []
+
+    def validate(self, value, prompt_template):
+        self.prompts.append(prompt_template)
+        return self.answers[value]
+
+    def validate_many(self, values, prompt_template):
+        return [self.validate(value, prompt_template) for value in values]
+
+    async def avalidate(self, value, prompt_template):
+        return self.validate(value, prompt_template)
+
+class FailingAdapter(MockAdapter):
+    def validate(self, value, prompt_template):
+        raise RuntimeError("fast model down")
+
+    def validate_many(self, values, prompt_template):
+        raise RuntimeError("fast model down")
+
+    async def avalidate(self, value, prompt_template):
+        raise RuntimeError("fast model down")
+
+class CascadeAdapterTests(TestCase):
+    def setUp(self):
+        self.fast = ScriptedAdapter({'ok': (True, None), 'no': (False, "Too short"), 'hmm': (False, "UNSURE")})
+        self.strong = ScriptedAdapter({'ok': (True, None), 'no': (True, None), 'hmm': (False, "Not an address")})
+
+    def test_only_negative_answers_escalate_by_default(self):
+        cascade = CascadeAdapter(self.fast, self.strong)
+        self.assertEqual(cascade.validate('ok', "Check"), (True, None))
+        self.assertEqual(cascade.validate('no', "Check"), (True, None))
+        self.assertEqual(len(self.strong.prompts), 1)
+        # The fast model is allowed to say it is unsure
+        self.assertIn("UNSURE", self.fast.prompts[0])
+
+    def test_escalate_on_unsure_policy(self):
+        cascade = CascadeAdapter(self.fast, self.strong, escalate=escalate_on_unsure)
+        self.assertEqual(cascade.validate_many(['ok', 'no', 'hmm'], "Check"), [(True, None), (False, "Too short"), (False, "Not an address")])
+        self.assertEqual(len(self.strong.prompts), 1)
+
+    def test_fast_model_failures_escalate(self):
+        decisions = []
+        def receiver(sender, **kwargs):
+            decisions.append((kwargs['escalated'], kwargs['count']))
+        llm_cascade_decision.connect(receiver)
+        self.addCleanup(llm_cascade_decision.disconnect, receiver)
+
+        cascade = CascadeAdapter(FailingAdapter(), self.strong)
+        with instrumentation.track('mock', cascade.model, 'validate', "Check"):
+            self.assertEqual(cascade.validate('hmm', "Check"), (False, "Not an address"))
+            self.assertEqual(cascade.validate_many(['ok', 'no'], "Check"), [(True, None), (True, None)])
+            self.assertEqual(async_to_sync(cascade.avalidate)('ok', "Check"), (True, None))
+        self.assertEqual(decisions, [(True, 1), (True, 2), (True, 1)])
+        # The strong model gets the original prompt, without the UNSURE instruction
+        self.assertEqual(self.strong.prompts, ["Check"] * 4)
+
+@override_settings(
+    AI_CLEANER_DEFAULT_PROVIDER='mock',
+    AI_CLEANER_CASCADE={'FAST': 'mock', 'STRONG': 'simulated', 'OPTIONS': {'simulated': {'latency_ms': 0, 'jitter_ms': 0}}},
+)
+class CascadeValidatorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_adapter_registry()
+        self.addCleanup(reset_adapter_registry)
+
+    def test_validator_cascade_mode_and_hit_rate_signal(self):
+        decisions = []
+        def receiver(sender, **kwargs):
+            decisions.append(kwargs['escalated'])
+        llm_cascade_decision.connect(receiver)
+        self.addCleanup(llm_cascade_decision.disconnect, receiver)
+
+        validator = AISemanticValidator("Check this", cascade=True)
+        validator("fine value")
+        with self.assertRaises(Exception):
+            validator("bad value")
+
+        self.assertEqual(decisions, [False, True])
+        strong = AdapterRegistry().get_client('cascade').adapter.strong.adapter
+        self.assertEqual(strong.stats['requests'], 1)
+
+    def test_deconstruct_keeps_cascade(self):
+        validator = AISemanticValidator("Check this", cascade=True)
+        self.assertTrue(validator.deconstruct()[2]['cascade'])
+        self.assertNotEqual(validator, AISemanticValidator("Check this"))
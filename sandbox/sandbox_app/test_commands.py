@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django_ai_validator.cache import LLMCacheManager, build_cache_key, cache_key_options
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from .models import DirtyMockModel, MockModel
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class AICleanCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def make_rows(self, *contents, is_dirty=True):
+        rows = [DirtyMockModel.objects.create() for _ in contents]
+        for row, content in zip(rows, contents):
+            # Bypass AICleanedField.pre_save so the rows stay dirty
+            DirtyMockModel.objects.filter(pk=row.pk).update(content=content, is_dirty=is_dirty)
+        return rows
+
+    def test_cleans_rows_and_dedupes_values(self):
+        self.make_rows("dirty a", "dirty a", "dirty b", "already clean")
+        out = StringIO()
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=MockAdapter.clean) as mock_clean:
+            call_command('ai_clean', 'sandbox_app.DirtyMockModel', '--field', 'content', '--batch-size', '10', stdout=out)
+
+        self.assertEqual(
+            list(DirtyMockModel.objects.order_by('pk').values_list('content', 'is_dirty')),
+            [("clean a", False), ("clean a", False), ("clean b", False), ("already clean", False)],
+        )
+        self.assertEqual(mock_clean.call_count, 3)
+        self.assertIn("4 rows", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+
+    def test_only_dirty(self):
+        clean_row, = self.make_rows("dirty kept", is_dirty=False)
+        self.make_rows("dirty processed")
+        call_command('ai_clean', 'sandbox_app.DirtyMockModel', '--only-dirty', stdout=StringIO())
+        clean_row.refresh_from_db()
+        self.assertEqual(clean_row.content, "dirty kept")
+        self.assertTrue(DirtyMockModel.objects.filter(content="clean processed").exists())
+
+    def test_validation_quarantines_survive_cleaning(self):
+        row, = self.make_rows("dirty quarantined")
+        DirtyMockModel.objects.filter(pk=row.pk).update(dirty_reason="content: Too vague.")
+        call_command('ai_clean', 'sandbox_app.DirtyMockModel', '--only-dirty', stdout=StringIO())
+        row.refresh_from_db()
+        self.assertEqual((row.content, row.is_dirty), ("clean quarantined", True))
+
+    def test_resumes_from_checkpoint(self):
+        first, second, third = self.make_rows("dirty 1", "dirty 2", "dirty 3")
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'checkpoint.json')
+            with open(checkpoint, 'w') as f:
+                json.dump({'last_pk': str(first.pk)}, f)
+
+            call_command('ai_clean', 'sandbox_app.DirtyMockModel', '--batch-size', '1', '--checkpoint', checkpoint, stdout=StringIO())
+
+            with open(checkpoint) as f:
+                self.assertEqual(json.load(f), {'last_pk': str(third.pk)})
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.content, second.content), ("dirty 1", "clean 2"))
+
+    def test_only_dirty_requires_flag(self):
+        with self.assertRaises(CommandError):
+            call_command('ai_clean', 'sandbox_app.MockModel', '--only-dirty', stdout=StringIO())
+
+    def test_rejects_unknown_field(self):
+        with self.assertRaises(CommandError):
+            call_command('ai_clean', 'sandbox_app.MockModel', '--field', 'validated_content', stdout=StringIO())
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock', AI_CLEANER_LOCAL_CACHE=None)
+class AICacheWarmCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for content in ("dirty a", "dirty a", "dirty b", ""):
+            row = MockModel.objects.create()
+            MockModel.objects.filter(pk=row.pk).update(content=content, validated_content=content)
+
+    def cached(self, operation, prompt, value):
+        return LLMCacheManager().get(build_cache_key(operation, prompt, value), "mock-model")
+
+    def test_warms_distinct_values(self):
+        out = StringIO()
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=MockAdapter.clean) as mock_clean:
+            call_command('ai_cache_warm', 'sandbox_app.MockModel.content', stdout=out)
+        self.assertEqual(mock_clean.call_count, 2)
+        self.assertEqual(self.cached('clean', "Clean this", "dirty b"), "clean b")
+        self.assertIn("2 distinct value(s)", out.getvalue())
+
+        # A second run is served from the cache
+        out = StringIO()
+        call_command('ai_cache_warm', 'sandbox_app.MockModel.content', stdout=out)
+        self.assertIn("0 computed, 2 already cached", out.getvalue())
+
+    def test_warms_validators(self):
+        call_command('ai_cache_warm', 'sandbox_app.MockModel.validated_content', stdout=StringIO())
+        self.assertEqual(self.cached('validate', "Validate this", "dirty a"), (True, None))
+
+    def test_warms_a_new_prompt_version(self):
+        call_command(
+            'ai_cache_warm', 'sandbox_app.MockModel.content', '--cache-version', 'v2', '--prompt', "Clean this better",
+            stdout=StringIO(),
+        )
+        self.assertIsNone(self.cached('clean', "Clean this better", "dirty a"))
+        with cache_key_options(version='v2'):
+            self.assertEqual(self.cached('clean', "Clean this better", "dirty a"), "clean a")
+
+    @patch('django_ai_validator.management.commands.ai_cache_warm.time.sleep')
+    def test_rate_limit(self, mock_sleep):
+        call_command('ai_cache_warm', 'sandbox_app.MockModel.content', '--rate', '1', '--batch-size', '1', stdout=StringIO())
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_rejects_fields_without_ai(self):
+        with self.assertRaises(CommandError):
+            call_command('ai_cache_warm', 'sandbox_app.MockModel.id', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('ai_cache_warm', 'sandbox_app.MockModel.missing', stdout=StringIO())
@@ -0,0 +1,201 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.test import TestCase, override_settings
+from django.test.utils import isolate_apps
+from django_ai_validator.checks import check_deferred_validators
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.models import PENDING_VALIDATION_REASON, AIDirtyMixin
+from django_ai_validator.prefilters import RegexPrefilter
+from django_ai_validator.signals import deferred_validation_finished
+from django_ai_validator.tasks import ai_validate_deferred
+from django_ai_validator.validators import AISemanticValidator, prefetched_validations
+from .models import DeferredMockModel
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class DeferredValidatorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_undecided_values_are_accepted_without_a_provider_call(self):
+        validator = AISemanticValidator("Validate this", deferred=True)
+        with patch.object(MockAdapter, 'validate') as mock_validate:
+            validator("bad value")
+        mock_validate.assert_not_called()
+
+    def test_cached_verdicts_are_enforced(self):
+        with self.assertRaises(ValidationError):
+            AISemanticValidator("Validate this")("bad value")
+        with self.assertRaises(ValidationError):
+            AISemanticValidator("Validate this", deferred=True)("bad value")
+
+    def test_prefilters_are_enforced(self):
+        validator = AISemanticValidator("Validate this", deferred=True, prefilters=[RegexPrefilter(r"\d", valid_on_match=False)])
+        with self.assertRaises(ValidationError):
+            validator("R2D2")
+
+    async def test_async_deferred_validation(self):
+        validator = AISemanticValidator("Validate this", deferred=True)
+        with patch.object(MockAdapter, 'avalidate') as mock_avalidate:
+            await validator.acall("bad value")
+        mock_avalidate.assert_not_called()
+
+    def test_prefetch_skips_deferred_validators(self):
+        validator = AISemanticValidator("Validate this", deferred=True)
+        with patch.object(MockAdapter, 'validate') as mock_validate:
+            with prefetched_validations([(validator, "bad value")]):
+                validator("bad value")
+        mock_validate.assert_not_called()
+
+    def test_deconstruct(self):
+        validator = AISemanticValidator("Validate this", deferred=True)
+        path, args, kwargs = validator.deconstruct()
+        self.assertTrue(kwargs['deferred'])
+        self.assertNotEqual(validator, AISemanticValidator("Validate this"))
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class DeferredRowTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def run_tasks_eagerly(self):
+        return patch('django_ai_validator.tasks.ai_validate_deferred.delay', side_effect=ai_validate_deferred)
+
+    def test_undecided_rows_are_flagged_and_validated_after_commit(self):
+        finished = []
+        def receiver(sender, **kwargs):
+            finished.append((kwargs['value'], kwargs['is_valid'], kwargs['instance'].is_dirty))
+        deferred_validation_finished.connect(receiver, sender=DeferredMockModel)
+        self.addCleanup(deferred_validation_finished.disconnect, receiver, sender=DeferredMockModel)
+
+        with self.run_tasks_eagerly() as mock_delay:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                good = DeferredMockModel.objects.create(name="good name")
+                bad = DeferredMockModel.objects.create(name="bad name")
+            # Flagged as pending until the background validation has run
+            self.assertEqual(
+                list(DeferredMockModel.objects.values_list('is_dirty', 'dirty_reason')),
+                [(True, PENDING_VALIDATION_REASON)] * 2,
+            )
+            for callback in callbacks:
+                callback()
+        self.assertEqual(mock_delay.call_count, 2)
+
+        good.refresh_from_db()
+        bad.refresh_from_db()
+        self.assertEqual((good.is_dirty, good.dirty_reason), (False, ""))
+        self.assertEqual((bad.is_dirty, bad.dirty_reason), (True, "name: Value contains 'bad'"))
+        self.assertEqual(finished, [("good name", True, False), ("bad name", False, True)])
+
+    def test_decided_values_are_not_queued(self):
+        AISemanticValidator("Validate this")("good name")
+        with patch('django_ai_validator.tasks.ai_validate_deferred.delay') as mock_delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                row = DeferredMockModel.objects.create(name="good name")
+        mock_delay.assert_not_called()
+        self.assertFalse(row.is_dirty)
+
+    def test_rows_flagged_for_another_reason_are_left_alone(self):
+        with patch('django_ai_validator.tasks.ai_validate_deferred.delay'):
+            row = DeferredMockModel.objects.create(name="good name")
+        DeferredMockModel.objects.filter(pk=row.pk).update(dirty_reason="Needs review.")
+        ai_validate_deferred('sandbox_app', 'deferredmockmodel', row.pk, ['name'])
+        row.refresh_from_db()
+        self.assertEqual((row.is_dirty, row.dirty_reason), (True, "Needs review."))
+
+    def test_rows_edited_to_a_decided_value_are_no_longer_pending(self):
+        with patch('django_ai_validator.tasks.ai_validate_deferred.delay'):
+            row = DeferredMockModel.objects.create(name="good name")
+        self.assertEqual(row.dirty_reason, PENDING_VALIDATION_REASON)
+        AISemanticValidator("Validate this")("fine name")
+        row.name = "fine name"
+        row.save(update_fields=['name'])
+        row.refresh_from_db()
+        self.assertEqual((row.is_dirty, row.dirty_reason), (False, ""))
+
+    def test_provider_errors_are_retried(self):
+        with patch('django_ai_validator.tasks.ai_validate_deferred.delay'):
+            row = DeferredMockModel.objects.create(name="bad name")
+        with patch.object(MockAdapter, 'validate', side_effect=[RuntimeError("down"), (False, "Value contains 'bad'")]):
+            ai_validate_deferred.apply(args=('sandbox_app', 'deferredmockmodel', row.pk, ['name']))
+        row.refresh_from_db()
+        self.assertEqual((row.is_dirty, row.dirty_reason), (True, "name: Value contains 'bad'"))
+
+    @override_settings(AI_CLEANER_FAILURE_POLICY='fail_open')
+    def test_provider_errors_skip_the_failure_policy(self):
+        with patch('django_ai_validator.tasks.ai_validate_deferred.delay'):
+            row = DeferredMockModel.objects.create(name="bad name")
+        with patch.object(MockAdapter, 'validate', side_effect=RuntimeError("down")):
+            with self.assertRaises(RuntimeError):
+                ai_validate_deferred('sandbox_app', 'deferredmockmodel', row.pk, ['name'])
+        row.refresh_from_db()
+        self.assertEqual((row.is_dirty, row.dirty_reason), (True, PENDING_VALIDATION_REASON))
+
+    def test_quarantined_rows_edited_to_a_valid_value_are_cleared(self):
+        with self.run_tasks_eagerly():
+            with self.captureOnCommitCallbacks(execute=True):
+                row = DeferredMockModel.objects.create(name="bad name")
+        row.refresh_from_db()
+        self.assertEqual(row.dirty_reason, "name: Value contains 'bad'")
+        AISemanticValidator("Validate this")("fine name")
+        row.name = "fine name"
+        row.save(update_fields=['name'])
+        row.refresh_from_db()
+        self.assertEqual((row.is_dirty, row.dirty_reason), (False, ""))
+
+    def test_quarantined_rows_edited_to_an_undecided_value_are_pending(self):
+        with self.run_tasks_eagerly():
+            with self.captureOnCommitCallbacks(execute=True):
+                row = DeferredMockModel.objects.create(name="bad name")
+        row.refresh_from_db()
+        with patch('django_ai_validator.tasks.ai_validate_deferred.delay') as mock_delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                row.name = "new name"
+                row.save()
+        row.refresh_from_db()
+        self.assertEqual((row.is_dirty, row.dirty_reason), (True, PENDING_VALIDATION_REASON))
+        self.assertEqual(mock_delay.call_args.args, ('sandbox_app', 'deferredmockmodel', row.pk, ['name']))
+
+    def test_quarantined_rows_stay_quarantined_while_still_invalid(self):
+        with self.run_tasks_eagerly():
+            with self.captureOnCommitCallbacks(execute=True):
+                row = DeferredMockModel.objects.create(name="bad name")
+        row.refresh_from_db()
+        with patch('django_ai_validator.tasks.ai_validate_deferred.delay') as mock_delay:
+            row.save()
+        row.refresh_from_db()
+        self.assertEqual((row.is_dirty, row.dirty_reason), (True, "name: Value contains 'bad'"))
+        mock_delay.assert_not_called()
+
+    def test_other_reasons_survive_an_edit(self):
+        with patch('django_ai_validator.tasks.ai_validate_deferred.delay'):
+            row = DeferredMockModel.objects.create(name="good name")
+        DeferredMockModel.objects.filter(pk=row.pk).update(is_dirty=True, dirty_reason="Needs review.")
+        row.refresh_from_db()
+        AISemanticValidator("Validate this")("fine name")
+        row.name = "fine name"
+        row.save()
+        row.refresh_from_db()
+        self.assertEqual((row.is_dirty, row.dirty_reason), (True, "Needs review."))
+
+class DeferredCheckTests(TestCase):
+    @isolate_apps('sandbox_app')
+    def test_deferred_validators_need_the_dirty_mixin(self):
+        class Plain(models.Model):
+            name = models.CharField(max_length=100, validators=[AISemanticValidator("Validate this", deferred=True)])
+        class Flagged(AIDirtyMixin, models.Model):
+            name = models.CharField(max_length=100, validators=[AISemanticValidator("Validate this", deferred=True)])
+        warnings = check_deferred_validators([Plain._meta.app_config])
+        self.assertEqual([(warning.id, warning.obj.model) for warning in warnings], [('django_ai_validator.W001', Plain)])
+
+    @isolate_apps('sandbox_app')
+    def test_the_defer_budget_policy_needs_the_dirty_mixin(self):
+        class Plain(models.Model):
+            name = models.CharField(max_length=100, validators=[AISemanticValidator("Validate this")])
+        self.assertEqual(check_deferred_validators([Plain._meta.app_config]), [])
+        with override_settings(AI_CLEANER_LATENCY_BUDGET=0.5):
+            warnings = check_deferred_validators([Plain._meta.app_config])
+        self.assertEqual([warning.id for warning in warnings], ['django_ai_validator.W002'])
+        with override_settings(AI_CLEANER_LATENCY_BUDGET=0.5, AI_CLEANER_BUDGET_EXHAUSTED='skip'):
+            self.assertEqual(check_deferred_validators([Plain._meta.app_config]), [])
@@ -0,0 +1,137 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator.cache import LLMCacheManager, build_cache_key
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.llm.proxy import (
+    CachedProviderError, CachingLLMProxy, get_error_cache_timeout, get_refresh_executor, shutdown_refresh_executor,
+)
+from django_ai_validator.llm.registry import reset_adapter_registry
+
+class ProviderError(Exception):
+    def __init__(self, message, status_code):
+        self.status_code = status_code
+        super().__init__(message)
+
+class ContentFilterError(ProviderError):
+    pass
+
+@override_settings(AI_CLEANER_LOCAL_CACHE=None, AI_CLEANER_ERROR_CACHE_TIMEOUTS={400: 60, 'ContentFilterError': 600})
+class ErrorCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.adapter = MockAdapter()
+        self.proxy = CachingLLMProxy(self.adapter)
+
+    def test_timeout_by_class_or_status(self):
+        self.assertEqual(get_error_cache_timeout(ContentFilterError("blocked", 400)), 600)
+        self.assertEqual(get_error_cache_timeout(ProviderError("too long", 400)), 60)
+        self.assertIsNone(get_error_cache_timeout(ProviderError("overloaded", 503)))
+        self.assertIsNone(get_error_cache_timeout(TimeoutError()))
+
+    def test_input_specific_errors_are_cached(self):
+        with patch.object(self.adapter, 'clean', side_effect=ContentFilterError("blocked", 400)) as mock_clean:
+            with self.assertRaises(ContentFilterError):
+                self.proxy.clean("dirty input", "Clean this")
+            with self.assertRaisesMessage(CachedProviderError, "ContentFilterError: blocked"):
+                self.proxy.clean("dirty input", "Clean this")
+        self.assertEqual(mock_clean.call_count, 1)
+        # Cached errors are kept apart from results
+        self.assertIsNone(LLMCacheManager().get(build_cache_key('clean', "Clean this", "dirty input"), "mock-model"))
+
+    def test_transient_errors_are_not_cached(self):
+        with patch.object(self.adapter, 'validate', side_effect=ProviderError("overloaded", 503)) as mock_validate:
+            for _ in range(2):
+                with self.assertRaises(ProviderError):
+                    self.proxy.validate("value", "Check this")
+        self.assertEqual(mock_validate.call_count, 2)
+
+    @override_settings(AI_CLEANER_ERROR_CACHE_TIMEOUTS={})
+    def test_disabled_by_default(self):
+        with patch.object(self.adapter, 'clean', side_effect=ContentFilterError("blocked", 400)) as mock_clean:
+            for _ in range(2):
+                with self.assertRaises(ContentFilterError):
+                    self.proxy.clean("dirty input", "Clean this")
+        self.assertEqual(mock_clean.call_count, 2)
+
+    def test_batches_skip_inputs_with_cached_errors(self):
+        with patch.object(self.adapter, 'clean_many', side_effect=ContentFilterError("blocked", 400)):
+            # A batch of one caches its error like a single call
+            with self.assertRaises(ContentFilterError):
+                self.proxy.clean_many(["dirty input"], "Clean this")
+        with patch.object(self.adapter, 'clean_many', wraps=self.adapter.clean_many) as mock_clean_many:
+            with self.assertRaises(CachedProviderError):
+                self.proxy.clean_many(["dirty input", "dirty other"], "Clean this")
+            # The rest of the batch was still fetched, so it is cached for the retry
+            self.assertEqual(mock_clean_many.call_args.args[0], ["dirty other"])
+            self.assertEqual(self.proxy.clean_many(["dirty other"], "Clean this"), ["clean other"])
+        mock_clean_many.assert_called_once()
+
+    async def test_async_errors_are_cached(self):
+        with patch.object(self.adapter, 'aclean', AsyncMock(side_effect=ProviderError("too long", 400))) as mock_aclean:
+            with self.assertRaises(ProviderError):
+                await self.proxy.aclean("dirty input", "Clean this")
+            with self.assertRaises(CachedProviderError):
+                await self.proxy.aclean("dirty input", "Clean this")
+        self.assertEqual(mock_aclean.await_count, 1)
+
+@override_settings(AI_CLEANER_LOCAL_CACHE=None, AI_CLEANER_STALE_WHILE_REVALIDATE=300)
+class StaleWhileRevalidateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.adapter = MockAdapter()
+        self.proxy = CachingLLMProxy(self.adapter)
+        self.manager = LLMCacheManager()
+        self.key = build_cache_key('clean', "Clean this", "dirty value")
+
+    def expire(self):
+        # Drop the freshness marker, as if the entry's timeout had passed
+        cache.delete(self.manager._fresh_key(self.manager._generate_key(self.key, "mock-model")))
+
+    def test_fresh_entries_are_not_refreshed(self):
+        self.proxy.clean("dirty value", "Clean this")
+        self.assertEqual(self.manager.get_entry(self.key, "mock-model"), ("clean value", False))
+
+    def test_stale_entry_is_served_and_refreshed(self):
+        self.proxy.clean("dirty value", "Clean this")
+        self.expire()
+        self.assertEqual(self.manager.get_entry(self.key, "mock-model"), ("clean value", True))
+
+        with patch.object(self.adapter, 'clean', return_value="refreshed value"):
+            self.assertEqual(self.proxy.clean("dirty value", "Clean this"), "clean value")
+            shutdown_refresh_executor(wait=True)
+        self.assertEqual(self.manager.get_entry(self.key, "mock-model"), ("refreshed value", False))
+
+    def test_failed_refresh_keeps_stale_entry(self):
+        self.proxy.clean("dirty value", "Clean this")
+        self.expire()
+        with patch.object(self.adapter, 'clean', side_effect=ProviderError("overloaded", 503)):
+            self.assertEqual(self.proxy.clean("dirty value", "Clean this"), "clean value")
+            shutdown_refresh_executor(wait=True)
+        self.assertEqual(self.manager.get_entry(self.key, "mock-model"), ("clean value", True))
+        # The refresh lock was released, so the next request tries again
+        self.assertTrue(self.manager.acquire_lock(self.key, "mock-model"))
+
+    def test_stale_batch_entries_are_served_and_refreshed_together(self):
+        self.proxy.clean_many(["dirty value", "dirty other"], "Clean this")
+        self.expire()
+        with patch.object(self.adapter, 'clean_many', return_value=["refreshed value"]) as mock_clean_many:
+            self.assertEqual(self.proxy.clean_many(["dirty value", "dirty other"], "Clean this"), ["clean value", "clean other"])
+            shutdown_refresh_executor(wait=True)
+        mock_clean_many.assert_called_once_with(["dirty value"], "Clean this")
+        self.assertEqual(self.manager.get_entry(self.key, "mock-model"), ("refreshed value", False))
+
+    def test_proxies_share_one_refresh_pool(self):
+        executor = get_refresh_executor()
+        reset_adapter_registry()
+        CachingLLMProxy(MockAdapter())
+        self.assertIs(get_refresh_executor(), executor)
+
+    async def test_async_stale_entry_is_refreshed(self):
+        await self.proxy.aclean("dirty value", "Clean this")
+        self.expire()
+        with patch.object(self.adapter, 'aclean', AsyncMock(return_value="refreshed value")):
+            self.assertEqual(await self.proxy.aclean("dirty value", "Clean this"), "clean value")
+            await asyncio.gather(*self.proxy._background_tasks)
+        self.assertEqual(await self.manager.aget_entry(self.key, "mock-model"), ("refreshed value", False))
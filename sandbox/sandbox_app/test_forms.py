@@ -0,0 +1,64 @@
+import threading
+from unittest.mock import patch
+from django import forms
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator.forms import AIConcurrentValidationMixin
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.validators import AISemanticValidator
+from .models import MockModel
+
+class SignupForm(AIConcurrentValidationMixin, forms.Form):
+    name = forms.CharField(validators=[AISemanticValidator(prompt_template="Check name")])
+    company = forms.CharField(validators=[AISemanticValidator(prompt_template="Check company")])
+    bio = forms.CharField(validators=[AISemanticValidator(prompt_template="Check bio")])
+
+class MockModelForm(AIConcurrentValidationMixin, forms.ModelForm):
+    class Meta:
+        model = MockModel
+        fields = ['validated_content']
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class ConcurrentFormValidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_validators_run_in_parallel(self):
+        # Serial execution would block on the barrier until it times out
+        barrier = threading.Barrier(3, timeout=5)
+        original_validate = MockAdapter.validate
+
+        def validate(adapter, value, prompt_template):
+            barrier.wait()
+            return original_validate(adapter, value, prompt_template)
+
+        with patch.object(MockAdapter, 'validate', autospec=True, side_effect=validate) as mock_validate:
+            form = SignupForm(data={'name': 'Ada', 'company': 'bad corp', 'bio': 'good bio'})
+            self.assertFalse(form.is_valid())
+
+        self.assertEqual(mock_validate.call_count, 3)
+        self.assertEqual(list(form.errors), ['company'])
+        self.assertIn("Value contains 'bad'", form.errors['company'][0])
+
+    def test_model_field_validators_are_prefetched(self):
+        with patch.object(MockAdapter, 'validate', autospec=True, side_effect=MockAdapter.validate) as mock_validate:
+            form = MockModelForm(data={'validated_content': 'bad value'})
+            self.assertFalse(form.is_valid())
+        mock_validate.assert_called_once()
+        self.assertIn('validated_content', form.errors)
+
+    def test_failed_prefetches_are_not_retried(self):
+        def validate(adapter, value, prompt_template):
+            if value == 'down':
+                raise RuntimeError("provider down")
+            return True, None
+
+        with patch.object(MockAdapter, 'validate', autospec=True, side_effect=validate) as mock_validate:
+            form = SignupForm(data={'name': 'down', 'company': 'Acme', 'bio': 'good bio'})
+            with self.assertRaisesMessage(RuntimeError, "provider down"):
+                form.is_valid()
+        self.assertEqual(sorted(call.args[1] for call in mock_validate.call_args_list), ['Acme', 'down', 'good bio'])
+
+    def test_unbound_form(self):
+        form = SignupForm()
+        self.assertFalse(form.is_valid())
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator.concurrency import run_concurrently
+from django_ai_validator.fields import clean_instance_fields
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from .models import DirtyMockModel, MockModel
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class InstanceCleaningTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_all_fields_are_cleaned_together(self):
+        with patch('django_ai_validator.concurrency.run_concurrently', wraps=run_concurrently) as mock_run, \
+                patch.object(MockAdapter, 'clean', autospec=True, side_effect=MockAdapter.clean) as mock_clean:
+            row = DirtyMockModel.objects.create(content="dirty body", title="dirty title")
+        self.assertEqual((row.content, row.title), ("clean body", "clean title"))
+        # Both fields in one concurrent round, and not cleaned again by their own pre_save
+        mock_run.assert_called_once()
+        self.assertEqual(len(mock_run.call_args.args[1]), 2)
+        self.assertEqual(mock_clean.call_count, 2)
+
+    def test_fields_sharing_a_prompt_are_batched(self):
+        fields = [DirtyMockModel._meta.get_field('content'), DirtyMockModel._meta.get_field('title')]
+        row = DirtyMockModel(content="dirty a", title="dirty b")
+        with patch.object(fields[1], 'cleaning_prompt', "Clean this"), \
+                patch.object(MockAdapter, 'clean_many', autospec=True, return_value=["clean a", "clean b"]) as mock_clean_many:
+            cleaned = clean_instance_fields(row, fields)
+        self.assertEqual(cleaned, {'content': "clean a", 'title': "clean b"})
+        mock_clean_many.assert_called_once()
+
+    def test_update_fields_limits_cleaning(self):
+        row = DirtyMockModel.objects.create(content="clean body", title="clean title")
+        row.content, row.title = "dirty body", "dirty title"
+        row.save(update_fields=['content'])
+        self.assertEqual((row.content, row.title), ("clean body", "dirty title"))
+
+    def test_resave_cleans_changed_values(self):
+        row = DirtyMockModel.objects.create(content="dirty body", title="dirty title")
+        row.content = "dirty again"
+        row.save()
+        self.assertEqual(row.content, "clean again")
+
+    @override_settings(AI_CLEANER_FAILURE_POLICY='fail_open')
+    def test_failure_policy_applies(self):
+        with patch.object(MockAdapter, 'clean', side_effect=RuntimeError("down")):
+            row = DirtyMockModel.objects.create(content="dirty body", title="dirty title")
+        self.assertEqual((row.content, row.title), ("dirty body", "dirty title"))
+
+    def test_single_field_models_clean_in_pre_save(self):
+        with patch('django_ai_validator.fields.clean_instance_fields') as mock_clean_instance:
+            row = MockModel.objects.create(content="dirty value")
+        mock_clean_instance.assert_not_called()
+        self.assertEqual(row.content, "clean value")
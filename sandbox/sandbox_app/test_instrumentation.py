@@ -0,0 +1,92 @@
+import time
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator import instrumentation
+from django_ai_validator.instrumentation import MetricsBackend, prompt_fingerprint
+from django_ai_validator.llm.mock_adapter import SimulatedLatencyAdapter
+from django_ai_validator.llm.proxy import CachingLLMProxy
+from django_ai_validator.signals import cleaning_task_started, llm_cache_lookup, llm_request_finished
+
+class RecordingBackend(MetricsBackend):
+    instances = []
+
+    def __init__(self, **options):
+        self.options = options
+        self.counters = []
+        self.histograms = []
+        RecordingBackend.instances.append(self)
+
+    def increment(self, name, labels, value=1):
+        self.counters.append((name, labels, value))
+
+    def observe(self, name, labels, value):
+        self.histograms.append((name, labels, value))
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        adapter = SimulatedLatencyAdapter(latency_ms=0, jitter_ms=0, distribution='constant')
+        self.proxy = CachingLLMProxy(adapter, provider='simulated')
+
+    def listen(self, signal):
+        events = []
+        def receiver(sender, **kwargs):
+            events.append(kwargs)
+        signal.connect(receiver)
+        self.addCleanup(signal.disconnect, receiver)
+        return events
+
+    def test_request_signal_carries_labels_timing_and_usage(self):
+        events = self.listen(llm_request_finished)
+        self.proxy.clean("dirty text", "Clean this")
+        self.proxy.clean("dirty text", "Clean this")
+
+        self.assertEqual(len(events), 1)
+        event = events[0]
+        self.assertEqual(
+            (event['provider'], event['model'], event['operation'], event['prompt']),
+            ('simulated', 'simulated-model', 'clean', prompt_fingerprint("Clean this")),
+        )
+        self.assertGreaterEqual(event['duration'], 0)
+        self.assertGreater(event['prompt_tokens'], 0)
+        self.assertGreater(event['completion_tokens'], 0)
+        self.assertIsNone(event['error'])
+
+    def test_cache_lookups_are_reported_per_tier(self):
+        events = self.listen(llm_cache_lookup)
+        self.proxy.validate("good", "Check")
+        self.proxy.validate("good", "Check")
+        self.assertEqual([(event['tier'], event['hit']) for event in events], [('l2', False), ('l2', True)])
+
+    def test_errors_are_reported(self):
+        events = self.listen(llm_request_finished)
+        self.proxy.adapter.rate_limit_probability = 1.0
+        with self.assertRaises(Exception):
+            self.proxy.clean("dirty", "Clean this")
+        self.assertEqual(type(events[0]['error']).__name__, 'SimulatedRateLimitError')
+
+    @override_settings(
+        AI_CLEANER_METRICS_BACKEND='sandbox_app.test_instrumentation.RecordingBackend',
+        AI_CLEANER_METRICS_OPTIONS={'namespace': 'test'},
+    )
+    def test_metrics_backend_receives_counters_and_histograms(self):
+        self.proxy.clean_many(["dirty a", "dirty b"], "Clean this")
+        backend = instrumentation.get_metrics_backend()
+        self.assertEqual(backend.options, {'namespace': 'test'})
+
+        counters = {(name, labels.get('outcome') or labels.get('kind') or labels.get('result')) for name, labels, _ in backend.counters}
+        self.assertIn(('provider_requests', 'success'), counters)
+        self.assertIn(('tokens', 'prompt'), counters)
+        self.assertIn(('cache_lookups', 'miss'), counters)
+        self.assertEqual([name for name, _, _ in backend.histograms], ['provider_latency_seconds'])
+
+    def test_disabled_instrumentation_is_a_no_op(self):
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIsNone(instrumentation.track('simulated', 'model', 'clean', 'Clean').__enter__())
+        self.assertEqual(self.proxy.clean("dirty", "Clean this"), "clean")
+
+    def test_queue_wait_is_reported(self):
+        events = self.listen(cleaning_task_started)
+        instrumentation.record_queue_wait('ai_clean_model_batch', time.time() - 2)
+        self.assertEqual(events[0]['task'], 'ai_clean_model_batch')
+        self.assertGreaterEqual(events[0]['queue_wait'], 2)
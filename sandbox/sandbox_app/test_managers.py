@@ -0,0 +1,61 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.test import TestCase, override_settings
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from .models import BulkMockModel
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class AIQuerySetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bulk_create_cleans_distinct_values_in_batches(self):
+        rows = [BulkMockModel(content=f"dirty {index % 3}", title="dirty title") for index in range(30)]
+        with patch.object(MockAdapter, 'clean_many', autospec=True, side_effect=MockAdapter.clean_many) as mock_clean_many, \
+                patch.object(MockAdapter, 'clean', autospec=True, side_effect=MockAdapter.clean) as mock_clean:
+            BulkMockModel.objects.bulk_create(rows)
+        # One batch per field, each distinct value sent once; nothing cleaned row by row
+        self.assertEqual(mock_clean_many.call_count, 2)
+        self.assertEqual(sorted(mock_clean_many.call_args_list[0].args[1]), ["dirty 0", "dirty 1", "dirty 2"])
+        self.assertEqual(mock_clean.call_count, 4)
+        self.assertEqual(
+            sorted(set(BulkMockModel.objects.values_list('content', 'title'))),
+            [("clean 0", "clean title"), ("clean 1", "clean title"), ("clean 2", "clean title")],
+        )
+
+    def test_bulk_update_cleans_listed_fields(self):
+        BulkMockModel.objects.bulk_create([BulkMockModel(content="clean a", title="clean b")])
+        row = BulkMockModel.objects.get()
+        row.content, row.title = "dirty a", "dirty b"
+        BulkMockModel.objects.bulk_update([row], ['content'])
+        row.refresh_from_db()
+        self.assertEqual((row.content, row.title), ("clean a", "clean b"))
+
+    def test_update_cleans_plain_values(self):
+        BulkMockModel.objects.bulk_create([BulkMockModel(note="x"), BulkMockModel(note="y")])
+        BulkMockModel.objects.update(content="dirty text", note="dirty note")
+        self.assertEqual(set(BulkMockModel.objects.values_list('content', 'note')), {("clean text", "dirty note")})
+
+        # Database expressions are written as they are
+        BulkMockModel.objects.update(title=Concat(F('note'), Value(" title")))
+        self.assertEqual(set(BulkMockModel.objects.values_list('title', flat=True)), {"dirty note title"})
+
+    def test_failures_follow_the_failure_policy(self):
+        BulkMockModel.objects.bulk_create([BulkMockModel(note="x")])
+        row = BulkMockModel.objects.get()
+        row.content = "dirty a"
+        with patch.object(MockAdapter, 'clean_many', side_effect=RuntimeError("down")):
+            # The default 'raise' policy writes nothing
+            with self.assertRaises(RuntimeError):
+                BulkMockModel.objects.update(content="dirty text")
+            with self.assertRaises(RuntimeError):
+                BulkMockModel.objects.bulk_update([row], ['content'])
+            self.assertEqual(BulkMockModel.objects.get().content, "")
+
+            with override_settings(AI_CLEANER_FAILURE_POLICY='fail_open'):
+                BulkMockModel.objects.bulk_update([row], ['content'])
+                self.assertEqual(BulkMockModel.objects.get().content, "dirty a")
+                BulkMockModel.objects.update(content="dirty text")
+                self.assertEqual(BulkMockModel.objects.get().content, "dirty text")
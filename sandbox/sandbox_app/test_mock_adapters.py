@@ -0,0 +1,33 @@
+from django.test import TestCase, override_settings
+from django_ai_validator.llm.mock_adapter import SimulatedLatencyAdapter, SimulatedRateLimitError
+from django_ai_validator.llm.mock_factory import SimulatedLatencyFactory
+
+class SimulatedLatencyAdapterTests(TestCase):
+    def make_adapter(self, **kwargs):
+        return SimulatedLatencyAdapter(latency_ms=0, jitter_ms=0, distribution='constant', seed=1, **kwargs)
+
+    def test_answers_like_mock_adapter_and_counts_usage(self):
+        adapter = self.make_adapter()
+        self.assertEqual(adapter.clean("dirty text", "Clean"), "clean text")
+        self.assertEqual(adapter.validate("bad text", "Check"), (False, "Value contains 'bad'"))
+        self.assertEqual(adapter.stats['requests'], 2)
+        self.assertGreater(adapter.stats['prompt_tokens'], 0)
+        self.assertGreater(adapter.stats['cost'], 0)
+
+    def test_rate_limit_error_carries_retry_after(self):
+        adapter = self.make_adapter(rate_limit_probability=1.0, retry_after=2.5)
+        with self.assertRaises(SimulatedRateLimitError) as ctx:
+            adapter.clean("dirty", "Clean")
+        self.assertEqual(ctx.exception.retry_after, 2.5)
+        self.assertEqual(adapter.stats['rate_limited'], 1)
+
+    @override_settings(AI_CLEANER_BATCH_SIZE=2)
+    def test_batches_count_one_request_per_chunk(self):
+        adapter = self.make_adapter()
+        self.assertEqual(adapter.clean_many(["dirty a", "dirty b", "dirty c"], "Clean"), ["clean a", "clean b", "clean c"])
+        self.assertEqual(adapter.stats['requests'], 2)
+
+    @override_settings(AI_CLEANER_SIMULATION={'latency_ms': 5, 'seed': 7})
+    def test_factory_reads_simulation_setting(self):
+        adapter = SimulatedLatencyFactory().create_adapter(jitter_ms=0)
+        self.assertEqual((adapter.latency_ms, adapter.jitter_ms), (5, 0))
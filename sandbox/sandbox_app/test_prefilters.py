@@ -0,0 +1,60 @@
+from unittest.mock import patch
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django_ai_validator.fields import AICleanedField
+from django_ai_validator.prefilters import (
+    AllowListPrefilter, CharsetPrefilter, DenyListPrefilter, LengthPrefilter, NormalFormPrefilter, RegexPrefilter,
+)
+from django_ai_validator.signals import llm_call_prefiltered
+from django_ai_validator.validators import AISemanticValidator
+
+class PrefilterTests(TestCase):
+    def test_rules(self):
+        self.assertEqual(RegexPrefilter(r"<script", valid_on_match=False, message="No HTML").validate("<script>"), (False, "No HTML"))
+        self.assertIsNone(RegexPrefilter(r"<script", valid_on_match=False).validate("hello"))
+        self.assertFalse(LengthPrefilter(min_length=3).validate("ab")[0])
+        self.assertIsNone(LengthPrefilter(min_length=3, max_length=5).validate("abcd"))
+        self.assertFalse(CharsetPrefilter("A-Za-z ").validate("abc1")[0])
+        self.assertEqual(AllowListPrefilter(["ACME"], case_sensitive=False).validate("acme"), (True, None))
+        self.assertFalse(DenyListPrefilter(["test"]).validate("test")[0])
+
+    def test_normal_form_skips_cleaning(self):
+        prefilter = NormalFormPrefilter(r"\+\d{11,14}")
+        self.assertEqual(prefilter.clean("+15551234567"), "+15551234567")
+        self.assertIsNone(prefilter.clean("555 123 4567"))
+        self.assertIsNone(prefilter.validate("+15551234567"))
+
+    def test_deconstruct_and_equality(self):
+        prefilter = LengthPrefilter(max_length=10)
+        path, args, kwargs = prefilter.deconstruct()
+        self.assertEqual((path, kwargs), ('django_ai_validator.prefilters.LengthPrefilter', {'max_length': 10}))
+        self.assertEqual(prefilter, LengthPrefilter(max_length=10))
+        self.assertNotEqual(prefilter, LengthPrefilter(max_length=11))
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class PrefilterIntegrationTests(TestCase):
+    def setUp(self):
+        self.saved = []
+        def receiver(sender, **kwargs):
+            self.saved.append(kwargs['operation'])
+        llm_call_prefiltered.connect(receiver)
+        self.addCleanup(llm_call_prefiltered.disconnect, receiver)
+
+    @patch('django_ai_validator.validators.AICleaningFacade.validate')
+    def test_validator_decides_locally(self, mock_validate):
+        validator = AISemanticValidator("Is this a company name?", prefilters=[LengthPrefilter(max_length=5, message="Too long")])
+        with self.assertRaisesMessage(ValidationError, "Too long"):
+            validator("far too long")
+        mock_validate.return_value = (True, None)
+        validator("ok")
+        mock_validate.assert_called_once()
+        self.assertEqual(self.saved, ['validate'])
+        self.assertIn('prefilters', validator.deconstruct()[2])
+
+    @patch('django_ai_validator.facade.AICleaningFacade.clean_distinct', return_value={'Dirty': 'dirty'})
+    def test_field_only_sends_undecided_values_to_the_llm(self, mock_clean_distinct):
+        field = AICleanedField(cleaning_prompt="Normalize", prefilters=[NormalFormPrefilter(r"[a-z]+")])
+        self.assertEqual(field.clean_values(["done", "Dirty", "done"]), {'done': 'done', 'Dirty': 'dirty'})
+        mock_clean_distinct.assert_called_once()
+        self.assertEqual(mock_clean_distinct.call_args.args[0], ["Dirty"])
+        self.assertEqual(self.saved, ['clean'])
@@ -0,0 +1,100 @@
+import threading
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator.facade import AICleaningFacade
+from django_ai_validator.llm.ratelimit import (
+    CacheTokenBucket, ClientRateLimitError, RateLimiter, ThrottledLLMProxy, TokenBucket, get_rate_limit_config,
+)
+from django_ai_validator.llm.registry import AdapterRegistry, reset_adapter_registry
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class TokenBucketTests(TestCase):
+    def test_refills_over_the_period(self):
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=60, period=60, clock=clock)
+        self.assertEqual(bucket.try_acquire(60), 0)
+        self.assertAlmostEqual(bucket.try_acquire(2), 2.0)
+        clock.now = 2
+        self.assertEqual(bucket.try_acquire(2), 0)
+
+    def test_cache_bucket_is_shared_per_window(self):
+        cache.clear()
+        clock = FakeClock()
+        clock.now = 120.0
+        first = CacheTokenBucket('test', capacity=2, period=60, clock=clock)
+        second = CacheTokenBucket('test', capacity=2, period=60, clock=clock)
+        self.assertEqual(first.try_acquire(), 0)
+        self.assertEqual(second.try_acquire(), 0)
+        self.assertEqual(first.try_acquire(), 60.0)
+        clock.now = 180.0
+        self.assertEqual(second.try_acquire(), 0)
+
+class RateLimiterTests(TestCase):
+    def test_waits_for_capacity_instead_of_failing(self):
+        clock = FakeClock()
+        limiter = RateLimiter(
+            request_bucket=TokenBucket(1, period=1, clock=clock),
+            token_bucket=TokenBucket(100, period=1, clock=clock),
+            sleep=clock.sleep,
+            clock=clock,
+        )
+        limiter.acquire(tokens=10)
+        limiter.acquire(tokens=10)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_raises_when_the_wait_exceeds_max_wait(self):
+        clock = FakeClock()
+        limiter = RateLimiter(request_bucket=TokenBucket(1, period=60, clock=clock), max_wait=5, sleep=clock.sleep, clock=clock)
+        limiter.acquire()
+        with self.assertRaises(ClientRateLimitError) as ctx:
+            limiter.acquire()
+        self.assertAlmostEqual(ctx.exception.retry_after, 60.0)
+
+    def test_max_in_flight(self):
+        limiter = RateLimiter(max_in_flight=1, max_wait=0.05)
+        with limiter.limit():
+            outcome = []
+            thread = threading.Thread(target=lambda: outcome.append(self._try(limiter)))
+            thread.start()
+            thread.join()
+        self.assertEqual(outcome, [False])
+        with limiter.limit():
+            pass
+
+    def _try(self, limiter):
+        try:
+            limiter.acquire()
+        except ClientRateLimitError:
+            return False
+        limiter.release()
+        return True
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class RateLimitConfigTests(TestCase):
+    def setUp(self):
+        reset_adapter_registry()
+        self.addCleanup(reset_adapter_registry)
+
+    @override_settings(AI_CLEANER_RATE_LIMITS={'mock': {'REQUESTS_PER_MINUTE': 10}, 'mock:mock-model': {'MAX_IN_FLIGHT': 2}})
+    def test_model_specific_limits_win(self):
+        self.assertEqual(get_rate_limit_config('mock', 'mock-model'), {'MAX_IN_FLIGHT': 2})
+        self.assertEqual(get_rate_limit_config('mock', 'other'), {'REQUESTS_PER_MINUTE': 10})
+
+    @override_settings(AI_CLEANER_RATE_LIMITS={'mock': {'REQUESTS_PER_MINUTE': 100, 'TOKENS_PER_MINUTE': 10000}})
+    def test_registry_throttles_configured_providers(self):
+        throttled = AdapterRegistry().get_client().adapter.adapter
+        self.assertIsInstance(throttled, ThrottledLLMProxy)
+        self.assertEqual(AICleaningFacade().clean("dirty", "Clean"), "clean")
+        self.assertLess(throttled.limiter.request_bucket.tokens, 100)
+
+    def test_unconfigured_providers_are_not_throttled(self):
+        self.assertNotIsInstance(AdapterRegistry().get_client().adapter.adapter, ThrottledLLMProxy)
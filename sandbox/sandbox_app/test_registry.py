@@ -0,0 +1,55 @@
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django_ai_validator.facade import AICleaningFacade
+from django_ai_validator.llm.mock_factory import MockFactory
+from django_ai_validator.llm.registry import AdapterRegistry, reset_adapter_registry
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class AdapterRegistryTests(TestCase):
+    def setUp(self):
+        reset_adapter_registry()
+
+    def tearDown(self):
+        reset_adapter_registry()
+
+    def test_facade_reuses_adapter(self):
+        with patch.object(MockFactory, 'create_adapter', wraps=MockFactory().create_adapter) as mock_create:
+            first = AICleaningFacade()._get_client()
+            second = AICleaningFacade(provider='mock')._get_client()
+            AICleaningFacade().clean("dirty value", "Clean this")
+        self.assertIs(first, second)
+        mock_create.assert_called_once()
+
+    def test_distinct_configurations_get_distinct_clients(self):
+        registry = AdapterRegistry()
+        a = registry.get_client('mock', api_key='key-a')
+        b = registry.get_client('mock', api_key='key-b')
+        self.assertIsNot(a, b)
+        self.assertIs(a, registry.get_client('mock', api_key='key-a'))
+        # Raw credentials are never stored in the registry keys
+        self.assertNotIn('key-a', repr(list(registry._clients)))
+
+    @override_settings(AI_CLEANER_HTTP_POOL_SIZE=8)
+    def test_pool_size_forwarded_to_adapter(self):
+        with patch.object(MockFactory, 'create_adapter', wraps=MockFactory().create_adapter) as mock_create:
+            AdapterRegistry().get_client('mock')
+        mock_create.assert_called_once_with(pool_size=8)
+
+    def test_reset_drops_clients(self):
+        registry = AdapterRegistry()
+        client = registry.get_client('mock')
+        reset_adapter_registry()
+        self.assertIsNot(client, registry.get_client('mock'))
+
+    def test_changed_settings_rebuild_clients(self):
+        registry = AdapterRegistry()
+        client = registry.get_client('mock')
+        with override_settings(OPENAI_API_KEY='other-key'):
+            self.assertIsNot(registry.get_client('mock'), client)
+        with override_settings(AI_CLEANER_MAX_WORKERS=2):
+            self.assertIsNot(registry.get_client('mock'), client)
+
+        client = registry.get_client('mock')
+        with override_settings(USE_TZ=False):
+            # Unrelated settings keep the clients
+            self.assertIs(registry.get_client('mock'), client)
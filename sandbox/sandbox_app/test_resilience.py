@@ -0,0 +1,181 @@
+import asyncio
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator.facade import AICleaningFacade
+from django_ai_validator.llm.adapters import _request_timeout
+from django_ai_validator.llm.mock_adapter import MockAdapter, SimulatedRateLimitError
+from django_ai_validator.llm.ratelimit import ClientRateLimitError
+from django_ai_validator.llm.registry import AdapterRegistry, reset_adapter_registry
+from django_ai_validator.llm.resilience import CircuitBreaker, ProviderUnavailableError, ResilientLLMProxy
+
+class FlakyAdapter(MockAdapter):
+    """Fails with the queued errors before answering like MockAdapter."""
+    def __init__(self, errors=()):
+        super().__init__()
+        self.errors = list(errors)
+        self.calls = 0
+        self.timeouts = []
+
+    def clean(self, value, prompt_template):
+        self.calls += 1
+        self.timeouts.append(_request_timeout.get())
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().clean(value, prompt_template)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class CircuitBreakerTests(TestCase):
+    def test_opens_on_error_rate_and_probes_after_reset_timeout(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(window=4, min_requests=4, error_rate=0.5, reset_timeout=10, clock=clock)
+        for success in (True, False, True, False):
+            self.assertTrue(breaker.allow())
+            breaker.record(success)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+        clock.now = 10
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # only one probe at a time
+        breaker.record(True)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker(window=2, min_requests=2, error_rate=1.0, slow_call_duration=1.0)
+        breaker.record(True, duration=2.0)
+        breaker.record(True, duration=3.0)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+class ResilientLLMProxyTests(TestCase):
+    def make_proxy(self, adapter, **kwargs):
+        self.sleeps = []
+        return ResilientLLMProxy(adapter, sleep=self.sleeps.append, **kwargs)
+
+    def test_retries_transient_errors_honouring_retry_after(self):
+        adapter = FlakyAdapter([SimulatedRateLimitError(retry_after=2), TimeoutError()])
+        proxy = self.make_proxy(adapter, timeouts={'clean': 5})
+        self.assertEqual(proxy.clean("dirty", "Clean"), "clean")
+        self.assertEqual(adapter.calls, 3)
+        self.assertGreaterEqual(self.sleeps[0], 2)
+        self.assertEqual(adapter.timeouts, [5, 5, 5])
+
+    def test_does_not_retry_other_errors(self):
+        adapter = FlakyAdapter([ValueError("bad request")])
+        with self.assertRaises(ValueError):
+            self.make_proxy(adapter).clean("dirty", "Clean")
+        self.assertEqual(adapter.calls, 1)
+
+    def test_gives_up_when_retry_after_exceeds_backoff_max(self):
+        adapter = FlakyAdapter([SimulatedRateLimitError(retry_after=60)])
+        with self.assertRaises(SimulatedRateLimitError):
+            self.make_proxy(adapter, backoff_max=10).clean("dirty", "Clean")
+        self.assertEqual(adapter.calls, 1)
+
+    def test_open_circuit_refuses_calls(self):
+        breaker = CircuitBreaker(window=1, min_requests=1)
+        adapter = FlakyAdapter([ConnectionError("down")])
+        proxy = self.make_proxy(adapter, breaker=breaker, max_attempts=1)
+        with self.assertRaises(ConnectionError):
+            proxy.clean("dirty", "Clean")
+        with self.assertRaises(ProviderUnavailableError):
+            proxy.clean("dirty", "Clean")
+        self.assertEqual(adapter.calls, 1)
+
+    def test_input_errors_do_not_open_the_circuit(self):
+        breaker = CircuitBreaker(window=2, min_requests=2)
+        proxy = self.make_proxy(FlakyAdapter([ValueError("bad request"), ValueError("bad request")]), breaker=breaker)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                proxy.clean("dirty", "Clean")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def half_open_breaker(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(reset_timeout=10, clock=clock)
+        breaker._open()
+        clock.now = 10
+        return breaker
+
+    def test_unrecorded_probes_are_released(self):
+        breaker = self.half_open_breaker()
+        proxy = self.make_proxy(FlakyAdapter([ValueError("bad request")]), breaker=breaker)
+        with self.assertRaises(ValueError):
+            proxy.clean("dirty", "Clean")
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        # The next call gets to probe, and closes the circuit
+        self.assertEqual(proxy.clean("dirty", "Clean"), "clean")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_retries_keep_their_probe(self):
+        breaker = self.half_open_breaker()
+        proxy = self.make_proxy(FlakyAdapter([ClientRateLimitError(retry_after=0.1)]), breaker=breaker)
+        self.assertEqual(proxy.clean("dirty", "Clean"), "clean")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_cancelled_probes_are_released(self):
+        class SlowAdapter(MockAdapter):
+            async def aclean(self, value, prompt_template):
+                await asyncio.sleep(1)
+
+        breaker = self.half_open_breaker()
+        proxy = self.make_proxy(SlowAdapter(), breaker=breaker)
+
+        async def cancel_probe():
+            task = asyncio.ensure_future(proxy.aclean("dirty", "Clean"))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_probe())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+
+    def test_async_calls_are_cut_off_at_the_timeout(self):
+        class SlowAdapter(MockAdapter):
+            async def aclean(self, value, prompt_template):
+                await asyncio.sleep(1)
+
+        proxy = self.make_proxy(SlowAdapter(), timeouts={'clean': 0.01}, max_attempts=1)
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(proxy.aclean("dirty", "Clean"))
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class FailurePolicyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_adapter_registry()
+        self.addCleanup(reset_adapter_registry)
+
+    def fail(self):
+        return patch.object(MockAdapter, 'validate', side_effect=ProviderUnavailableError("down"))
+
+    def test_raise_is_the_default(self):
+        with self.fail(), self.assertRaises(ProviderUnavailableError):
+            AICleaningFacade().validate("value", "Check")
+
+    @override_settings(AI_CLEANER_FAILURE_POLICY='fail_open')
+    def test_fail_open_accepts_the_value(self):
+        with self.fail():
+            self.assertEqual(AICleaningFacade().validate("value", "Check"), (True, None))
+        # The fallback is not cached
+        self.assertEqual(AICleaningFacade().validate("bad value", "Check"), (False, "Value contains 'bad'"))
+
+    @override_settings(AI_CLEANER_FAILURE_POLICY='fail_closed', AI_CLEANER_FAILURE_MESSAGE="Try later.")
+    def test_fail_closed_rejects_the_value(self):
+        with self.fail():
+            self.assertEqual(AICleaningFacade().validate("value", "Check"), (False, "Try later."))
+
+    def test_cache_hits_are_served_while_the_circuit_is_open(self):
+        self.assertEqual(AICleaningFacade().clean("dirty", "Clean"), "clean")
+        AdapterRegistry().get_client().adapter.breaker._open()
+        self.assertEqual(AICleaningFacade().clean("dirty", "Clean"), "clean")
+        with self.assertRaises(ProviderUnavailableError):
+            AICleaningFacade().clean("dirty other", "Clean")
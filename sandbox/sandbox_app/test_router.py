@@ -0,0 +1,106 @@
+import asyncio
+import time
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator.facade import AICleaningFacade
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.llm.registry import AdapterRegistry, reset_adapter_registry
+from django_ai_validator.llm.router import RoutingAdapter, get_hedge_executor, shutdown_hedge_executor
+
+class NamedAdapter(MockAdapter):
+    def __init__(self, name, delay=0.0, fail=False):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def clean(self, value, prompt_template):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        return f"{self.name}:{value}"
+
+    async def aclean(self, value, prompt_template):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        return f"{self.name}:{value}"
+
+class RoutingAdapterTests(TestCase):
+    def make_router(self, *adapters, **kwargs):
+        return RoutingAdapter({adapter.name: adapter for adapter in adapters}, **kwargs)
+
+    def test_fails_over_to_the_next_provider(self):
+        router = self.make_router(NamedAdapter('a', fail=True), NamedAdapter('b'))
+        self.assertEqual(router.clean("x", "Clean"), "b:x")
+        self.assertEqual(router.stats['a'].error_rate, 1.0)
+
+    def test_prefers_the_fastest_healthy_provider(self):
+        slow, fast = NamedAdapter('slow', delay=0.02), NamedAdapter('fast')
+        router = self.make_router(slow, fast, min_samples=1)
+        router.clean("x", "Clean")  # slow gets measured first
+        router.clean("x", "Clean")  # then fast
+        self.assertEqual(router.ranked_providers(), ['fast', 'slow'])
+        self.assertEqual(router.clean("x", "Clean"), "fast:x")
+
+    def test_unhealthy_providers_are_skipped(self):
+        flaky, steady = NamedAdapter('flaky'), NamedAdapter('steady', delay=0.01)
+        router = self.make_router(flaky, steady, min_samples=2, max_error_rate=0.5)
+        router.stats['flaky'].record(0.001, False)
+        router.stats['flaky'].record(0.001, False)
+        self.assertEqual(router.ranked_providers(), ['steady'])
+
+    def test_cost_budget(self):
+        router = self.make_router(
+            NamedAdapter('premium'), NamedAdapter('budget'),
+            costs={'premium': 15.0, 'budget': 0.5}, max_cost=1.0,
+        )
+        self.assertEqual(router.ranked_providers(), ['budget'])
+
+    def test_hedging_returns_the_first_answer(self):
+        slow, fast = NamedAdapter('slow', delay=0.5), NamedAdapter('fast')
+        router = self.make_router(slow, fast, hedge=True, hedge_delay=0.02)
+        started = time.monotonic()
+        self.assertEqual(router.clean("x", "Clean"), "fast:x")
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual((slow.calls, fast.calls), (1, 1))
+
+    def test_hedging_fails_over_when_the_first_provider_errors_quickly(self):
+        router = self.make_router(NamedAdapter('a', fail=True), NamedAdapter('b'), hedge=True, hedge_delay=0.5)
+        self.assertEqual(router.clean("x", "Clean"), "b:x")
+
+    def test_routers_share_one_hedge_pool(self):
+        executor = get_hedge_executor()
+        for _ in range(2):
+            router = self.make_router(NamedAdapter('slow', delay=0.05), NamedAdapter('fast'), hedge=True, hedge_delay=0.01)
+            router.clean("x", "Clean")
+        self.assertIs(get_hedge_executor(), executor)
+
+        shutdown_hedge_executor(wait=True)
+        self.assertIsNot(get_hedge_executor(), executor)
+
+    def test_async_hedging_cancels_the_slower_call(self):
+        slow, fast = NamedAdapter('slow', delay=0.5), NamedAdapter('fast')
+        router = self.make_router(slow, fast, hedge=True, hedge_delay=0.02)
+        self.assertEqual(asyncio.run(router.aclean("x", "Clean")), "fast:x")
+        self.assertEqual(router.stats['slow'].samples, 0)
+
+@override_settings(
+    AI_CLEANER_DEFAULT_PROVIDER='router',
+    AI_CLEANER_ROUTER={'PROVIDERS': ['mock', 'simulated'], 'OPTIONS': {'simulated': {'latency_ms': 0, 'jitter_ms': 0}}},
+)
+class RouterProviderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_adapter_registry()
+        self.addCleanup(reset_adapter_registry)
+
+    def test_router_is_a_registered_provider(self):
+        self.assertEqual(AICleaningFacade().clean("dirty", "Clean"), "clean")
+        router = AdapterRegistry().get_client().adapter
+        self.assertIsInstance(router, RoutingAdapter)
+        # Each routed provider keeps its own breaker and retries
+        self.assertTrue(all(hasattr(adapter, 'breaker') for adapter in router.adapters.values()))
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_ai_validator.cache import LLMCacheManager, build_cache_key
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.llm.proxy import CachingLLMProxy
+
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.adapter = MockAdapter()
+        self.proxy = CachingLLMProxy(self.adapter)
+
+    def test_concurrent_identical_calls_share_one_provider_call(self):
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_clean(value, prompt_template):
+            calls.append(value)
+            started.set()
+            release.wait(timeout=5)
+            return value.replace("dirty", "clean")
+
+        results = []
+        with patch.object(self.adapter, 'clean', side_effect=slow_clean):
+            threads = [
+                threading.Thread(target=lambda: results.append(self.proxy.clean("dirty burst", "Clean this")))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            # Give every thread time to reach the in-flight call before releasing it
+            started.wait(timeout=5)
+            threading.Event().wait(0.1)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(calls, ["dirty burst"])
+        self.assertEqual(results, ["clean burst"] * 5)
+
+    def test_errors_are_shared_and_not_cached(self):
+        with patch.object(self.adapter, 'clean', side_effect=RuntimeError("provider down")):
+            with self.assertRaises(RuntimeError):
+                self.proxy.clean("dirty", "Clean this")
+        self.assertEqual(self.proxy._single_flight._calls, {})
+        self.assertEqual(self.proxy.clean("dirty", "Clean this"), "clean")
+
+    @override_settings(AI_CLEANER_CROSS_PROCESS_LOCK=True, AI_CLEANER_LOCK_POLL_INTERVAL=0.01)
+    def test_waits_for_result_of_lock_holder_in_other_process(self):
+        manager = LLMCacheManager()
+        key = build_cache_key("clean", "Clean this", "dirty shared")
+        self.assertTrue(manager.acquire_lock(key, self.adapter.model))
+        threading.Timer(0.05, lambda: manager.set(key, self.adapter.model, "from other worker")).start()
+
+        with patch.object(self.adapter, 'clean') as mock_clean:
+            self.assertEqual(self.proxy.clean("dirty shared", "Clean this"), "from other worker")
+        mock_clean.assert_not_called()
+
+    @override_settings(AI_CLEANER_CROSS_PROCESS_LOCK=True, AI_CLEANER_LOCK_TIMEOUT=0.05, AI_CLEANER_LOCK_POLL_INTERVAL=0.01)
+    def test_computes_itself_when_lock_holder_never_finishes(self):
+        manager = LLMCacheManager()
+        manager.acquire_lock(build_cache_key("clean", "Clean this", "dirty stuck"), self.adapter.model)
+        self.assertEqual(self.proxy.clean("dirty stuck", "Clean this"), "clean stuck")
+
+    @override_settings(AI_CLEANER_CROSS_PROCESS_LOCK=True)
+    def test_lock_is_released_after_call(self):
+        self.proxy.clean("dirty released", "Clean this")
+        self.assertTrue(LLMCacheManager().acquire_lock(build_cache_key("clean", "Clean this", "dirty released"), self.adapter.model))
+
+    async def test_concurrent_identical_async_calls_share_one_provider_call(self):
+        calls = []
+
+        async def slow_aclean(value, prompt_template):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            return value.replace("dirty", "clean")
+
+        with patch.object(self.adapter, 'aclean', side_effect=slow_aclean):
+            results = await asyncio.gather(*(self.proxy.aclean("dirty burst", "Clean this") for _ in range(5)))
+
+        self.assertEqual(calls, ["dirty burst"])
+        self.assertEqual(results, ["clean burst"] * 5)
+        self.assertEqual(self.proxy._async_single_flight._calls, {})
+
+    async def test_async_errors_are_shared_and_not_cached(self):
+        async def failing_aclean(value, prompt_template):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        with patch.object(self.adapter, 'aclean', side_effect=failing_aclean) as mock_aclean:
+            results = await asyncio.gather(
+                *(self.proxy.aclean("dirty", "Clean this") for _ in range(3)), return_exceptions=True
+            )
+        self.assertEqual(mock_aclean.call_count, 1)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(await self.proxy.aclean("dirty", "Clean this"), "clean")
+
+    @override_settings(AI_CLEANER_CROSS_PROCESS_LOCK=True, AI_CLEANER_LOCK_POLL_INTERVAL=0.01)
+    async def test_async_calls_wait_for_result_of_lock_holder_in_other_process(self):
+        manager = LLMCacheManager()
+        key = build_cache_key("clean", "Clean this", "dirty shared")
+        self.assertTrue(await manager.aacquire_lock(key, self.adapter.model))
+
+        async def finish_elsewhere():
+            await asyncio.sleep(0.05)
+            await manager.aset(key, self.adapter.model, "from other worker")
+
+        with patch.object(self.adapter, 'aclean') as mock_aclean:
+            result, _ = await asyncio.gather(self.proxy.aclean("dirty shared", "Clean this"), finish_elsewhere())
+        self.assertEqual(result, "from other worker")
+        mock_aclean.assert_not_called()
+
+    @override_settings(AI_CLEANER_CROSS_PROCESS_LOCK=True)
+    async def test_async_lock_is_released_after_call(self):
+        await self.proxy.aclean("dirty released", "Clean this")
+        manager = LLMCacheManager()
+        self.assertTrue(await manager.aacquire_lock(build_cache_key("clean", "Clean this", "dirty released"), self.adapter.model))
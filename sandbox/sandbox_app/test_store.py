@@ -0,0 +1,117 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_ai_validator.cache import LLMCacheManager, build_cache_key
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.llm.proxy import CachingLLMProxy
+from django_ai_validator.models import AIResultRecord
+
+@override_settings(AI_CLEANER_RESULT_STORE=True, AI_CLEANER_LOCAL_CACHE=None)
+class ResultStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = LLMCacheManager()
+        self.manager.reset_stats()
+        self.adapter = MockAdapter()
+        self.proxy = CachingLLMProxy(self.adapter)
+
+    def test_results_survive_a_cache_flush(self):
+        self.proxy.clean("dirty value", "Clean this")
+        self.proxy.validate("bad value", "Check this")
+        cache.clear()
+
+        with patch.object(self.adapter, 'clean') as mock_clean, patch.object(self.adapter, 'validate') as mock_validate:
+            self.assertEqual(self.proxy.clean("dirty value", "Clean this"), "clean value")
+            self.assertEqual(self.proxy.validate("bad value", "Check this"), (False, "Value contains 'bad'"))
+        mock_clean.assert_not_called()
+        mock_validate.assert_not_called()
+
+        record = AIResultRecord.objects.get(operation='clean')
+        self.assertEqual((record.model, record.hit_count), ("mock-model", 1))
+        self.assertEqual(self.manager.stats()['store_hits'], 2)
+
+    def test_store_hits_are_copied_back_into_the_cache(self):
+        key = build_cache_key('clean', "Clean this", "dirty value")
+        self.manager.set(key, "mock-model", "clean value")
+        cache.clear()
+        self.manager.get(key, "mock-model")
+        self.assertEqual(cache.get(self.manager._generate_key(key, "mock-model")), "clean value")
+
+    def test_bulk_lookup(self):
+        self.proxy.clean_many(["dirty a", "dirty b"], "Clean this")
+        cache.clear()
+        self.manager.reset_stats()
+        keys = [build_cache_key('clean', "Clean this", value) for value in ("dirty a", "dirty b", "dirty c")]
+        # One read and one usage update for the whole batch
+        with self.assertNumQueries(2):
+            found = self.manager.get_many(keys, "mock-model")
+        self.assertEqual(sorted(found.values()), ["clean a", "clean b"])
+        self.assertEqual(self.manager.stats()['store_misses'], 1)
+
+    async def test_async_round_trip(self):
+        await self.proxy.aclean("dirty async", "Clean this")
+        cache.clear()
+        with patch.object(self.adapter, 'aclean') as mock_aclean:
+            self.assertEqual(await self.proxy.aclean("dirty async", "Clean this"), "clean async")
+        mock_aclean.assert_not_called()
+
+    def test_upserts_without_conflict_targets(self):
+        key = build_cache_key('clean', "Clean this", "dirty value")
+        self.manager.set(key, "mock-model", "first")
+        # MySQL-style ON DUPLICATE KEY UPDATE takes no conflict target
+        with patch.multiple(connection.features, supports_update_conflicts_with_target=False), \
+                patch.object(AIResultRecord.objects, 'bulk_create') as mock_bulk_create:
+            self.manager.set(key, "mock-model", "second")
+        self.assertTrue(mock_bulk_create.call_args.kwargs['update_conflicts'])
+        self.assertNotIn('unique_fields', mock_bulk_create.call_args.kwargs)
+
+        # Backends without any upsert update the rows one by one
+        with patch.multiple(connection.features, supports_update_conflicts_with_target=False, supports_update_conflicts=False):
+            self.manager.set(key, "mock-model", "third")
+        self.assertEqual(AIResultRecord.objects.get().result, "third")
+
+    def test_database_errors_do_not_break_the_cache(self):
+        key = build_cache_key('clean', "Clean this", "dirty value")
+        with patch.object(AIResultRecord.objects, 'bulk_create', side_effect=DatabaseError("down")):
+            self.manager.set(key, "mock-model", "clean value")
+        self.assertEqual(self.manager.get(key, "mock-model"), "clean value")
+        cache.clear()
+        with patch.object(AIResultRecord.objects, 'filter', side_effect=DatabaseError("down")):
+            self.assertIsNone(self.manager.get(key, "mock-model"))
+
+    @override_settings(AI_CLEANER_RESULT_STORE=False)
+    def test_disabled_by_default(self):
+        self.proxy.clean("dirty value", "Clean this")
+        self.assertFalse(AIResultRecord.objects.exists())
+
+class EvictResultsCommandTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for index, (days, hits) in enumerate([(40, 0), (40, 10), (1, 0), (1, 5)]):
+            record = AIResultRecord.objects.create(key=f"key{index}", model="mock-model", result="x", hit_count=hits)
+            AIResultRecord.objects.filter(pk=record.pk).update(last_used_at=now - timedelta(days=days))
+
+    def evict(self, *args):
+        out = StringIO()
+        call_command('ai_evict_results', *args, stdout=out)
+        return out.getvalue()
+
+    def test_evicts_old_rarely_used_records(self):
+        self.assertIn("Deleted 1", self.evict('--older-than', '30', '--min-hits', '5'))
+        self.assertEqual(sorted(AIResultRecord.objects.values_list('key', flat=True)), ["key1", "key2", "key3"])
+
+    def test_keeps_most_used_records(self):
+        self.assertIn("Would delete 2", self.evict('--keep', '2', '--dry-run'))
+        self.assertEqual(AIResultRecord.objects.count(), 4)
+        self.evict('--keep', '2')
+        self.assertEqual(sorted(AIResultRecord.objects.values_list('key', flat=True)), ["key1", "key3"])
+
+    def test_requires_a_criterion(self):
+        with self.assertRaises(CommandError):
+            self.evict()
@@ -0,0 +1,193 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django_ai_validator.llm.mock_adapter import MockAdapter
+from django_ai_validator.fields import AICleanedField
+from django_ai_validator.tasks import BatchCleaningError, ai_clean_model_batch, ai_clean_model_instance
+from .models import AsyncMockModel
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock')
+class BatchedTaskDispatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(AI_CLEANER_TASK_CHUNK_SIZE=2)
+    @patch('django_ai_validator.tasks.ai_clean_model_batch.delay')
+    def test_saves_in_a_transaction_become_chunked_tasks(self, mock_delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                rows = [AsyncMockModel.objects.create(content=f"dirty {i}") for i in range(3)]
+                rows[0].save()
+                AsyncMockModel.objects.create(content="")
+                self.assertFalse(mock_delay.called)
+
+        pks = [row.pk for row in rows]
+        self.assertEqual(
+            [call.args for call in mock_delay.call_args_list],
+            [
+                ('sandbox_app', 'asyncmockmodel', 'content', 'Clean this', pks[:2]),
+                ('sandbox_app', 'asyncmockmodel', 'content', 'Clean this', pks[2:]),
+            ],
+        )
+
+    @patch('django_ai_validator.tasks.ai_clean_model_batch.delay')
+    def test_rolled_back_saves_are_not_dispatched(self, mock_delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    AsyncMockModel.objects.create(content="dirty rolled back")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            with transaction.atomic():
+                row = AsyncMockModel.objects.create(content="dirty committed")
+
+        mock_delay.assert_called_once()
+        self.assertEqual(mock_delay.call_args.args[-1], [row.pk])
+
+    @patch('django_ai_validator.tasks.ai_clean_model_batch.delay')
+    def test_batch_task_cleans_distinct_values_once(self, mock_delay):
+        rows = [AsyncMockModel.objects.create(content=content, is_dirty=True) for content in ("dirty a", "dirty a", "dirty b")]
+
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=MockAdapter.clean) as mock_clean:
+            ai_clean_model_batch('sandbox_app', 'asyncmockmodel', 'content', 'Clean this', [row.pk for row in rows] + [0])
+
+        self.assertEqual(mock_clean.call_count, 2)
+        self.assertEqual(
+            list(AsyncMockModel.objects.order_by('pk').values_list('content', 'is_dirty')),
+            [("clean a", False), ("clean a", False), ("clean b", False)],
+        )
+        # update() does not send post_save, so cleaning doesn't re-trigger itself
+        mock_delay.assert_not_called()
+
+    @patch('django_ai_validator.tasks.ai_clean_model_batch.delay')
+    def test_batch_task_keeps_validation_quarantines(self, mock_delay):
+        rows = [AsyncMockModel.objects.create(content="dirty a") for _ in range(2)]
+        AsyncMockModel.objects.filter(pk=rows[0].pk).update(is_dirty=True, dirty_reason="content: Too vague.")
+        AsyncMockModel.objects.filter(pk=rows[1].pk).update(content="dirty a", is_dirty=True)
+        ai_clean_model_batch('sandbox_app', 'asyncmockmodel', 'content', 'Clean this', [row.pk for row in rows])
+        self.assertEqual(
+            list(AsyncMockModel.objects.order_by('pk').values_list('content', 'is_dirty', 'dirty_reason')),
+            [("clean a", True, "content: Too vague."), ("clean a", False, "")],
+        )
+
+    @override_settings(AI_CLEANER_BATCH_SIZE=1)
+    @patch('django_ai_validator.tasks.ai_clean_model_batch.delay')
+    def test_batch_task_retries_only_failed_rows(self, mock_delay):
+        rows = [AsyncMockModel.objects.create(content=content, is_dirty=True) for content in ("dirty a", "dirty b")]
+        clean = MockAdapter.clean
+        failures = ["dirty b"]
+        def flaky_clean(adapter, value, prompt_template):
+            if value in failures:
+                failures.remove(value)
+                raise RuntimeError("provider down")
+            return clean(adapter, value, prompt_template)
+
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=flaky_clean) as mock_clean:
+            result = ai_clean_model_batch.apply(args=('sandbox_app', 'asyncmockmodel', 'content', 'Clean this', [row.pk for row in rows]))
+
+        self.assertEqual(result.get(), "Cleaned content for 1 of 1 instances")
+        self.assertEqual([call.args[1] for call in mock_clean.call_args_list], ["dirty a", "dirty b", "dirty b"])
+        self.assertEqual(list(AsyncMockModel.objects.order_by('pk').values_list('content', flat=True)), ["clean a", "clean b"])
+
+    @override_settings(AI_CLEANER_BATCH_SIZE=1)
+    @patch('django_ai_validator.tasks.ai_clean_model_batch.delay')
+    def test_batch_task_reports_rows_that_keep_failing(self, mock_delay):
+        rows = [AsyncMockModel.objects.create(content=content, is_dirty=True) for content in ("dirty a", "dirty b", "dirty b")]
+        clean = MockAdapter.clean
+        def failing_clean(adapter, value, prompt_template):
+            if value == "dirty b":
+                raise RuntimeError("provider down")
+            return clean(adapter, value, prompt_template)
+
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=failing_clean):
+            result = ai_clean_model_batch.apply(args=('sandbox_app', 'asyncmockmodel', 'content', 'Clean this', [row.pk for row in rows]))
+
+        with self.assertRaises(BatchCleaningError) as raised:
+            result.get()
+        self.assertEqual(raised.exception.pks, [rows[1].pk, rows[2].pk])
+        self.assertEqual(
+            list(AsyncMockModel.objects.order_by('pk').values_list('content', flat=True)), ["clean a", "dirty b", "dirty b"]
+        )
+
+    @patch('django_ai_validator.tasks.ai_clean_model_batch.delay')
+    def test_batch_task_keeps_concurrent_edits(self, mock_delay):
+        rows = [AsyncMockModel.objects.create(content="dirty a", is_dirty=True) for _ in range(2)]
+        clean = MockAdapter.clean
+        def edit_while_cleaning(adapter, value, prompt_template):
+            AsyncMockModel.objects.filter(pk=rows[0].pk).update(content="edited")
+            return clean(adapter, value, prompt_template)
+
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=edit_while_cleaning):
+            result = ai_clean_model_batch('sandbox_app', 'asyncmockmodel', 'content', 'Clean this', [row.pk for row in rows])
+
+        self.assertEqual(result, "Cleaned content for 1 of 2 instances")
+        self.assertEqual(
+            list(AsyncMockModel.objects.order_by('pk').values_list('content', 'is_dirty')),
+            [("edited", True), ("clean a", False)],
+        )
+
+# The dummy cache makes every lookup a miss, so only the write-back path can
+# prevent duplicate LLM calls.
+@override_settings(AI_CLEANER_DEFAULT_PROVIDER='mock', CACHES=NO_CACHE)
+class AsyncCleaningRetriggerTests(TestCase):
+    def run_tasks_eagerly(self):
+        return patch('django_ai_validator.tasks.ai_clean_model_batch.delay', side_effect=ai_clean_model_batch)
+
+    def test_one_llm_call_per_distinct_dirty_value(self):
+        with self.run_tasks_eagerly() as mock_delay, \
+                patch.object(MockAdapter, 'clean', autospec=True, side_effect=MockAdapter.clean) as mock_clean:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    rows = [AsyncMockModel.objects.create(content=content) for content in ("dirty a", "dirty b", "dirty a")]
+
+            self.assertEqual(sorted(call.args[1] for call in mock_clean.call_args_list), ["dirty a", "dirty b"])
+            self.assertEqual(mock_delay.call_count, 1)
+
+            # Saving the cleaned rows again (e.g. editing another column) must not re-clean them
+            with self.captureOnCommitCallbacks(execute=True):
+                for row in rows:
+                    row.refresh_from_db()
+                    row.save()
+            self.assertEqual(mock_clean.call_count, 2)
+            self.assertEqual(mock_delay.call_count, 1)
+
+            # A user edit is cleaned again
+            with self.captureOnCommitCallbacks(execute=True):
+                rows[0].content = "dirty c"
+                rows[0].save()
+            self.assertEqual(mock_clean.call_count, 3)
+
+        rows[0].refresh_from_db()
+        self.assertEqual(rows[0].content, "clean c")
+        self.assertTrue(AsyncMockModel._meta.get_field('content').is_already_cleaned(rows[0]))
+
+    def test_instance_task_updates_without_save(self):
+        row = AsyncMockModel.objects.create(content="dirty value", is_dirty=True)
+        ai_clean_model_instance('sandbox_app', 'asyncmockmodel', row.pk, 'content', 'Clean this')
+        row.refresh_from_db()
+        self.assertEqual((row.content, row.is_dirty), ("clean value", False))
+        self.assertEqual(row.content_fingerprint, AsyncMockModel._meta.get_field('content').fingerprint("clean value"))
+
+    def test_instance_task_does_not_overwrite_concurrent_edit(self):
+        row = AsyncMockModel.objects.create(content="dirty value")
+        original_clean = MockAdapter.clean
+
+        def clean_while_user_edits(adapter, value, prompt_template):
+            AsyncMockModel.objects.filter(pk=row.pk).update(content="edited by user")
+            return original_clean(adapter, value, prompt_template)
+
+        with patch.object(MockAdapter, 'clean', autospec=True, side_effect=clean_while_user_edits):
+            ai_clean_model_instance('sandbox_app', 'asyncmockmodel', row.pk, 'content', 'Clean this')
+        row.refresh_from_db()
+        self.assertEqual(row.content, "edited by user")
+
+class FingerprintFieldCheckTests(TestCase):
+    def test_missing_fingerprint_field_is_reported(self):
+        field = AICleanedField(cleaning_prompt="Clean", fingerprint_field='missing')
+        field.set_attributes_from_name('content')
+        field.model = AsyncMockModel
+        self.assertEqual([error.id for error in field._check_fingerprint_field()], ['django_ai_validator.E001'])
@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django_ai_validator',
     'sandbox_app.apps.SandboxAppConfig',
 ]
 
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+class DjangoAIValidatorConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'django_ai_validator'
+    verbose_name = "AI Validator"
+
+    def ready(self):
+        from django.core import checks
+        from .checks import check_deferred_validators
+        checks.register(check_deferred_validators)
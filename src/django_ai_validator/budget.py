@@ -0,0 +1,136 @@
+"""
+Request-scoped latency budgets.
+
+A budget is a deadline shared by every AI call made inside it: provider
+timeouts are capped to the time left, and once it is spent validators stop
+calling the provider and either skip or defer their check (see
+``AI_CLEANER_BUDGET_EXHAUSTED``). ``LatencyBudgetMiddleware`` opens one per
+request from ``AI_CLEANER_LATENCY_BUDGET``; validators can set their own
+with ``budget=``.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+_current_budget = contextvars.ContextVar('ai_validator_latency_budget', default=None)
+
+class BudgetExceededError(Exception):
+    """Raised instead of calling a provider once the latency budget is spent."""
+
+class LatencyBudget:
+    """
+    A deadline for AI calls, plus a record of the validations skipped
+    because it was spent. A budget opened inside another never outlives it,
+    and its skips are recorded on the outer budget too.
+    """
+    def __init__(self, seconds: float, on_exhausted: str = None, parent: 'LatencyBudget' = None):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+        if parent is not None:
+            self.deadline = min(self.deadline, parent.deadline)
+        self.on_exhausted = on_exhausted or (parent.on_exhausted if parent else get_exhausted_policy())
+        self.parent = parent
+        self.skipped = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    @property
+    def exhausted(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def record_skip(self, validator, value: str):
+        """Record a validator whose check of ``value`` was skipped or deferred."""
+        with self._lock:
+            self.skipped.append((validator, value))
+        if self.parent is not None:
+            self.parent.record_skip(validator, value)
+
+    def is_deferred(self, validator, value: str) -> bool:
+        """True when ``validator`` skipped ``value`` and this budget defers skipped checks."""
+        if self.on_exhausted != 'defer':
+            return False
+        with self._lock:
+            return any(skipped is validator and skipped_value == value for skipped, skipped_value in self.skipped)
+
+def get_exhausted_policy() -> str:
+    return getattr(settings, 'AI_CLEANER_BUDGET_EXHAUSTED', 'defer')
+
+def get_budget() -> Optional[LatencyBudget]:
+    return _current_budget.get()
+
+def remaining_time() -> Optional[float]:
+    """Seconds left in the current budget, or None outside of one."""
+    budget = _current_budget.get()
+    return budget.remaining() if budget is not None else None
+
+def budget_exhausted() -> bool:
+    budget = _current_budget.get()
+    return budget is not None and budget.exhausted
+
+def cap_timeout(timeout: Optional[float]) -> Optional[float]:
+    """``timeout`` shortened to the time left in the current budget."""
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    return remaining if timeout is None else min(timeout, remaining)
+
+def check_budget():
+    if budget_exhausted():
+        raise BudgetExceededError("The AI latency budget for this request is spent.")
+
+@contextmanager
+def latency_budget(seconds: float = None, on_exhausted: str = None):
+    """
+    Run the block under a budget of ``seconds`` (nested in any current one).
+    ``on_exhausted`` is ``'skip'`` or ``'defer'``. With ``seconds=None`` the
+    current budget, if any, is used unchanged.
+    """
+    if seconds is None:
+        yield _current_budget.get()
+        return
+    budget = LatencyBudget(seconds, on_exhausted, parent=_current_budget.get())
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+@contextmanager
+def without_budget():
+    """Run the block free of the current budget, e.g. for background work."""
+    token = _current_budget.set(None)
+    try:
+        yield
+    finally:
+        _current_budget.reset(token)
+
+class LatencyBudgetMiddleware:
+    """
+    Opens a latency budget of ``AI_CLEANER_LATENCY_BUDGET`` seconds for each
+    request, available to views as ``request.ai_latency_budget``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with latency_budget(getattr(settings, 'AI_CLEANER_LATENCY_BUDGET', None)) as budget:
+            request.ai_latency_budget = budget
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with latency_budget(getattr(settings, 'AI_CLEANER_LATENCY_BUDGET', None)) as budget:
+            request.ai_latency_budget = budget
+            return await self.get_response(request)
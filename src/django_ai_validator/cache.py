@@ -1,26 +1,426 @@
+import contextvars
 import hashlib
-from django.core.cache import cache
+import logging
+import pickle
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError
+from django.utils.module_loading import import_string
+from .instrumentation import record_cache_lookup
+from . import store
+
+logger = logging.getLogger(__name__)
+
+# Value normalizers applied before building cache keys, by name. Callables
+# (or dotted paths to them) can be used as well.
+NORMALIZERS = {
+    'strip': str.strip,
+    'collapse_whitespace': lambda value: ' '.join(value.split()),
+    'lower': str.lower,
+    'casefold': str.casefold,
+    'nfkc': lambda value: unicodedata.normalize('NFKC', value),
+}
+
+# (normalizers, version) set by validators and fields around their LLM calls
+_cache_key_options = contextvars.ContextVar('ai_validator_cache_key_options', default=None)
+
+@contextmanager
+def cache_key_options(normalizers=None, version=None):
+    """Use these value normalizers and prompt version for cache keys built inside the block."""
+    token = _cache_key_options.set((normalizers, version))
+    try:
+        yield
+    finally:
+        _cache_key_options.reset(token)
+
+def normalize_value(value: str, normalizers) -> str:
+    for normalizer in normalizers or ():
+        if isinstance(normalizer, str):
+            normalizer = NORMALIZERS.get(normalizer) or import_string(normalizer)
+        value = normalizer(value)
+    return value
+
+def prompt_namespace(prompt_template: str, version=None) -> str:
+    """
+    Cache namespace of a prompt: a fingerprint of its text plus an optional
+    version, so editing a prompt or bumping its version only orphans that
+    prompt's entries.
+    """
+    fingerprint = hashlib.sha256(prompt_template.encode('utf-8')).hexdigest()
+    return f"{fingerprint}@{version}" if version is not None else fingerprint
+
+def build_cache_key(operation: str, prompt_template: str, value: str) -> str:
+    normalizers, version = _cache_key_options.get() or (None, None)
+    if normalizers is None:
+        normalizers = getattr(settings, 'AI_CLEANER_CACHE_NORMALIZERS', ())
+    return f"{operation.upper()}:{prompt_namespace(prompt_template, version)}:{normalize_value(value, normalizers)}"
+
+def get_cache_timeout(operation: str = None) -> int:
+    """Per-operation TTL from ``AI_CLEANER_CACHE_TIMEOUTS``, falling back to ``AI_CLEANER_CACHE_TIMEOUT``."""
+    default = getattr(settings, 'AI_CLEANER_CACHE_TIMEOUT', 3600)
+    return getattr(settings, 'AI_CLEANER_CACHE_TIMEOUTS', {}).get(operation, default)
+
+def get_stale_window() -> int:
+    """Seconds an expired entry may still be served while it is refreshed (``AI_CLEANER_STALE_WHILE_REVALIDATE``)."""
+    return getattr(settings, 'AI_CLEANER_STALE_WHILE_REVALIDATE', 0) or 0
+
+class LocalLRUCache:
+    """
+    Bounded, thread-safe in-process LRU cache with per-entry expiry.
+    Limits are expressed in entries and, optionally, in pickled bytes.
+    """
+    def __init__(self, max_entries: int = 1024, max_bytes: int = None, timeout: int = 60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._data = OrderedDict()  # key -> (value, expires_at, size)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, timeout: int = None):
+        timeout = min(timeout, self.timeout) if timeout else self.timeout
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (value, time.monotonic() + timeout, size)
+            self._size += size
+            while self._data and (
+                len(self._data) > self.max_entries or (self.max_bytes and self._size > self.max_bytes)
+            ):
+                self._pop(next(iter(self._data)))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def _pop(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    def __len__(self):
+        return len(self._data)
 
 class LLMCacheManager:
     """
     Singleton class to manage caching of LLM responses.
+
+    Entries live in the Django cache selected by ``AI_CLEANER_CACHE_ALIAS`` (L2),
+    optionally fronted by an in-process LRU (L1) configured with
+    ``AI_CLEANER_LOCAL_CACHE`` and backed by the durable result store when
+    ``AI_CLEANER_RESULT_STORE`` is enabled. Writes go through every tier.
+
+    With ``AI_CLEANER_STALE_WHILE_REVALIDATE``, L2 entries outlive their
+    timeout by that many seconds and a separate marker records whether they
+    are still fresh; ``get_entry`` reports expired entries as stale.
     """
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(LLMCacheManager, cls).__new__(cls)
+            instance = super(LLMCacheManager, cls).__new__(cls)
+            instance._local = None
+            instance._local_config = None
+            instance._stats_lock = threading.Lock()
+            instance._stats = dict.fromkeys(
+                ('l1_hits', 'l1_misses', 'l2_hits', 'l2_misses', 'store_hits', 'store_misses'), 0
+            )
+            instance._store = store.ResultStore()
+            cls._instance = instance
         return cls._instance
 
+    @property
+    def backend(self):
+        return caches[getattr(settings, 'AI_CLEANER_CACHE_ALIAS', 'default')]
+
+    @property
+    def local(self):
+        """The L1 cache, or None when it is disabled."""
+        config = getattr(settings, 'AI_CLEANER_LOCAL_CACHE', None)
+        if config != self._local_config:
+            self._local_config = config
+            self._local = LocalLRUCache(
+                max_entries=config.get('MAX_ENTRIES', 1024),
+                max_bytes=config.get('MAX_BYTES'),
+                timeout=config.get('TIMEOUT', 60),
+            ) if config else None
+        return self._local
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def clear_local(self):
+        if self.local is not None:
+            self.local.clear()
+
+    def _record(self, **counts):
+        with self._stats_lock:
+            for name, count in counts.items():
+                self._stats[name] += count
+
     def _generate_key(self, prompt: str, model: str) -> str:
         # Create a unique hash for the prompt and model
         raw_key = f"{model}:{prompt}"
         return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
 
+    def _get_local(self, key: str):
+        local = self.local
+        if local is None:
+            return None
+        value = local.get(key)
+        if value is None:
+            self._record(l1_misses=1)
+        else:
+            self._record(l1_hits=1)
+        record_cache_lookup('l1', value is not None)
+        return value
+
+    def _record_store(self, hits: int, misses: int):
+        self._record(store_hits=hits, store_misses=misses)
+        record_cache_lookup('store', True, hits)
+        record_cache_lookup('store', False, misses)
+
+    def _get_stored(self, keys: dict) -> dict:
+        """Look up ``{key: prompt}`` L2 misses in the result store and copy hits back into the cache."""
+        if not keys or not store.is_enabled():
+            return {}
+        try:
+            found = self._store.get_many(list(keys))
+        except DatabaseError as exc:
+            # The store only backs the cache up; an unavailable database is a miss
+            logger.warning("AI result store lookup failed: %s", exc)
+            return {}
+        self._record_store(len(found), len(keys) - len(found))
+        for key, value in found.items():
+            self._fill(key, keys[key], value)
+        return found
+
+    def _save_stored(self, keyed: dict, model: str):
+        """Write ``{(key, prompt): value}`` entries to the result store, if enabled."""
+        if not store.is_enabled():
+            return
+        try:
+            self._store.set_many(keyed, model)
+        except DatabaseError as exc:
+            logger.warning("AI result store write failed: %s", exc)
+
+    async def _aget_stored(self, key: str, prompt: str):
+        if not store.is_enabled():
+            return None
+        try:
+            value = await self._store.aget(key)
+        except DatabaseError as exc:
+            logger.warning("AI result store lookup failed: %s", exc)
+            return None
+        self._record_store(int(value is not None), int(value is None))
+        if value is not None:
+            await self._aset_backend({key: value}, get_cache_timeout(store.describe(prompt)[0] or None))
+        return value
+
+    async def _asave_stored(self, key: str, prompt: str, model: str, value):
+        if not store.is_enabled():
+            return
+        try:
+            await self._store.aset(key, prompt, model, value)
+        except DatabaseError as exc:
+            logger.warning("AI result store write failed: %s", exc)
+
+    def _fill(self, key: str, prompt: str, value):
+        self._set_backend({key: value}, get_cache_timeout(store.describe(prompt)[0] or None))
+        if self.local is not None:
+            self.local.set(key, value)
+
+    def _fresh_key(self, key: str) -> str:
+        return f"{key}:fresh"
+
+    def _stale_entries(self, data: dict, timeout):
+        """L2 writes for ``data``: with a stale window, values outlive ``timeout`` and freshness markers do not."""
+        window = get_stale_window()
+        if not window or not timeout:
+            return [(data, timeout)]
+        return [(data, timeout + window), ({self._fresh_key(key): 1 for key in data}, timeout)]
+
+    def _set_backend(self, data: dict, timeout):
+        for entries, entry_timeout in self._stale_entries(data, timeout):
+            self.backend.set_many(entries, entry_timeout)
+
+    async def _aset_backend(self, data: dict, timeout):
+        for entries, entry_timeout in self._stale_entries(data, timeout):
+            await self.backend.aset_many(entries, entry_timeout)
+
+    def _record_l2(self, key: str, found: dict) -> tuple:
+        value = found.get(key)
+        self._record(**{'l2_hits' if value is not None else 'l2_misses': 1})
+        record_cache_lookup('l2', value is not None)
+        stale = value is not None and bool(get_stale_window()) and self._fresh_key(key) not in found
+        return value, stale
+
+    def _l2_keys(self, key: str) -> list:
+        return [key, self._fresh_key(key)] if get_stale_window() else [key]
+
+    def get_entry(self, prompt: str, model: str) -> tuple:
+        """
+        ``(value, stale)`` for an entry. ``stale`` is True when the entry is
+        past its timeout but still within the stale-while-revalidate window.
+        """
+        key = self._generate_key(prompt, model)
+        value = self._get_local(key)
+        if value is not None:
+            return value, False
+
+        value, stale = self._record_l2(key, self.backend.get_many(self._l2_keys(key)))
+        if value is None:
+            return self._get_stored({key: prompt}).get(key), False
+        if self.local is not None and not stale:
+            self.local.set(key, value)
+        return value, stale
+
     def get(self, prompt: str, model: str):
+        return self.get_entry(prompt, model)[0]
+
+    def set(self, prompt: str, model: str, value: str, timeout: int = None):
+        timeout = get_cache_timeout() if timeout is None else timeout
+        key = self._generate_key(prompt, model)
+        if self.local is not None:
+            self.local.set(key, value, timeout)
+        self._set_backend({key: value}, timeout)
+        self._save_stored({(key, prompt): value}, model)
+
+    def get_many_entries(self, prompts: list, model: str) -> dict:
+        """
+        Fetch several entries with at most one L2 round-trip. Returns
+        ``{prompt: (value, stale)}`` for hits, with ``stale`` as in ``get_entry``.
+        """
+        keys = {self._generate_key(prompt, model): prompt for prompt in prompts}
+        found = {}
+        if self.local is not None:
+            for key in keys:
+                value = self._get_local(key)
+                if value is not None:
+                    found[key] = (value, False)
+
+        remaining = [key for key in keys if key not in found]
+        if remaining:
+            from_backend = self.backend.get_many([l2_key for key in remaining for l2_key in self._l2_keys(key)])
+            hits = {key: from_backend[key] for key in remaining if key in from_backend}
+            self._record(l2_hits=len(hits), l2_misses=len(remaining) - len(hits))
+            record_cache_lookup('l2', True, len(hits))
+            record_cache_lookup('l2', False, len(remaining) - len(hits))
+            window = bool(get_stale_window())
+            for key, value in hits.items():
+                stale = window and self._fresh_key(key) not in from_backend
+                if self.local is not None and not stale:
+                    self.local.set(key, value)
+                found[key] = (value, stale)
+            stored = self._get_stored({key: keys[key] for key in remaining if key not in hits})
+            found.update((key, (value, False)) for key, value in stored.items())
+        return {keys[key]: entry for key, entry in found.items()}
+
+    def get_many(self, prompts: list, model: str) -> dict:
+        """Fetch several entries with at most one L2 round-trip. Returns {prompt: value} for hits."""
+        return {prompt: value for prompt, (value, _) in self.get_many_entries(prompts, model).items()}
+
+    def set_many(self, entries: dict, model: str, timeout: int = None):
+        timeout = get_cache_timeout() if timeout is None else timeout
+        keyed = {(self._generate_key(prompt, model), prompt): value for prompt, value in entries.items()}
+        data = {key: value for (key, _), value in keyed.items()}
+        if self.local is not None:
+            for key, value in data.items():
+                self.local.set(key, value, timeout)
+        self._set_backend(data, timeout)
+        self._save_stored(keyed, model)
+
+    def acquire_lock(self, prompt: str, model: str, timeout: int = 30) -> bool:
+        """
+        Take a short-lived, cross-process lock for an entry. ``cache.add`` only
+        succeeds for the first caller, which makes it atomic on shared backends.
+        """
         key = self._generate_key(prompt, model)
-        return cache.get(key)
+        return self.backend.add(f"{key}:lock", 1, timeout)
+
+    def release_lock(self, prompt: str, model: str):
+        key = self._generate_key(prompt, model)
+        self.backend.delete(f"{key}:lock")
+
+    async def aacquire_lock(self, prompt: str, model: str, timeout: int = 30) -> bool:
+        key = self._generate_key(prompt, model)
+        return await self.backend.aadd(f"{key}:lock", 1, timeout)
+
+    async def arelease_lock(self, prompt: str, model: str):
+        key = self._generate_key(prompt, model)
+        await self.backend.adelete(f"{key}:lock")
+
+    def _error_key(self, prompt: str, model: str) -> str:
+        # Errors live apart from results: L2 only, never in L1 or the result store
+        return self._generate_key(f"ERROR:{prompt}", model)
+
+    def get_error(self, prompt: str, model: str):
+        return self.backend.get(self._error_key(prompt, model))
+
+    def get_errors(self, prompts: list, model: str) -> dict:
+        """``{prompt: error}`` for the prompts with a cached error, in one L2 round-trip."""
+        keys = {self._error_key(prompt, model): prompt for prompt in prompts}
+        return {keys[key]: error for key, error in self.backend.get_many(list(keys)).items()}
+
+    def set_error(self, prompt: str, model: str, error, timeout: int):
+        self.backend.set(self._error_key(prompt, model), error, timeout)
+
+    async def aget_error(self, prompt: str, model: str):
+        return await self.backend.aget(self._error_key(prompt, model))
+
+    async def aset_error(self, prompt: str, model: str, error, timeout: int):
+        await self.backend.aset(self._error_key(prompt, model), error, timeout)
+
+    async def aget_entry(self, prompt: str, model: str) -> tuple:
+        key = self._generate_key(prompt, model)
+        value = self._get_local(key)
+        if value is not None:
+            return value, False
+
+        value, stale = self._record_l2(key, await self.backend.aget_many(self._l2_keys(key)))
+        if value is None:
+            value = await self._aget_stored(key, prompt)
+        if value is not None and self.local is not None and not stale:
+            self.local.set(key, value)
+        return value, stale
+
+    async def aget(self, prompt: str, model: str):
+        return (await self.aget_entry(prompt, model))[0]
 
-    def set(self, prompt: str, model: str, value: str, timeout: int = 3600):
+    async def aset(self, prompt: str, model: str, value: str, timeout: int = None):
+        timeout = get_cache_timeout() if timeout is None else timeout
         key = self._generate_key(prompt, model)
-        cache.set(key, value, timeout)
+        if self.local is not None:
+            self.local.set(key, value, timeout)
+        await self._aset_backend({key: value}, timeout)
+        await self._asave_stored(key, prompt, model, value)
@@ -0,0 +1,43 @@
+from django.apps import apps
+from django.conf import settings
+from django.core import checks
+
+def check_deferred_validators(app_configs=None, **kwargs):
+    """
+    Deferred validators, and the ``'defer'`` latency budget policy, rely on
+    ``AIDirtyMixin`` to flag rows for background validation. Without it,
+    undecided values are accepted and never checked.
+    """
+    from .budget import get_exhausted_policy
+    from .models import AIDirtyMixin
+    from .validators import get_ai_validators
+
+    budget_defers = (
+        getattr(settings, 'AI_CLEANER_LATENCY_BUDGET', None) is not None and get_exhausted_policy() == 'defer'
+    )
+    models = (
+        model for app_config in (app_configs or apps.get_app_configs()) for model in app_config.get_models()
+    )
+    warnings = []
+    for model in models:
+        if issubclass(model, AIDirtyMixin):
+            continue
+        for field in model._meta.concrete_fields:
+            validators = get_ai_validators(field.validators)
+            if any(validator.deferred for validator in validators):
+                warnings.append(checks.Warning(
+                    "Deferred AI validators need AIDirtyMixin on the model; "
+                    "values they cannot decide are accepted and never checked.",
+                    hint="Add AIDirtyMixin to the model, or remove deferred=True.",
+                    obj=field,
+                    id='django_ai_validator.W001',
+                ))
+            elif validators and budget_defers:
+                warnings.append(checks.Warning(
+                    "AI_CLEANER_BUDGET_EXHAUSTED='defer' needs AIDirtyMixin on the model; "
+                    "validations skipped by the latency budget are never checked.",
+                    hint="Add AIDirtyMixin to the model, or set AI_CLEANER_BUDGET_EXHAUSTED='skip'.",
+                    obj=field,
+                    id='django_ai_validator.W002',
+                ))
+    return warnings
@@ -0,0 +1,33 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+
+def get_max_workers(max_workers: int = None) -> int:
+    return max_workers or getattr(settings, 'AI_CLEANER_MAX_WORKERS', 8)
+
+def run_concurrently(func, items, max_workers: int = None) -> list:
+    """
+    Apply ``func`` to every item on a bounded thread pool.
+
+    Results are returned in input order. Exceptions are returned in place of
+    the result (like ``asyncio.gather(..., return_exceptions=True)``) so one
+    failing call does not discard the others.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as exc:
+            return exc
+
+    if len(items) == 1:
+        return [call(items[0])]
+
+    # Worker threads see the caller's context (cache key options, instrumentation labels)
+    parent = contextvars.copy_context()
+    workers = min(get_max_workers(max_workers), len(items))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ai-validator') as executor:
+        return list(executor.map(lambda item: parent.copy().run(call, item), items))
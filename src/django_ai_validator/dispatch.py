@@ -0,0 +1,70 @@
+import threading
+import time
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+class PendingCleaningBatch:
+    """The (model, field, pk) tuples saved during one transaction."""
+    def __init__(self, hooks: list):
+        # Django replaces ``connection.run_on_commit`` on every commit and
+        # rollback, so this identifies the transaction the batch belongs to.
+        self.hooks = hooks
+        self.items = {}
+        self.flushed = False
+
+    def add(self, key: tuple, pk):
+        # A dict keeps insertion order and drops repeated saves of the same row
+        self.items.setdefault(key, {})[pk] = None
+
+    def flush(self):
+        from .tasks import ai_clean_model_batch
+
+        self.flushed = True
+        chunk_size = getattr(settings, 'AI_CLEANER_TASK_CHUNK_SIZE', 500)
+        for (app_label, model_name, field_name, prompt_template), pks in self.items.items():
+            pks = list(pks)
+            for start in range(0, len(pks), chunk_size):
+                ai_clean_model_batch.delay(
+                    app_label,
+                    model_name,
+                    field_name,
+                    prompt_template,
+                    pks[start:start + chunk_size],
+                    enqueued_at=time.time(),
+                )
+        self.items = {}
+
+class AICleaningDispatcher:
+    """
+    Buffers (model, field, pk) tuples of saved instances per transaction and,
+    once the transaction commits, enqueues them as chunked
+    ``ai_clean_model_batch`` tasks instead of one task per instance per field.
+
+    Outside of an atomic block ``transaction.on_commit`` runs immediately, so
+    every save is dispatched on its own, exactly as before. Batches of
+    rolled-back transactions are dropped together with their commit hook.
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    def _batches(self) -> dict:
+        if not hasattr(self._local, 'batches'):
+            self._local.batches = {}
+        return self._local.batches
+
+    def add(self, instance, field, using: str = None):
+        using = using or DEFAULT_DB_ALIAS
+        key = (instance._meta.app_label, instance._meta.model_name, field.name, field.cleaning_prompt)
+        connection = transaction.get_connection(using)
+
+        batch = self._batches().get(using)
+        if batch is not None and not batch.flushed and batch.hooks is connection.run_on_commit:
+            batch.add(key, instance.pk)
+            return
+
+        batch = PendingCleaningBatch(connection.run_on_commit)
+        batch.add(key, instance.pk)
+        self._batches()[using] = batch
+        transaction.on_commit(batch.flush, using=using)
+
+dispatcher = AICleaningDispatcher()
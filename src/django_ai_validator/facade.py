@@ -1,27 +1,135 @@
-from typing import Tuple, Optional
-from .llm.factory import LLMFactory
-from .llm.proxy import CachingLLMProxy
+import logging
+from typing import Dict, Iterable, List, Tuple, Optional
+from django.conf import settings
+from .budget import budget_exhausted
+from .concurrency import run_concurrently
+from .llm.registry import AdapterRegistry
+
+logger = logging.getLogger(__name__)
 
 class AICleaningFacade:
     """
     Facade Pattern: Provides a simplified interface to the complex subsystem 
     (Factory, Adapter, Proxy, Cache).
     """
-    def __init__(self, provider: str = None):
+    def __init__(self, provider: str = None, cascade: bool = False):
         self.provider = provider
+        self.cascade = cascade
 
     def _get_client(self):
-        # 1. Get Factory
-        factory = LLMFactory.get_factory(self.provider)
-        # 2. Create Adapter
-        adapter = factory.create_adapter()
-        # 3. Wrap in Proxy for Caching
-        return CachingLLMProxy(adapter)
+        # The registry builds Factory -> Adapter -> caching Proxy once per
+        # provider configuration and hands back the shared, long-lived instance.
+        if self.cascade:
+            # A small model answers first; ``provider`` is the model it escalates to
+            if self.provider:
+                return AdapterRegistry().get_client('cascade', strong=self.provider)
+            return AdapterRegistry().get_client('cascade')
+        return AdapterRegistry().get_client(self.provider)
 
     def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
         client = self._get_client()
-        return client.validate(value, prompt_template)
+        try:
+            return client.validate(value, prompt_template)
+        except Exception as exc:
+            return self._on_failure('validate', value, exc)
 
     def clean(self, value: str, prompt_template: str) -> str:
         client = self._get_client()
-        return client.clean(value, prompt_template)
+        try:
+            return client.clean(value, prompt_template)
+        except Exception as exc:
+            return self._on_failure('clean', value, exc)
+
+    def get_cached(self, operation: str, value: str, prompt_template: str):
+        """A result already in the cache or result store, or None if the provider would have to be asked."""
+        try:
+            return self._get_client().get_cached(operation, value, prompt_template)
+        except Exception:
+            logger.warning("AI cache lookup failed.", exc_info=True)
+            return None
+
+    async def aget_cached(self, operation: str, value: str, prompt_template: str):
+        try:
+            return await self._get_client().aget_cached(operation, value, prompt_template)
+        except Exception:
+            logger.warning("AI cache lookup failed.", exc_info=True)
+            return None
+
+    def _on_failure(self, operation: str, value: str, exc: Exception):
+        """
+        Apply ``AI_CLEANER_FAILURE_POLICY`` to a provider call that failed:
+        ``'raise'`` (default) re-raises, ``'fail_open'`` accepts the value
+        (validation passes, cleaning returns it unchanged) and
+        ``'fail_closed'`` rejects it (validation fails, cleaning re-raises).
+        """
+        policy = getattr(settings, 'AI_CLEANER_FAILURE_POLICY', 'raise')
+        if policy == 'raise' or (operation == 'validate' and budget_exhausted()):
+            # Validators skip or defer checks cut short by the latency budget
+            raise exc
+        logger.warning("AI %s failed, applying the %s policy: %s", operation, policy, exc)
+        if policy == 'fail_open':
+            return (True, None) if operation == 'validate' else value
+        if policy == 'fail_closed' and operation == 'validate':
+            return False, getattr(
+                settings, 'AI_CLEANER_FAILURE_MESSAGE', "This value could not be verified right now. Please try again later."
+            )
+        raise exc
+
+    def validate_many(self, values: List[str], prompt_template: str) -> List[Tuple[bool, Optional[str]]]:
+        client = self._get_client()
+        return client.validate_many(values, prompt_template)
+
+    def clean_many(self, values: List[str], prompt_template: str) -> List[str]:
+        client = self._get_client()
+        return client.clean_many(values, prompt_template)
+
+    def clean_distinct(
+        self, values: Iterable[str], prompt_template: str, max_workers: int = None, errors: dict = None
+    ) -> Dict[str, str]:
+        """
+        Clean every distinct non-empty value once, sending batches of
+        ``AI_CLEANER_BATCH_SIZE`` values concurrently. Returns ``{value: cleaned}``;
+        values whose batch failed are left out (and logged) so bulk jobs can
+        carry on with the rest. Pass an ``errors`` dict to collect
+        ``{value: exception}`` for them.
+        """
+        return self._run_distinct('cleaning', self.clean_many, values, prompt_template, max_workers, errors)
+
+    def validate_distinct(
+        self, values: Iterable[str], prompt_template: str, max_workers: int = None, errors: dict = None
+    ) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """Validation counterpart of ``clean_distinct``, returning ``{value: (is_valid, reason)}``."""
+        return self._run_distinct('validation', self.validate_many, values, prompt_template, max_workers, errors)
+
+    def _run_distinct(
+        self, operation: str, call, values: Iterable[str], prompt_template: str, max_workers: int = None,
+        errors: dict = None,
+    ) -> dict:
+        distinct = list(dict.fromkeys(value for value in values if value))
+        batch_size = getattr(settings, 'AI_CLEANER_BATCH_SIZE', 20)
+        batches = [distinct[i:i + batch_size] for i in range(0, len(distinct), batch_size)]
+
+        answers = {}
+        results = run_concurrently(lambda batch: call(batch, prompt_template), batches, max_workers=max_workers)
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                logger.warning("AI %s failed for %d value(s): %s", operation, len(batch), result)
+                if errors is not None:
+                    errors.update(dict.fromkeys(batch, result))
+                continue
+            answers.update(zip(batch, result))
+        return answers
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        client = self._get_client()
+        try:
+            return await client.avalidate(value, prompt_template)
+        except Exception as exc:
+            return self._on_failure('validate', value, exc)
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        client = self._get_client()
+        try:
+            return await client.aclean(value, prompt_template)
+        except Exception as exc:
+            return self._on_failure('clean', value, exc)
@@ -1,40 +1,116 @@
+import hashlib
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
 from django.db import models
 from django.conf import settings
 from django.utils.module_loading import import_string
 
+def content_fingerprint(value: str, prompt_template: str) -> str:
+    """Identifies a value as the output of cleaning with ``prompt_template``."""
+    return hashlib.sha256(f"{prompt_template}\x00{value}".encode('utf-8')).hexdigest()
+
 class AICleanedField(models.TextField):
     description = "A text field that is automatically cleaned by AI before saving."
 
-    def __init__(self, *args, cleaning_prompt=None, use_async=False, **kwargs):
+    def __init__(
+        self, *args, cleaning_prompt=None, use_async=False, fingerprint_field=None, prefilters=None,
+        cache_normalizers=None, cache_version=None, **kwargs
+    ):
         self.cleaning_prompt = cleaning_prompt
         self.use_async = use_async
+        # Deterministic checks (e.g. NormalFormPrefilter) that can clean a
+        # value, or recognize it as already clean, without calling the LLM
+        self.prefilters = list(prefilters or [])
+        # Cache key options for the LLM calls, see BaseAIValidator
+        self.cache_normalizers = list(cache_normalizers) if cache_normalizers is not None else None
+        self.cache_version = cache_version
+        # Name of a CharField(max_length=64) on the model storing the
+        # fingerprint of the last cleaned value, so unchanged values are not
+        # sent for cleaning again.
+        self.fingerprint_field = fingerprint_field
         super().__init__(*args, **kwargs)
 
+    def check(self, **kwargs):
+        errors = super().check(**kwargs)
+        errors.extend(self._check_fingerprint_field())
+        return errors
+
+    def _check_fingerprint_field(self):
+        if not self.fingerprint_field:
+            return []
+        try:
+            self.model._meta.get_field(self.fingerprint_field)
+        except FieldDoesNotExist:
+            return [
+                checks.Error(
+                    f"fingerprint_field refers to the nonexistent field '{self.fingerprint_field}'.",
+                    obj=self,
+                    id='django_ai_validator.E001',
+                )
+            ]
+        return []
+
+    def fingerprint(self, value: str) -> str:
+        return content_fingerprint(value, self.cleaning_prompt)
+
+    def is_already_cleaned(self, instance) -> bool:
+        """True if the current value is the stored output of the last clean."""
+        if not self.fingerprint_field:
+            return False
+        stored = getattr(instance, self.fingerprint_field)
+        return bool(stored) and stored == self.fingerprint(getattr(instance, self.attname))
+
+    def clean_values(self, values, facade=None, max_workers: int = None, errors: dict = None) -> dict:
+        """
+        Clean every distinct non-empty value: pre-filters first, the LLM for
+        the rest. Returns ``{value: cleaned}``; values whose LLM batch failed
+        are left out, and collected in ``errors`` as ``{value: exception}``
+        when it is given.
+        """
+        from .cache import cache_key_options
+        from .facade import AICleaningFacade
+        from .prefilters import run_cleaning_prefilters
+
+        cleaned, remaining = {}, []
+        for value in dict.fromkeys(value for value in values if value):
+            prefiltered = run_cleaning_prefilters(self.prefilters, value)
+            if prefiltered is None:
+                remaining.append(value)
+            else:
+                cleaned[value] = prefiltered
+        if remaining:
+            facade = facade or AICleaningFacade()
+            with cache_key_options(self.cache_normalizers, self.cache_version):
+                cleaned.update(facade.clean_distinct(
+                    remaining, self.cleaning_prompt, max_workers=max_workers, errors=errors
+                ))
+        return cleaned
+
     def contribute_to_class(self, cls, name, private_only=False):
         super().contribute_to_class(cls, name, private_only)
         if self.use_async:
             from django.db.models.signals import post_save
             post_save.connect(self._post_save_handler, sender=cls)
+        else:
+            # One handler per model cleans all its AI fields together before
+            # the fields' own pre_save runs
+            from django.db.models.signals import pre_save
+            pre_save.connect(_clean_fields_before_save, sender=cls, dispatch_uid='ai_clean_fields')
 
-    def _post_save_handler(self, sender, instance, created, **kwargs):
-        # Avoid infinite recursion if the task saves the instance again
-        # The task should handle this, or we check if it's already clean
-        # For now, we just trigger the task
-        from .tasks import ai_clean_model_instance
-        # We need to pass the app label and model name
-        app_label = instance._meta.app_label
-        model_name = instance._meta.model_name
-        
-        # Only trigger if the field has a value
+    def _post_save_handler(self, sender, instance, created, using=None, **kwargs):
+        # Saves are buffered per transaction and cleaned in chunked batch tasks
+        # once it commits, instead of one task per instance.
+        from .dispatch import dispatcher
+
+        # Only trigger if the field has a value that hasn't been cleaned yet
         value = getattr(instance, self.name)
-        if value:
-             ai_clean_model_instance.delay(
-                app_label, 
-                model_name, 
-                instance.pk, 
-                self.name, 
-                self.cleaning_prompt
-            )
+        if not value or self.is_already_cleaned(instance):
+            return
+        from .prefilters import run_cleaning_prefilters
+        if run_cleaning_prefilters(self.prefilters, value) == value:
+            # Already in normal form
+            return
+        dispatcher.add(instance, self, using=using)
 
     def pre_save(self, model_instance, add):
         value = super().pre_save(model_instance, add)
@@ -43,11 +119,20 @@ class AICleanedField(models.TextField):
             # If async, we don't clean here. We wait for post_save.
             return value
 
+        if is_marked_cleaned(model_instance, self.attname, value):
+            # Already cleaned, e.g. together with the instance's other AI fields
+            return value
+
         if value and self.cleaning_prompt:
+            from .cache import cache_key_options
             from .facade import AICleaningFacade
-            # TODO: Allow configuring provider on the field
-            facade = AICleaningFacade()
-            cleaned_value = facade.clean(value, self.cleaning_prompt)
+            from .prefilters import run_cleaning_prefilters
+            cleaned_value = run_cleaning_prefilters(self.prefilters, value)
+            if cleaned_value is None:
+                # TODO: Allow configuring provider on the field
+                facade = AICleaningFacade()
+                with cache_key_options(self.cache_normalizers, self.cache_version):
+                    cleaned_value = facade.clean(value, self.cleaning_prompt)
             setattr(model_instance, self.attname, cleaned_value)
             return cleaned_value
         return value
@@ -58,4 +143,85 @@ class AICleanedField(models.TextField):
             kwargs['cleaning_prompt'] = self.cleaning_prompt
         if self.use_async:
             kwargs['use_async'] = self.use_async
+        if self.fingerprint_field:
+            kwargs['fingerprint_field'] = self.fingerprint_field
+        if self.prefilters:
+            kwargs['prefilters'] = self.prefilters
+        if self.cache_normalizers is not None:
+            kwargs['cache_normalizers'] = self.cache_normalizers
+        if self.cache_version is not None:
+            kwargs['cache_version'] = self.cache_version
         return name, path, args, kwargs
+
+def mark_cleaned(instance, attname: str, value):
+    """
+    Record ``value`` as the cleaned value of ``attname`` on ``instance`` so
+    the field's pre_save and ``AIQuerySet`` bulk writes don't clean it again.
+    """
+    instance.__dict__.setdefault('_ai_cleaned_values', {})[attname] = value
+
+def is_marked_cleaned(instance, attname: str, value) -> bool:
+    cleaned = instance.__dict__.get('_ai_cleaned_values', {})
+    return attname in cleaned and cleaned[attname] == value
+
+def clean_instance_fields(instance, fields, facade=None, max_workers: int = None) -> dict:
+    """
+    Clean several ``AICleanedField``s of ``instance`` together: pre-filters
+    first, then one request per distinct prompt, run concurrently. Fields
+    sharing a prompt are sent in a single batch. Cleaned values are set on
+    the instance, and ``{attname: cleaned}`` is returned.
+    """
+    from .cache import cache_key_options
+    from .concurrency import run_concurrently
+    from .facade import AICleaningFacade
+    from .prefilters import run_cleaning_prefilters
+
+    cleaned, groups = {}, {}
+    for field in fields:
+        value = getattr(instance, field.attname)
+        if not value or not field.cleaning_prompt:
+            continue
+        prefiltered = run_cleaning_prefilters(field.prefilters, value)
+        if prefiltered is not None:
+            cleaned[field.attname] = prefiltered
+            continue
+        normalizers = tuple(field.cache_normalizers) if field.cache_normalizers is not None else None
+        groups.setdefault((field.cleaning_prompt, normalizers, field.cache_version), []).append((field, value))
+
+    facade = facade or AICleaningFacade()
+
+    def clean_group(item):
+        (prompt, normalizers, version), members = item
+        values = list(dict.fromkeys(value for _, value in members))
+        with cache_key_options(normalizers, version):
+            if len(values) == 1:
+                return {values[0]: facade.clean(values[0], prompt)}
+            try:
+                return dict(zip(values, facade.clean_many(values, prompt)))
+            except Exception as exc:
+                return {value: facade._on_failure('clean', value, exc) for value in values}
+
+    items = list(groups.items())
+    for (_, members), result in zip(items, run_concurrently(clean_group, items, max_workers=max_workers)):
+        if isinstance(result, Exception):
+            raise result
+        for field, value in members:
+            cleaned[field.attname] = result[value]
+
+    for attname, value in cleaned.items():
+        setattr(instance, attname, value)
+        mark_cleaned(instance, attname, value)
+    return cleaned
+
+def _clean_fields_before_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    fields = [
+        field for field in sender._meta.concrete_fields
+        if isinstance(field, AICleanedField) and field.cleaning_prompt and not field.use_async
+        and (update_fields is None or field.name in update_fields)
+    ]
+    if len(fields) < 2:
+        # A single field cleans itself in pre_save
+        return
+    clean_instance_fields(instance, fields)
@@ -0,0 +1,51 @@
+from django import forms
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from .validators import get_ai_validators, prefetched_validations
+
+class AIConcurrentValidationMixin:
+    """
+    Form mixin that runs every AI validator of the form concurrently.
+
+    Before the regular ``full_clean()`` the pending AI validations of all form
+    fields (and, for ModelForms, the matching model fields) are dispatched in
+    parallel, so the form pays max(call) instead of sum(calls). Errors are then
+    raised per field by Django's usual validation flow.
+    """
+    ai_max_workers = None
+
+    def get_ai_validation_work(self):
+        pending = []
+        model = getattr(getattr(self, '_meta', None), 'model', None)
+
+        for name, field in self.fields.items():
+            if field.disabled:
+                continue
+            bound_field = self[name]
+            try:
+                value = field.to_python(field.bound_data(bound_field.data, bound_field.initial))
+            except ValidationError:
+                # The field fails its own checks, so its validators won't run either
+                continue
+
+            pending.extend((validator, value) for validator in get_ai_validators(field.validators))
+
+            if model is not None and isinstance(self, forms.BaseModelForm):
+                try:
+                    model_field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    continue
+                model_validators = get_ai_validators(model_field.validators)
+                if not model_validators:
+                    continue
+                try:
+                    model_value = model_field.to_python(value)
+                except ValidationError:
+                    continue
+                pending.extend((validator, model_value) for validator in model_validators)
+        return pending
+
+    def full_clean(self):
+        if not self.is_bound:
+            return super().full_clean()
+        with prefetched_validations(self.get_ai_validation_work(), max_workers=self.ai_max_workers):
+            super().full_clean()
@@ -0,0 +1,282 @@
+"""
+Hot-path instrumentation: provider latency, token usage, cache lookups,
+retries and task queue wait.
+
+Every measurement is sent as a Django signal (see ``signals.py``) and, when
+``AI_CLEANER_METRICS_BACKEND`` is set, recorded as counters and histograms
+labelled by provider, model, operation and prompt template fingerprint.
+When neither a backend nor a signal receiver is configured, instrumented
+calls skip all of it.
+"""
+import contextvars
+import hashlib
+import threading
+import time
+from functools import lru_cache
+from django.conf import settings
+from django.utils.module_loading import import_string
+from .signals import (
+    cleaning_task_started, llm_cache_lookup, llm_call_prefiltered, llm_cascade_decision, llm_request_finished,
+    llm_request_retried, validation_skipped,
+)
+
+class MetricsBackend:
+    """
+    Interface for metrics sinks. ``increment`` feeds counters, ``observe``
+    feeds histograms of durations in seconds.
+    """
+    def increment(self, name: str, labels: dict, value: float = 1):
+        raise NotImplementedError
+
+    def observe(self, name: str, labels: dict, value: float):
+        raise NotImplementedError
+
+class PrometheusMetricsBackend(MetricsBackend):
+    """Records metrics with ``prometheus_client``, e.g. ``ai_validator_provider_latency_seconds``."""
+    def __init__(self, namespace: str = 'ai_validator', registry=None, buckets=None):
+        try:
+            import prometheus_client
+        except ImportError:
+            raise ImportError("Prometheus metrics require the 'prometheus_client' package.")
+        self._prometheus = prometheus_client
+        self.namespace = namespace
+        self.registry = registry or prometheus_client.REGISTRY
+        self.buckets = buckets
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _metric(self, metric_class, name: str, labels: dict, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = metric_class(
+                        name, name.replace('_', ' '), sorted(labels),
+                        namespace=self.namespace, registry=self.registry, **kwargs
+                    )
+                    self._metrics[name] = metric
+        return metric.labels(**labels)
+
+    def increment(self, name: str, labels: dict, value: float = 1):
+        self._metric(self._prometheus.Counter, name, labels).inc(value)
+
+    def observe(self, name: str, labels: dict, value: float):
+        kwargs = {'buckets': self.buckets} if self.buckets else {}
+        self._metric(self._prometheus.Histogram, name, labels, **kwargs).observe(value)
+
+class StatsdMetricsBackend(MetricsBackend):
+    """
+    Records metrics with the ``statsd`` package. Plain StatsD has no tags, so
+    label values are appended to the metric name:
+    ``ai_validator.provider_requests.openai.gpt-4o.clean.1a2b3c4d5e6f.success``.
+    """
+    def __init__(self, host: str = 'localhost', port: int = 8125, prefix: str = 'ai_validator'):
+        try:
+            from statsd import StatsClient
+        except ImportError:
+            raise ImportError("StatsD metrics require the 'statsd' package.")
+        self.client = StatsClient(host=host, port=port, prefix=prefix)
+
+    def _name(self, name: str, labels: dict) -> str:
+        parts = [name]
+        for label in sorted(labels):
+            parts.append(str(labels[label]).replace('.', '_').replace(':', '_') or 'none')
+        return '.'.join(parts)
+
+    def increment(self, name: str, labels: dict, value: float = 1):
+        self.client.incr(self._name(name, labels), value)
+
+    def observe(self, name: str, labels: dict, value: float):
+        self.client.timing(self._name(name, labels), value * 1000)
+
+_backend = (None, None)  # (configured dotted path, instance)
+_backend_lock = threading.Lock()
+
+def get_metrics_backend():
+    """The backend configured by ``AI_CLEANER_METRICS_BACKEND``, or None."""
+    global _backend
+    path = getattr(settings, 'AI_CLEANER_METRICS_BACKEND', None)
+    if _backend[0] != path:
+        with _backend_lock:
+            if _backend[0] != path:
+                options = getattr(settings, 'AI_CLEANER_METRICS_OPTIONS', {})
+                _backend = (path, import_string(path)(**options) if path else None)
+    return _backend[1]
+
+def is_enabled() -> bool:
+    return (
+        getattr(settings, 'AI_CLEANER_METRICS_BACKEND', None) is not None
+        or llm_request_finished.has_listeners()
+        or llm_cache_lookup.has_listeners()
+        or llm_request_retried.has_listeners()
+        or llm_cascade_decision.has_listeners()
+    )
+
+@lru_cache(maxsize=1024)
+def prompt_fingerprint(prompt_template: str) -> str:
+    """Short, stable label for a prompt template."""
+    return hashlib.sha256(prompt_template.encode('utf-8')).hexdigest()[:12]
+
+class CallContext:
+    """Labels and token usage of the provider call running in this context."""
+    __slots__ = ('provider', 'model', 'operation', 'prompt', 'prompt_tokens', 'completion_tokens')
+
+    def __init__(self, provider: str, model: str, operation: str, prompt: str):
+        self.provider = provider
+        self.model = model
+        self.operation = operation
+        self.prompt = prompt
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def labels(self) -> dict:
+        return {'provider': self.provider, 'model': self.model, 'operation': self.operation, 'prompt': self.prompt}
+
+_current_call = contextvars.ContextVar('ai_validator_current_call', default=None)
+
+class _Tracker:
+    __slots__ = ('context', 'token')
+
+    def __init__(self, context: CallContext):
+        self.context = context
+
+    def __enter__(self):
+        self.token = _current_call.set(self.context)
+        return self.context
+
+    def __exit__(self, *exc_info):
+        _current_call.reset(self.token)
+
+class _NullTracker:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        pass
+
+_NULL_TRACKER = _NullTracker()
+
+def track(provider: str, model: str, operation: str, prompt_template: str):
+    """
+    Context manager labelling the cache lookups and provider requests made
+    inside it. A shared no-op when instrumentation is disabled.
+    """
+    if not is_enabled():
+        return _NULL_TRACKER
+    return _Tracker(CallContext(provider, str(model), operation, prompt_fingerprint(prompt_template)))
+
+def record_usage(prompt_tokens, completion_tokens):
+    """Called by adapters with the token usage reported by the provider."""
+    context = _current_call.get()
+    if context is not None:
+        context.prompt_tokens += prompt_tokens or 0
+        context.completion_tokens += completion_tokens or 0
+
+def _finish_request(context: CallContext, duration: float, batch_size: int, error: Exception = None):
+    prompt_tokens, completion_tokens = context.prompt_tokens, context.completion_tokens
+    context.prompt_tokens = context.completion_tokens = 0
+
+    llm_request_finished.send(
+        sender=CallContext,
+        duration=duration,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        batch_size=batch_size,
+        error=error,
+        **context.labels()
+    )
+    backend = get_metrics_backend()
+    if backend is None:
+        return
+    labels = context.labels()
+    backend.observe('provider_latency_seconds', labels, duration)
+    backend.increment('provider_requests', {**labels, 'outcome': 'error' if error else 'success'})
+    if error is not None:
+        backend.increment('provider_errors', {**labels, 'error': type(error).__name__})
+    if prompt_tokens:
+        backend.increment('tokens', {**labels, 'kind': 'prompt'}, prompt_tokens)
+    if completion_tokens:
+        backend.increment('tokens', {**labels, 'kind': 'completion'}, completion_tokens)
+
+def observe_request(call, batch_size: int = 1):
+    """Run a provider request, timing it and recording its usage and outcome."""
+    context = _current_call.get()
+    if context is None:
+        return call()
+    started = time.perf_counter()
+    try:
+        result = call()
+    except Exception as exc:
+        _finish_request(context, time.perf_counter() - started, batch_size, exc)
+        raise
+    _finish_request(context, time.perf_counter() - started, batch_size)
+    return result
+
+async def aobserve_request(call, batch_size: int = 1):
+    """Async variant of ``observe_request``; ``call`` returns an awaitable."""
+    context = _current_call.get()
+    if context is None:
+        return await call()
+    started = time.perf_counter()
+    try:
+        result = await call()
+    except Exception as exc:
+        _finish_request(context, time.perf_counter() - started, batch_size, exc)
+        raise
+    _finish_request(context, time.perf_counter() - started, batch_size)
+    return result
+
+def record_cache_lookup(tier: str, hit: bool, count: int = 1):
+    context = _current_call.get()
+    if context is None or not count:
+        return
+    llm_cache_lookup.send(sender=CallContext, tier=tier, hit=hit, count=count, **context.labels())
+    backend = get_metrics_backend()
+    if backend is not None:
+        backend.increment('cache_lookups', {**context.labels(), 'tier': tier, 'result': 'hit' if hit else 'miss'}, count)
+
+def record_retry(attempt: int, error: Exception = None):
+    context = _current_call.get()
+    if context is None:
+        return
+    llm_request_retried.send(sender=CallContext, attempt=attempt, error=error, **context.labels())
+    backend = get_metrics_backend()
+    if backend is not None:
+        backend.increment('provider_retries', context.labels())
+
+def record_cascade(escalated: bool, count: int = 1):
+    """Record whether the fast model's answers were kept or escalated to the larger model."""
+    context = _current_call.get()
+    if context is None or not count:
+        return
+    llm_cascade_decision.send(sender=CallContext, escalated=escalated, count=count, **context.labels())
+    backend = get_metrics_backend()
+    if backend is not None:
+        backend.increment('cascade_decisions', {**context.labels(), 'result': 'escalated' if escalated else 'answered'}, count)
+
+def record_prefilter(operation: str, prefilter):
+    """Record a provider call saved by a pre-filter deciding the value locally."""
+    llm_call_prefiltered.send(sender=type(prefilter), operation=operation, prefilter=prefilter)
+    backend = get_metrics_backend()
+    if backend is not None:
+        backend.increment('prefiltered_calls', {'operation': operation, 'prefilter': type(prefilter).__name__})
+
+def record_budget_skip(validator, value: str, policy: str):
+    """Record a validation skipped or deferred because the latency budget was spent."""
+    validation_skipped.send(sender=type(validator), validator=validator, value=value, policy=policy)
+    backend = get_metrics_backend()
+    if backend is not None:
+        backend.increment('budget_skipped_validations', {'policy': policy})
+
+def record_queue_wait(task: str, enqueued_at: float):
+    """Record how long a task waited in the broker; ``enqueued_at`` is a ``time.time()`` timestamp."""
+    if enqueued_at is None:
+        return
+    queue_wait = max(time.time() - enqueued_at, 0.0)
+    cleaning_task_started.send(sender=CallContext, task=task, queue_wait=queue_wait)
+    backend = get_metrics_backend()
+    if backend is not None:
+        backend.observe('task_queue_wait_seconds', {'task': task}, queue_wait)
@@ -1,7 +1,30 @@
 import abc
+import contextvars
+import json
 import os
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from ..budget import cap_timeout
+from ..instrumentation import record_usage
+
+# Timeout in seconds for the provider request being made, set per operation
+# by ResilientLLMProxy. None leaves the SDK's own default in place.
+_request_timeout = contextvars.ContextVar('ai_validator_request_timeout', default=None)
+
+def estimate_tokens(*texts: str) -> int:
+    # Token usage is estimated at ~4 characters per token
+    return sum(len(text) // 4 + 1 for text in texts)
+
+def _http_client_kwargs(pool_size: int = None) -> dict:
+    """
+    Keyword arguments for an ``httpx`` client sized for ``pool_size`` concurrent,
+    kept-alive connections. Empty when no explicit pool size is configured.
+    """
+    if not pool_size:
+        return {}
+    import httpx
+    return {'limits': httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)}
 
 class LLMAdapter(abc.ABC):
     """
@@ -16,76 +39,277 @@ class LLMAdapter(abc.ABC):
     def clean(self, value: str, prompt_template: str) -> str:
         pass
 
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        # Adapters without a native async client run the blocking call in a worker thread
+        return await sync_to_async(self.validate, thread_sensitive=False)(value, prompt_template)
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        return await sync_to_async(self.clean, thread_sensitive=False)(value, prompt_template)
+
+    def validate_many(self, values: List[str], prompt_template: str) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Validate several values, packing them into as few requests as the
+        batch size and token budget allow. Adapters that don't implement
+        ``_complete`` validate one value per request.
+        """
+        return self._run_batched(values, prompt_template, 'validate')
+
+    def clean_many(self, values: List[str], prompt_template: str) -> List[str]:
+        return self._run_batched(values, prompt_template, 'clean')
+
+    def _complete(self, prompt: str, system: str = None, max_tokens: int = None) -> str:
+        """Send a raw prompt to the provider and return the stripped text response."""
+        raise NotImplementedError
+
+    def _timeout_kwargs(self) -> dict:
+        """Per-request ``timeout`` keyword for SDK calls, empty when none is set."""
+        # Never wait longer than the current latency budget allows
+        timeout = cap_timeout(_request_timeout.get())
+        return {'timeout': timeout} if timeout is not None else {}
+
+    def _supports_batching(self) -> bool:
+        return type(self)._complete is not LLMAdapter._complete
+
+    def _chunk_values(self, values: List[str]) -> List[List[int]]:
+        batch_size = getattr(settings, 'AI_CLEANER_BATCH_SIZE', 20)
+        token_budget = getattr(settings, 'AI_CLEANER_BATCH_TOKEN_BUDGET', 4000)
+        chunks, current, current_tokens = [], [], 0
+        for index, value in enumerate(values):
+            # Counted as the JSON item _batch_prompt sends for it
+            tokens = estimate_tokens(json.dumps({"index": index, "input": value}, ensure_ascii=False))
+            if current and (len(current) >= batch_size or current_tokens + tokens > token_budget):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _run_batched(self, values: List[str], prompt_template: str, operation: str) -> list:
+        single = self.validate if operation == 'validate' else self.clean
+        if not self._supports_batching():
+            return [single(value, prompt_template) for value in values]
+
+        results = [None] * len(values)
+        for chunk in self._chunk_values(values):
+            if len(chunk) == 1:
+                results[chunk[0]] = single(values[chunk[0]], prompt_template)
+                continue
+            chunk_values = [values[index] for index in chunk]
+            try:
+                content = self._complete(
+                    self._batch_prompt(chunk_values, prompt_template, operation),
+                    system="You are a helpful data processing assistant. You answer in JSON.",
+                    max_tokens=4096,
+                )
+                parsed = self._parse_batch(content, len(chunk_values), operation)
+            except ValueError:
+                parsed = [None] * len(chunk_values)
+            for index, item in zip(chunk, parsed):
+                # Items the model answered incorrectly fall back to a single call
+                results[index] = item if item is not None else single(values[index], prompt_template)
+        return results
+
+    def _batch_prompt(self, values: List[str], prompt_template: str, operation: str) -> str:
+        if operation == 'validate':
+            answer = '{"index": <n>, "valid": true or false, "reason": "<why it is invalid, or null>"}'
+        else:
+            answer = '{"index": <n>, "value": "<the cleaned/normalized value>"}'
+        inputs = json.dumps([{"index": i, "input": value} for i, value in enumerate(values)], ensure_ascii=False)
+        return (
+            f"{prompt_template}\n\n"
+            f"Apply the instructions above to each of the following inputs independently.\n"
+            f"Inputs (JSON): {inputs}\n\n"
+            f"Respond with ONLY a JSON array containing one object per input, in any order, of the form {answer}."
+        )
+
+    def _parse_batch(self, content: str, count: int, operation: str) -> list:
+        """
+        Parse a batched JSON answer into per-item results. Items that are
+        missing or malformed are returned as None. Raises ValueError when the
+        response is not a JSON array at all.
+        """
+        # Tolerate prose or markdown code fences around the array
+        start, end = content.find("["), content.rfind("]")
+        if start == -1 or end == -1:
+            raise ValueError("Batch response is not a JSON array.")
+        items = json.loads(content[start:end + 1])
+        if not isinstance(items, list):
+            raise ValueError("Batch response is not a JSON array.")
+
+        results = [None] * count
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index")
+            if not isinstance(index, int) or not 0 <= index < count:
+                continue
+            if operation == 'validate':
+                if not isinstance(item.get("valid"), bool):
+                    continue
+                reason = item.get("reason")
+                results[index] = (True, None) if item["valid"] else (False, str(reason or "Invalid value."))
+            elif isinstance(item.get("value"), str):
+                results[index] = item["value"].strip()
+        return results
+
+    def _validation_prompt(self, value: str, prompt_template: str) -> str:
+        return f"{prompt_template}\n\nInput: {value}\n\nRespond with 'VALID' if it meets the criteria. Otherwise, explain why it is invalid."
+
+    def _cleaning_prompt(self, value: str, prompt_template: str) -> str:
+        return f"{prompt_template}\n\nInput: {value}\n\nReturn ONLY the cleaned/normalized value."
+
+    def _parse_validation(self, content: str) -> Tuple[bool, Optional[str]]:
+        content = content.strip()
+        if content.upper().startswith("VALID"):
+            return True, None
+        else:
+            return False, content
+
 class OpenAIAdapter(LLMAdapter):
     """Adapter for OpenAI API."""
-    def __init__(self, api_key: str = None, model: str = "gpt-3.5-turbo", **kwargs):
+    def __init__(self, api_key: str = None, model: str = "gpt-3.5-turbo", pool_size: int = None, **kwargs):
         self.api_key = api_key or getattr(settings, 'OPENAI_API_KEY', os.environ.get("OPENAI_API_KEY"))
         self.model = model
+        self.pool_size = pool_size
+        self._async_client = None
         try:
             from openai import OpenAI
-            self.client = OpenAI(api_key=self.api_key)
+            client_kwargs = {}
+            if pool_size:
+                from openai import DefaultHttpxClient
+                client_kwargs['http_client'] = DefaultHttpxClient(**_http_client_kwargs(pool_size))
+            self.client = OpenAI(api_key=self.api_key, **client_kwargs)
         except ImportError:
             raise ImportError("OpenAI package is not installed. Please install 'openai'.")
 
-    def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
-        prompt = f"{prompt_template}\n\nInput: {value}\n\nRespond with 'VALID' if it meets the criteria. Otherwise, explain why it is invalid."
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            client_kwargs = {}
+            if self.pool_size:
+                from openai import DefaultAsyncHttpxClient
+                client_kwargs['http_client'] = DefaultAsyncHttpxClient(**_http_client_kwargs(self.pool_size))
+            self._async_client = AsyncOpenAI(api_key=self.api_key, **client_kwargs)
+        return self._async_client
+
+    def _messages(self, system: str, prompt: str) -> list:
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _complete(self, prompt: str, system: str = None, max_tokens: int = None) -> str:
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a helpful data validation assistant."},
-                {"role": "user", "content": prompt}
-            ],
+            **self._timeout_kwargs(),
+            messages=self._messages(system or "You are a helpful data assistant.", prompt),
             temperature=0.0,
+            **({'max_tokens': max_tokens} if max_tokens else {}),
         )
-        content = response.choices[0].message.content.strip()
-        if content.upper().startswith("VALID"):
-            return True, None
-        else:
-            return False, content
+        self._record_usage(response)
+        return response.choices[0].message.content.strip()
+
+    def _record_usage(self, response):
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            record_usage(usage.prompt_tokens, usage.completion_tokens)
+
+    def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        content = self._complete(self._validation_prompt(value, prompt_template), system="You are a helpful data validation assistant.")
+        return self._parse_validation(content)
 
     def clean(self, value: str, prompt_template: str) -> str:
-        prompt = f"{prompt_template}\n\nInput: {value}\n\nReturn ONLY the cleaned/normalized value."
-        response = self.client.chat.completions.create(
+        return self._complete(self._cleaning_prompt(value, prompt_template), system="You are a helpful data cleaning assistant.")
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            **self._timeout_kwargs(),
+            messages=self._messages("You are a helpful data validation assistant.", self._validation_prompt(value, prompt_template)),
+            temperature=0.0,
+        )
+        self._record_usage(response)
+        return self._parse_validation(response.choices[0].message.content)
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        response = await self.async_client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a helpful data cleaning assistant."},
-                {"role": "user", "content": prompt}
-            ],
+            **self._timeout_kwargs(),
+            messages=self._messages("You are a helpful data cleaning assistant.", self._cleaning_prompt(value, prompt_template)),
             temperature=0.0,
         )
+        self._record_usage(response)
         return response.choices[0].message.content.strip()
 
 class AnthropicAdapter(LLMAdapter):
     """Adapter for Anthropic API."""
-    def __init__(self, api_key: str = None, model: str = "claude-3-opus-20240229", **kwargs):
+    def __init__(self, api_key: str = None, model: str = "claude-3-opus-20240229", pool_size: int = None, **kwargs):
         self.api_key = api_key or getattr(settings, 'ANTHROPIC_API_KEY', os.environ.get("ANTHROPIC_API_KEY"))
         self.model = model
+        self.pool_size = pool_size
+        self._async_client = None
         try:
             import anthropic
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            client_kwargs = {}
+            if pool_size:
+                client_kwargs['http_client'] = anthropic.DefaultHttpxClient(**_http_client_kwargs(pool_size))
+            self.client = anthropic.Anthropic(api_key=self.api_key, **client_kwargs)
         except ImportError:
             raise ImportError("Anthropic package is not installed. Please install 'anthropic'.")
 
-    def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
-        prompt = f"{prompt_template}\n\nInput: {value}\n\nRespond with 'VALID' if it meets the criteria. Otherwise, explain why it is invalid."
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            import anthropic
+            client_kwargs = {}
+            if self.pool_size:
+                client_kwargs['http_client'] = anthropic.DefaultAsyncHttpxClient(**_http_client_kwargs(self.pool_size))
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key, **client_kwargs)
+        return self._async_client
+
+    def _complete(self, prompt: str, system: str = None, max_tokens: int = None) -> str:
         message = self.client.messages.create(
             model=self.model,
-            max_tokens=1024,
+            **self._timeout_kwargs(),
+            max_tokens=max_tokens or 1024,
+            **({'system': system} if system else {}),
             messages=[{"role": "user", "content": prompt}]
         )
-        content = message.content[0].text.strip()
-        if content.upper().startswith("VALID"):
-            return True, None
-        else:
-            return False, content
+        self._record_usage(message)
+        return message.content[0].text.strip()
+
+    def _record_usage(self, message):
+        usage = getattr(message, 'usage', None)
+        if usage is not None:
+            record_usage(usage.input_tokens, usage.output_tokens)
+
+    def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        return self._parse_validation(self._complete(self._validation_prompt(value, prompt_template)))
 
     def clean(self, value: str, prompt_template: str) -> str:
-        prompt = f"{prompt_template}\n\nInput: {value}\n\nReturn ONLY the cleaned/normalized value."
-        message = self.client.messages.create(
+        return self._complete(self._cleaning_prompt(value, prompt_template))
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        message = await self.async_client.messages.create(
             model=self.model,
+            **self._timeout_kwargs(),
             max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": self._validation_prompt(value, prompt_template)}]
         )
+        self._record_usage(message)
+        return self._parse_validation(message.content[0].text)
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        message = await self.async_client.messages.create(
+            model=self.model,
+            **self._timeout_kwargs(),
+            max_tokens=1024,
+            messages=[{"role": "user", "content": self._cleaning_prompt(value, prompt_template)}]
+        )
+        self._record_usage(message)
         return message.content[0].text.strip()
 
 class GeminiAdapter(LLMAdapter):
@@ -100,45 +324,96 @@ class GeminiAdapter(LLMAdapter):
         except ImportError:
             raise ImportError("Google Generative AI package is not installed. Please install 'google-generativeai'.")
 
+    def _complete(self, prompt: str, system: str = None, max_tokens: int = None) -> str:
+        if system:
+            # Older models such as gemini-pro take no system instruction, so it leads the prompt
+            prompt = f"{system}\n\n{prompt}"
+        response = self.client.generate_content(
+            prompt,
+            generation_config={'max_output_tokens': max_tokens} if max_tokens else None,
+            request_options=self._timeout_kwargs(),
+        )
+        self._record_usage(response)
+        return response.text.strip()
+
+    def _record_usage(self, response):
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            record_usage(usage.prompt_token_count, usage.candidates_token_count)
+
     def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
-        prompt = f"{prompt_template}\n\nInput: {value}\n\nRespond with 'VALID' if it meets the criteria. Otherwise, explain why it is invalid."
-        response = self.client.generate_content(prompt)
-        content = response.text.strip()
-        if content.upper().startswith("VALID"):
-            return True, None
-        else:
-            return False, content
+        return self._parse_validation(self._complete(self._validation_prompt(value, prompt_template)))
 
     def clean(self, value: str, prompt_template: str) -> str:
-        prompt = f"{prompt_template}\n\nInput: {value}\n\nReturn ONLY the cleaned/normalized value."
-        response = self.client.generate_content(prompt)
+        return self._complete(self._cleaning_prompt(value, prompt_template))
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        response = await self.client.generate_content_async(self._validation_prompt(value, prompt_template), request_options=self._timeout_kwargs())
+        self._record_usage(response)
+        return self._parse_validation(response.text)
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        response = await self.client.generate_content_async(self._cleaning_prompt(value, prompt_template), request_options=self._timeout_kwargs())
+        self._record_usage(response)
         return response.text.strip()
 
 class OllamaAdapter(LLMAdapter):
     """Adapter for Ollama (Llama) API."""
-    def __init__(self, host: str = None, model: str = "llama3", **kwargs):
+    def __init__(self, host: str = None, model: str = "llama3", pool_size: int = None, timeout: float = None, **kwargs):
         self.host = host or getattr(settings, 'OLLAMA_HOST', os.environ.get("OLLAMA_HOST"))
         self.model = model
+        self.pool_size = pool_size
+        # ollama's chat() takes no per-request timeout, so one applies to the whole client
+        self.timeout = timeout
+        self._async_client = None
         try:
             import ollama
-            self.client = ollama.Client(host=self.host)
+            # ollama.Client forwards extra kwargs to its httpx.Client
+            self.client = ollama.Client(host=self.host, **self._client_kwargs())
         except ImportError:
             raise ImportError("Ollama package is not installed. Please install 'ollama'.")
 
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            import ollama
+            self._async_client = ollama.AsyncClient(host=self.host, **self._client_kwargs())
+        return self._async_client
+
+    def _client_kwargs(self) -> dict:
+        kwargs = _http_client_kwargs(self.pool_size)
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        return kwargs
+
+    def _complete(self, prompt: str, system: str = None, max_tokens: int = None) -> str:
+        messages = [{'role': 'system', 'content': system}] if system else []
+        messages.append({'role': 'user', 'content': prompt})
+        response = self.client.chat(
+            model=self.model, messages=messages, options={'num_predict': max_tokens} if max_tokens else None,
+        )
+        self._record_usage(response)
+        return response['message']['content'].strip()
+
+    def _record_usage(self, response):
+        record_usage(response.get('prompt_eval_count'), response.get('eval_count'))
+
     def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
-        prompt = f"{prompt_template}\n\nInput: {value}\n\nRespond with 'VALID' if it meets the criteria. Otherwise, explain why it is invalid."
-        response = self.client.chat(model=self.model, messages=[
-            {'role': 'user', 'content': prompt},
-        ])
-        content = response['message']['content'].strip()
-        if content.upper().startswith("VALID"):
-            return True, None
-        else:
-            return False, content
+        return self._parse_validation(self._complete(self._validation_prompt(value, prompt_template)))
 
     def clean(self, value: str, prompt_template: str) -> str:
-        prompt = f"{prompt_template}\n\nInput: {value}\n\nReturn ONLY the cleaned/normalized value."
-        response = self.client.chat(model=self.model, messages=[
-            {'role': 'user', 'content': prompt},
+        return self._complete(self._cleaning_prompt(value, prompt_template))
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        response = await self.async_client.chat(model=self.model, messages=[
+            {'role': 'user', 'content': self._validation_prompt(value, prompt_template)},
+        ])
+        self._record_usage(response)
+        return self._parse_validation(response['message']['content'])
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        response = await self.async_client.chat(model=self.model, messages=[
+            {'role': 'user', 'content': self._cleaning_prompt(value, prompt_template)},
         ])
+        self._record_usage(response)
         return response['message']['content'].strip()
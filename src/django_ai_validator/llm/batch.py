@@ -0,0 +1,217 @@
+import abc
+import json
+import os
+import shutil
+import uuid
+from typing import Iterator, Optional, Tuple
+from django.conf import settings
+from django.utils.module_loading import import_string
+from .adapters import LLMAdapter
+from .factory import LLMFactory
+
+BATCH_RUNNING = 'running'
+BATCH_COMPLETED = 'completed'
+BATCH_FAILED = 'failed'
+
+def get_batch_dir() -> str:
+    """Directory for batch request, manifest and stand-in result files."""
+    directory = getattr(settings, 'AI_CLEANER_BATCH_DIR', None)
+    return str(directory) if directory else os.path.join(str(getattr(settings, 'BASE_DIR', os.getcwd())), 'ai_batches')
+
+class BatchBackend(abc.ABC):
+    """
+    Strategy Pattern: submits a JSONL file of requests to a provider's batch
+    API and streams the results back. ``adapter`` supplies the model and the
+    prompts, so batch results match what the per-request path would return.
+
+    Larger jobs are split into several batches of at most ``max_requests``
+    requests and ``max_bytes`` of JSONL each (None for no limit).
+    """
+    max_requests = None
+    max_bytes = None
+
+    def __init__(self, adapter: LLMAdapter):
+        self.adapter = adapter
+        self.model = adapter.model
+
+    @abc.abstractmethod
+    def build_request(self, custom_id: str, operation: str, value: str, prompt_template: str) -> dict:
+        """One line of the JSONL request file."""
+
+    @abc.abstractmethod
+    def submit(self, path: str) -> str:
+        """Submit the request file at ``path`` and return the provider's batch id."""
+
+    @abc.abstractmethod
+    def poll(self, batch_id: str) -> Tuple[str, Optional[str]]:
+        """``(state, error)``, where ``state`` is ``BATCH_RUNNING``, ``BATCH_COMPLETED`` or ``BATCH_FAILED``."""
+
+    @abc.abstractmethod
+    def results(self, batch_id: str, operation: str) -> Iterator[Tuple[str, object]]:
+        """
+        Stream ``(custom_id, result)`` pairs of a completed batch, always in
+        the same order. ``result`` is None for requests that failed.
+        """
+
+    def _prompt(self, operation: str, value: str, prompt_template: str) -> str:
+        if operation == 'validate':
+            return self.adapter._validation_prompt(value, prompt_template)
+        return self.adapter._cleaning_prompt(value, prompt_template)
+
+    def _parse(self, operation: str, content: Optional[str]):
+        if content is None:
+            return None
+        if operation == 'validate':
+            return self.adapter._parse_validation(content)
+        return content.strip()
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API: the request file is uploaded and processed within 24 hours."""
+    endpoint = '/v1/chat/completions'
+    max_requests = 50_000
+    max_bytes = 200 * 1024 * 1024
+
+    def build_request(self, custom_id: str, operation: str, value: str, prompt_template: str) -> dict:
+        system = "You are a helpful data validation assistant." if operation == 'validate' else "You are a helpful data cleaning assistant."
+        return {
+            'custom_id': custom_id,
+            'method': 'POST',
+            'url': self.endpoint,
+            'body': {
+                'model': self.model,
+                'messages': self.adapter._messages(system, self._prompt(operation, value, prompt_template)),
+                'temperature': 0.0,
+            },
+        }
+
+    def submit(self, path: str) -> str:
+        client = self.adapter.client
+        with open(path, 'rb') as requests:
+            input_file = client.files.create(file=requests, purpose='batch')
+        return client.batches.create(input_file_id=input_file.id, endpoint=self.endpoint, completion_window='24h').id
+
+    def poll(self, batch_id: str) -> Tuple[str, Optional[str]]:
+        batch = self.adapter.client.batches.retrieve(batch_id)
+        if batch.status == 'completed':
+            return BATCH_COMPLETED, None
+        if batch.status in ('failed', 'expired', 'cancelled'):
+            return BATCH_FAILED, f"OpenAI batch {batch_id} is {batch.status}."
+        return BATCH_RUNNING, None
+
+    def results(self, batch_id: str, operation: str) -> Iterator[Tuple[str, object]]:
+        client = self.adapter.client
+        batch = client.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            with client.files.with_streaming_response.content(file_id) as response:
+                for line in response.iter_lines():
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    response_body = (item.get('response') or {}).get('body') or {}
+                    choices = response_body.get('choices') or [{}]
+                    content = None if item.get('error') else choices[0].get('message', {}).get('content')
+                    yield item['custom_id'], self._parse(operation, content)
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API: requests are sent inline, up to 100,000 per batch."""
+    max_requests = 100_000
+    max_bytes = 256 * 1024 * 1024
+
+    def build_request(self, custom_id: str, operation: str, value: str, prompt_template: str) -> dict:
+        return {
+            'custom_id': custom_id,
+            'params': {
+                'model': self.model,
+                'max_tokens': 1024,
+                'messages': [{'role': 'user', 'content': self._prompt(operation, value, prompt_template)}],
+            },
+        }
+
+    def submit(self, path: str) -> str:
+        with open(path, encoding='utf-8') as requests:
+            batch_requests = [json.loads(line) for line in requests if line.strip()]
+        return self.adapter.client.messages.batches.create(requests=batch_requests).id
+
+    def poll(self, batch_id: str) -> Tuple[str, Optional[str]]:
+        batch = self.adapter.client.messages.batches.retrieve(batch_id)
+        if batch.processing_status == 'ended':
+            return BATCH_COMPLETED, None
+        return BATCH_RUNNING, None
+
+    def results(self, batch_id: str, operation: str) -> Iterator[Tuple[str, object]]:
+        for entry in self.adapter.client.messages.batches.results(batch_id):
+            content = entry.result.message.content[0].text if entry.result.type == 'succeeded' else None
+            yield entry.custom_id, self._parse(operation, content)
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-based stand-in for tests and development: a batch is processed with
+    the provider's adapter, one request at a time, when it is first polled.
+    """
+    def _path(self, batch_id: str, kind: str) -> str:
+        directory = os.path.join(get_batch_dir(), 'local')
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{batch_id}.{kind}.jsonl")
+
+    def build_request(self, custom_id: str, operation: str, value: str, prompt_template: str) -> dict:
+        return {'custom_id': custom_id, 'operation': operation, 'value': value, 'prompt_template': prompt_template}
+
+    def submit(self, path: str) -> str:
+        batch_id = uuid.uuid4().hex
+        shutil.copyfile(path, self._path(batch_id, 'input'))
+        return batch_id
+
+    def poll(self, batch_id: str) -> Tuple[str, Optional[str]]:
+        output_path = self._path(batch_id, 'output')
+        if not os.path.exists(output_path):
+            self._process(batch_id, output_path)
+        return BATCH_COMPLETED, None
+
+    def _process(self, batch_id: str, output_path: str):
+        with open(self._path(batch_id, 'input'), encoding='utf-8') as requests, \
+                open(f"{output_path}.part", 'w', encoding='utf-8') as output:
+            for line in requests:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                call = self.adapter.validate if request['operation'] == 'validate' else self.adapter.clean
+                try:
+                    result = call(request['value'], request['prompt_template'])
+                except Exception as exc:
+                    output.write(json.dumps({'custom_id': request['custom_id'], 'error': str(exc)}) + '\n')
+                else:
+                    output.write(json.dumps({'custom_id': request['custom_id'], 'result': result}) + '\n')
+        os.replace(f"{output_path}.part", output_path)
+
+    def results(self, batch_id: str, operation: str) -> Iterator[Tuple[str, object]]:
+        with open(self._path(batch_id, 'output'), encoding='utf-8') as output:
+            for line in output:
+                item = json.loads(line)
+                result = item.get('result')
+                if operation == 'validate' and result is not None:
+                    result = tuple(result)
+                yield item['custom_id'], result
+
+BATCH_BACKENDS = {
+    'openai': 'django_ai_validator.llm.batch.OpenAIBatchBackend',
+    'anthropic': 'django_ai_validator.llm.batch.AnthropicBatchBackend',
+    'local': 'django_ai_validator.llm.batch.LocalBatchBackend',
+}
+
+def get_batch_backend(name: str, provider: str = None) -> BatchBackend:
+    """
+    Build the batch backend ``name`` (a key of ``BATCH_BACKENDS`` or
+    ``AI_CLEANER_BATCH_BACKENDS``, or a dotted path) around ``provider``'s
+    adapter. ``provider`` defaults to the backend's own provider, or to
+    ``AI_CLEANER_DEFAULT_PROVIDER`` for the local stand-in.
+    """
+    backends = {**BATCH_BACKENDS, **getattr(settings, 'AI_CLEANER_BATCH_BACKENDS', {})}
+    try:
+        backend_class = import_string(backends.get(name, name))
+    except ImportError:
+        raise ValueError(f"Unknown batch backend: {name}")
+    if not provider and name in LLMFactory._registry:
+        provider = name
+    return backend_class(LLMFactory.get_factory(provider).create_adapter())
@@ -0,0 +1,102 @@
+import logging
+from typing import List, Tuple, Optional
+from django.conf import settings
+from django.utils.module_loading import import_string
+from .adapters import LLMAdapter
+from ..instrumentation import record_cascade
+
+logger = logging.getLogger(__name__)
+
+UNSURE = "UNSURE"
+UNSURE_INSTRUCTION = f"\n\nIf you cannot decide with confidence, respond with '{UNSURE}' only."
+
+def escalate_on_invalid(result: Tuple[bool, Optional[str]]) -> bool:
+    """Default policy: trust the fast model's VALID answers, re-check everything else."""
+    return not result[0]
+
+def escalate_on_unsure(result: Tuple[bool, Optional[str]]) -> bool:
+    """Trust both answers of the fast model and only escalate when it says it is unsure."""
+    return not result[0] and (result[1] or '').strip().upper().startswith(UNSURE)
+
+class CascadeAdapter(LLMAdapter):
+    """
+    Composite adapter answering validations with a small, fast model first
+    and escalating to a larger one only when ``escalate(result)`` says so,
+    or when the fast model fails. Cleaning always uses the larger model.
+    """
+    composite = True
+
+    def __init__(self, fast: LLMAdapter, strong: LLMAdapter, escalate=escalate_on_invalid):
+        self.fast = fast
+        self.strong = strong
+        self.escalate = escalate
+        self.model = f"cascade:{fast.model}>{strong.model}"
+
+    @classmethod
+    def from_settings(cls, strong: str = None, **kwargs) -> 'CascadeAdapter':
+        from .registry import build_adapter
+        config = getattr(settings, 'AI_CLEANER_CASCADE', {})
+        options = config.get('OPTIONS', {})
+        fast_name = config.get('FAST', 'ollama')
+        strong_name = strong or config.get('STRONG') or getattr(settings, 'AI_CLEANER_DEFAULT_PROVIDER', 'openai')
+        escalate = config.get('ESCALATE', escalate_on_invalid)
+        return cls(
+            build_adapter(fast_name, **options.get(fast_name, {})),
+            build_adapter(strong_name, **options.get(strong_name, {})),
+            escalate=import_string(escalate) if isinstance(escalate, str) else escalate,
+        )
+
+    def _fast_prompt(self, prompt_template: str) -> str:
+        return prompt_template + UNSURE_INSTRUCTION
+
+    def _fast_failed(self, exc: Exception, count: int = 1):
+        logger.warning("Fast model %s failed, escalating to %s: %s", self.fast.model, self.strong.model, exc)
+        record_cascade(True, count)
+
+    def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        try:
+            result = self.fast.validate(value, self._fast_prompt(prompt_template))
+        except Exception as exc:
+            self._fast_failed(exc)
+            return self.strong.validate(value, prompt_template)
+        escalated = self.escalate(result)
+        record_cascade(escalated)
+        if escalated:
+            return self.strong.validate(value, prompt_template)
+        return result
+
+    def validate_many(self, values: List[str], prompt_template: str) -> List[Tuple[bool, Optional[str]]]:
+        try:
+            results = self.fast.validate_many(values, self._fast_prompt(prompt_template))
+        except Exception as exc:
+            self._fast_failed(exc, len(values))
+            return self.strong.validate_many(values, prompt_template)
+        escalate = [index for index, result in enumerate(results) if self.escalate(result)]
+        record_cascade(False, len(values) - len(escalate))
+        record_cascade(True, len(escalate))
+        if escalate:
+            strong_results = self.strong.validate_many([values[index] for index in escalate], prompt_template)
+            for index, result in zip(escalate, strong_results):
+                results[index] = result
+        return results
+
+    def clean(self, value: str, prompt_template: str) -> str:
+        return self.strong.clean(value, prompt_template)
+
+    def clean_many(self, values: List[str], prompt_template: str) -> List[str]:
+        return self.strong.clean_many(values, prompt_template)
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        try:
+            result = await self.fast.avalidate(value, self._fast_prompt(prompt_template))
+        except Exception as exc:
+            self._fast_failed(exc)
+            return await self.strong.avalidate(value, prompt_template)
+        escalated = self.escalate(result)
+        record_cascade(escalated)
+        if escalated:
+            return await self.strong.avalidate(value, prompt_template)
+        return result
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        return await self.strong.aclean(value, prompt_template)
@@ -27,8 +27,21 @@ class GeminiFactory(AIProviderFactory):
 class OllamaFactory(AIProviderFactory):
     def create_adapter(self, **kwargs) -> LLMAdapter:
         from .adapters import OllamaAdapter
+        from .resilience import get_timeouts
+        # Ollama only supports a client-wide timeout: use the longest operation timeout
+        kwargs.setdefault('timeout', max(get_timeouts().values()))
         return OllamaAdapter(**kwargs)
 
+class RouterFactory(AIProviderFactory):
+    def create_adapter(self, **kwargs) -> LLMAdapter:
+        from .router import RoutingAdapter
+        return RoutingAdapter.from_settings(**kwargs)
+
+class CascadeFactory(AIProviderFactory):
+    def create_adapter(self, **kwargs) -> LLMAdapter:
+        from .cascade import CascadeAdapter
+        return CascadeAdapter.from_settings(**kwargs)
+
 class LLMFactory:
     """
     Simple Factory / Registry to get the correct Abstract Factory.
@@ -38,6 +51,8 @@ class LLMFactory:
         'anthropic': AnthropicFactory,
         'gemini': GeminiFactory,
         'ollama': OllamaFactory,
+        'router': RouterFactory,
+        'cascade': CascadeFactory,
     }
 
     @classmethod
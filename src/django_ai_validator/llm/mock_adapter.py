@@ -1,5 +1,10 @@
-from django_ai_validator.llm.adapters import LLMAdapter
-from typing import Tuple, Optional
+import math
+import random
+import threading
+import time
+from django_ai_validator.instrumentation import record_usage
+from django_ai_validator.llm.adapters import LLMAdapter, estimate_tokens
+from typing import List, Tuple, Optional
 
 class MockAdapter(LLMAdapter):
     def __init__(self, **kwargs):
@@ -12,3 +17,108 @@ class MockAdapter(LLMAdapter):
 
     def clean(self, value: str, prompt_template: str) -> str:
         return value.replace("dirty", "clean")
+
+class SimulatedRateLimitError(Exception):
+    """Raised by SimulatedLatencyAdapter to mimic a provider's HTTP 429."""
+    def __init__(self, retry_after: float = 1.0):
+        self.retry_after = retry_after
+        super().__init__(f"Simulated rate limit exceeded, retry after {retry_after}s.")
+
+class SimulatedLatencyAdapter(MockAdapter):
+    """
+    MockAdapter that behaves like a remote provider for benchmarks and load
+    tests: every request sleeps for a sampled latency, may fail with a
+    rate-limit error and accrues token usage and cost. Answers are the same
+    as MockAdapter's.
+    """
+    def __init__(
+        self,
+        latency_ms: float = 50.0,
+        jitter_ms: float = 10.0,
+        distribution: str = 'normal',
+        rate_limit_probability: float = 0.0,
+        retry_after: float = 1.0,
+        cost_per_1k_prompt_tokens: float = 0.0005,
+        cost_per_1k_completion_tokens: float = 0.0015,
+        seed: int = None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.model = "simulated-model"
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self.rate_limit_probability = rate_limit_probability
+        self.retry_after = retry_after
+        self.cost_per_1k_prompt_tokens = cost_per_1k_prompt_tokens
+        self.cost_per_1k_completion_tokens = cost_per_1k_completion_tokens
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {
+            'requests': 0,
+            'rate_limited': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'cost': 0.0,
+        }
+
+    def _sample_latency(self) -> float:
+        with self._lock:
+            if self.distribution == 'constant':
+                latency = self.latency_ms
+            elif self.distribution == 'uniform':
+                latency = self._random.uniform(self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms)
+            elif self.distribution == 'lognormal':
+                # Median of latency_ms with a long tail, as seen on real providers
+                sigma = self.jitter_ms / self.latency_ms if self.latency_ms else 0.0
+                latency = self._random.lognormvariate(math.log(max(self.latency_ms, 1e-3)), sigma)
+            else:
+                latency = self._random.gauss(self.latency_ms, self.jitter_ms)
+            return max(latency, 0.0) / 1000
+
+    def _request(self, prompt: str, completion: str):
+        time.sleep(self._sample_latency())
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(completion)
+        with self._lock:
+            self.stats['requests'] += 1
+            if self._random.random() < self.rate_limit_probability:
+                self.stats['rate_limited'] += 1
+                raise SimulatedRateLimitError(self.retry_after)
+            self.stats['prompt_tokens'] += prompt_tokens
+            self.stats['completion_tokens'] += completion_tokens
+            self.stats['cost'] += (
+                prompt_tokens * self.cost_per_1k_prompt_tokens + completion_tokens * self.cost_per_1k_completion_tokens
+            ) / 1000
+        record_usage(prompt_tokens, completion_tokens)
+
+    def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        result = super().validate(value, prompt_template)
+        self._request(self._validation_prompt(value, prompt_template), result[1] or "VALID")
+        return result
+
+    def clean(self, value: str, prompt_template: str) -> str:
+        result = super().clean(value, prompt_template)
+        self._request(self._cleaning_prompt(value, prompt_template), result)
+        return result
+
+    def validate_many(self, values: List[str], prompt_template: str) -> List[Tuple[bool, Optional[str]]]:
+        results = [MockAdapter.validate(self, value, prompt_template) for value in values]
+        self._simulate_batches(values, prompt_template, 'validate', [reason or "VALID" for _, reason in results])
+        return results
+
+    def clean_many(self, values: List[str], prompt_template: str) -> List[str]:
+        results = [MockAdapter.clean(self, value, prompt_template) for value in values]
+        self._simulate_batches(values, prompt_template, 'clean', results)
+        return results
+
+    def _simulate_batches(self, values: List[str], prompt_template: str, operation: str, completions: List[str]):
+        # One simulated request per chunk, as a batching provider adapter would send
+        for chunk in self._chunk_values(values):
+            chunk_values = [values[index] for index in chunk]
+            self._request(
+                self._batch_prompt(chunk_values, prompt_template, operation),
+                "".join(completions[index] for index in chunk),
+            )
@@ -1,7 +1,14 @@
+from django.conf import settings
 from django_ai_validator.llm.factory import AIProviderFactory
 from django_ai_validator.llm.adapters import LLMAdapter
-from .mock_adapter import MockAdapter
+from .mock_adapter import MockAdapter, SimulatedLatencyAdapter
 
 class MockFactory(AIProviderFactory):
     def create_adapter(self, **kwargs) -> LLMAdapter:
         return MockAdapter(**kwargs)
+
+class SimulatedLatencyFactory(AIProviderFactory):
+    """Creates SimulatedLatencyAdapters configured by the AI_CLEANER_SIMULATION setting."""
+    def create_adapter(self, **kwargs) -> LLMAdapter:
+        options = {**getattr(settings, 'AI_CLEANER_SIMULATION', {}), **kwargs}
+        return SimulatedLatencyAdapter(**options)
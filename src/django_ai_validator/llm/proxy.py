@@ -1,14 +1,159 @@
-from typing import Tuple, Optional
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple, Optional
+from django.conf import settings
 from .adapters import LLMAdapter
-from ..cache import LLMCacheManager
+from .resilience import _status_code, is_retryable
+from .. import instrumentation
+from ..budget import check_budget, without_budget
+from ..cache import LLMCacheManager, build_cache_key, get_cache_timeout
+from ..concurrency import get_max_workers
+
+logger = logging.getLogger(__name__)
+
+class CachedProviderError(Exception):
+    """
+    Raised without calling the provider for an input whose last call failed
+    with an error cached by ``AI_CLEANER_ERROR_CACHE_TIMEOUTS``.
+    """
+    def __init__(self, error_type: str, message: str):
+        self.error_type = error_type
+        super().__init__(f"{error_type}: {message}")
+
+def get_error_cache_timeout(exc: Exception) -> Optional[int]:
+    """
+    How long to remember that an input failed with ``exc``: the first entry of
+    ``AI_CLEANER_ERROR_CACHE_TIMEOUTS`` matching its class (dotted path or
+    name, including base classes) or HTTP status code. Transient errors
+    (timeouts, rate limits, 5xx, open circuits) are never cached.
+    """
+    timeouts = getattr(settings, 'AI_CLEANER_ERROR_CACHE_TIMEOUTS', {})
+    if not timeouts or isinstance(exc, CachedProviderError) or is_retryable(exc):
+        return None
+    for cls in type(exc).__mro__:
+        for name in (f"{cls.__module__}.{cls.__qualname__}", cls.__name__):
+            if name in timeouts:
+                return timeouts[name]
+    return timeouts.get(_status_code(exc))
+
+_refresh_executor = None
+_refresh_executor_lock = threading.Lock()
+
+def get_refresh_executor() -> ThreadPoolExecutor:
+    """
+    The thread pool running stale-while-revalidate refreshes. It is shared
+    by every proxy, so resetting the adapter registry leaks no threads.
+    """
+    global _refresh_executor
+    if _refresh_executor is None:
+        with _refresh_executor_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(max_workers=get_max_workers(), thread_name_prefix='ai-validator-refresh')
+    return _refresh_executor
+
+def shutdown_refresh_executor(wait: bool = True):
+    """Stop the refresh pool, after its queued refreshes with ``wait``; the next refresh starts a new one."""
+    global _refresh_executor
+    with _refresh_executor_lock:
+        executor, _refresh_executor = _refresh_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+def _forget_refresh_executor():
+    # The parent's worker threads do not exist in a forked child
+    global _refresh_executor
+    _refresh_executor = None
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_refresh_executor)
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the
+    function, every other caller waits on its future and shares the result.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+class AsyncSingleFlight:
+    """
+    Async counterpart of ``SingleFlight``: the first coroutine awaits the
+    call, every other coroutine on the same event loop awaits its future.
+    """
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, func):
+        loop = asyncio.get_running_loop()
+        # Futures belong to one event loop, so calls are only shared within it
+        call_key = (loop, key)
+        future = self._calls.get(call_key)
+        if future is not None:
+            # A waiter being cancelled must not cancel the shared call
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._calls[call_key] = future
+        try:
+            result = await func()
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                # Marked as retrieved, so a call nobody waited on logs no warning
+                future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(call_key, None)
 
 class CachingLLMProxy(LLMAdapter):
     """
     Proxy Pattern: Wraps an LLMAdapter to add caching behavior.
+
+    Input-specific provider errors can be cached for a short time, and with
+    stale-while-revalidate expired results are served immediately while a
+    background call refreshes them.
     """
-    def __init__(self, adapter: LLMAdapter):
+    def __init__(self, adapter: LLMAdapter, provider: str = None):
         self.adapter = adapter
+        self.provider = provider or type(adapter).__name__
         self.cache_manager = LLMCacheManager()
+        self._single_flight = SingleFlight()
+        self._async_single_flight = AsyncSingleFlight()
+        self._background_tasks = set()
 
     def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
         # We cache the raw validation result. 
@@ -16,23 +161,248 @@ class CachingLLMProxy(LLMAdapter):
         # but Django's default LocMemCache handles python objects.
         
         # Construct a unique key based on inputs
-        cache_key_content = f"VALIDATE:{prompt_template}:{value}"
-        cached_result = self.cache_manager.get(cache_key_content, self.adapter.model)
-        
+        cache_key_content = build_cache_key('validate', prompt_template, value)
+        with self._track('validate', prompt_template):
+            return self._cached_call(
+                cache_key_content, lambda: self.adapter.validate(value, prompt_template), get_cache_timeout('validate')
+            )
+
+    def clean(self, value: str, prompt_template: str) -> str:
+        cache_key_content = build_cache_key('clean', prompt_template, value)
+        with self._track('clean', prompt_template):
+            return self._cached_call(
+                cache_key_content, lambda: self.adapter.clean(value, prompt_template), get_cache_timeout('clean')
+            )
+
+    def get_cached(self, operation: str, value: str, prompt_template: str):
+        """The cached result for ``value``, or None. Never calls the provider."""
+        return self.cache_manager.get(build_cache_key(operation, prompt_template, value), self.adapter.model)
+
+    async def aget_cached(self, operation: str, value: str, prompt_template: str):
+        return await self.cache_manager.aget(build_cache_key(operation, prompt_template, value), self.adapter.model)
+
+    def _track(self, operation: str, prompt_template: str):
+        return instrumentation.track(self.provider, self.adapter.model, operation, prompt_template)
+
+    def _cached_call(self, cache_key_content: str, call, timeout: int = None):
+        cached_result, stale = self.cache_manager.get_entry(cache_key_content, self.adapter.model)
+
         if cached_result is not None:
+            if stale:
+                self._revalidate(cache_key_content, call, timeout)
             return cached_result
 
-        result = self.adapter.validate(value, prompt_template)
-        self.cache_manager.set(cache_key_content, self.adapter.model, result)
+        self._raise_cached_error(cache_key_content)
+        # Concurrent misses for the same key in this process share one provider call
+        return self._single_flight.do(cache_key_content, lambda: self._fetch(cache_key_content, call, timeout))
+
+    def _fetch(self, cache_key_content: str, call, timeout: int = None):
+        if not getattr(settings, 'AI_CLEANER_CROSS_PROCESS_LOCK', False):
+            return self._call_and_store(cache_key_content, call, timeout)
+
+        lock_timeout = getattr(settings, 'AI_CLEANER_LOCK_TIMEOUT', 30)
+        poll_interval = getattr(settings, 'AI_CLEANER_LOCK_POLL_INTERVAL', 0.05)
+        deadline = time.monotonic() + lock_timeout
+
+        # Another worker process may already be computing this key: wait for
+        # its result instead of paying for the same call again.
+        while not self.cache_manager.acquire_lock(cache_key_content, self.adapter.model, lock_timeout):
+            cached_result = self.cache_manager.get(cache_key_content, self.adapter.model)
+            if cached_result is not None:
+                return cached_result
+            check_budget()
+            if time.monotonic() >= deadline:
+                # The lock holder died or is too slow; compute it ourselves
+                return self._call_and_store(cache_key_content, call, timeout)
+            time.sleep(poll_interval)
+
+        try:
+            cached_result = self.cache_manager.get(cache_key_content, self.adapter.model)
+            if cached_result is not None:
+                return cached_result
+            return self._call_and_store(cache_key_content, call, timeout)
+        finally:
+            self.cache_manager.release_lock(cache_key_content, self.adapter.model)
+
+    def _call_and_store(self, cache_key_content: str, call, timeout: int = None):
+        try:
+            result = instrumentation.observe_request(call)
+        except Exception as exc:
+            error_timeout = get_error_cache_timeout(exc)
+            if error_timeout:
+                self.cache_manager.set_error(cache_key_content, self.adapter.model, (type(exc).__name__, str(exc)), error_timeout)
+            raise
+        self.cache_manager.set(cache_key_content, self.adapter.model, result, timeout)
         return result
 
-    def clean(self, value: str, prompt_template: str) -> str:
-        cache_key_content = f"CLEAN:{prompt_template}:{value}"
-        cached_result = self.cache_manager.get(cache_key_content, self.adapter.model)
-        
+    def _raise_cached_error(self, cache_key_content: str):
+        if getattr(settings, 'AI_CLEANER_ERROR_CACHE_TIMEOUTS', None):
+            error = self.cache_manager.get_error(cache_key_content, self.adapter.model)
+            if error is not None:
+                raise CachedProviderError(*error)
+
+    def _revalidate(self, cache_key_content: str, call, timeout: int = None):
+        """Refresh a stale entry in the background; one refresh per key across processes."""
+        self._refresh_in_background([cache_key_content], lambda keys: [instrumentation.observe_request(call)], timeout)
+
+    def _refresh_in_background(self, cache_keys: list, fetch, timeout: int = None):
+        """
+        Refresh stale entries with one background ``fetch(keys)`` call,
+        returning their results in order. Keys whose refresh lock is held
+        elsewhere are skipped.
+        """
+        lock_timeout = getattr(settings, 'AI_CLEANER_LOCK_TIMEOUT', 30)
+        locked = [key for key in cache_keys if self.cache_manager.acquire_lock(key, self.adapter.model, lock_timeout)]
+        if not locked:
+            return
+
+        def refresh():
+            try:
+                # Outlives the request, so its latency budget does not apply
+                with without_budget():
+                    results = fetch(locked)
+                self.cache_manager.set_many(dict(zip(locked, results)), self.adapter.model, timeout)
+            except Exception as exc:
+                logger.warning("Refreshing a stale AI result failed; the stale result is kept: %s", exc)
+            finally:
+                for key in locked:
+                    self.cache_manager.release_lock(key, self.adapter.model)
+
+        get_refresh_executor().submit(contextvars.copy_context().run, refresh)
+
+    def validate_many(self, values: List[str], prompt_template: str) -> List[Tuple[bool, Optional[str]]]:
+        with self._track('validate', prompt_template):
+            return self._run_many(values, prompt_template, 'validate', self.adapter.validate_many)
+
+    def clean_many(self, values: List[str], prompt_template: str) -> List[str]:
+        with self._track('clean', prompt_template):
+            return self._run_many(values, prompt_template, 'clean', self.adapter.clean_many)
+
+    def _run_many(self, values: List[str], prompt_template: str, operation: str, call) -> list:
+        """
+        Only distinct cache misses are sent to the provider; values that
+        normalize to the same key share one answer. Stale hits are served and
+        refreshed in one background call. Inputs with a cached error are not
+        sent: the rest of the batch is fetched and cached, then
+        ``CachedProviderError`` is raised.
+        """
+        cache_keys = {value: build_cache_key(operation, prompt_template, value) for value in values}
+        entries = self.cache_manager.get_many_entries(list(set(cache_keys.values())), self.adapter.model)
+        results = {key: value for key, (value, _) in entries.items()}
+        timeout = get_cache_timeout(operation)
+
+        misses, stale = {}, {}
+        for value, key in cache_keys.items():
+            if key not in entries:
+                misses.setdefault(key, value)
+            elif entries[key][1]:
+                stale.setdefault(key, value)
+        if stale:
+            self._refresh_in_background(list(stale), lambda keys: instrumentation.observe_request(
+                lambda: call([stale[key] for key in keys], prompt_template), len(keys)
+            ), timeout)
+
+        errors = {}
+        if misses and getattr(settings, 'AI_CLEANER_ERROR_CACHE_TIMEOUTS', None):
+            errors = self.cache_manager.get_errors(list(misses), self.adapter.model)
+            for key in errors:
+                del misses[key]
+        if len(misses) == 1:
+            # A lone input's error is its own, so it is cached like a single call's
+            key, value = next(iter(misses.items()))
+            results[key] = self._call_and_store(key, lambda: call([value], prompt_template)[0], timeout)
+        elif misses:
+            miss_values = list(misses.values())
+            answers = instrumentation.observe_request(lambda: call(miss_values, prompt_template), len(miss_values))
+            fresh = dict(zip(misses, answers))
+            self.cache_manager.set_many(fresh, self.adapter.model, timeout)
+            results.update(fresh)
+        if errors:
+            raise CachedProviderError(*next(iter(errors.values())))
+        return [results[cache_keys[value]] for value in values]
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        cache_key_content = build_cache_key('validate', prompt_template, value)
+        with self._track('validate', prompt_template):
+            return await self._acached_call(
+                cache_key_content, lambda: self.adapter.avalidate(value, prompt_template), get_cache_timeout('validate')
+            )
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        cache_key_content = build_cache_key('clean', prompt_template, value)
+        with self._track('clean', prompt_template):
+            return await self._acached_call(
+                cache_key_content, lambda: self.adapter.aclean(value, prompt_template), get_cache_timeout('clean')
+            )
+
+    async def _acached_call(self, cache_key_content: str, call, timeout: int = None):
+        cached_result, stale = await self.cache_manager.aget_entry(cache_key_content, self.adapter.model)
+
         if cached_result is not None:
+            if stale:
+                # Keep a reference so the refresh task is not garbage collected mid-flight
+                task = asyncio.ensure_future(self._arefresh(cache_key_content, call, timeout))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
             return cached_result
 
-        result = self.adapter.clean(value, prompt_template)
-        self.cache_manager.set(cache_key_content, self.adapter.model, result)
+        if getattr(settings, 'AI_CLEANER_ERROR_CACHE_TIMEOUTS', None):
+            error = await self.cache_manager.aget_error(cache_key_content, self.adapter.model)
+            if error is not None:
+                raise CachedProviderError(*error)
+        # Concurrent misses for the same key on this event loop share one provider call
+        return await self._async_single_flight.do(
+            cache_key_content, lambda: self._afetch(cache_key_content, call, timeout)
+        )
+
+    async def _afetch(self, cache_key_content: str, call, timeout: int = None):
+        if not getattr(settings, 'AI_CLEANER_CROSS_PROCESS_LOCK', False):
+            return await self._acall_and_store(cache_key_content, call, timeout)
+
+        lock_timeout = getattr(settings, 'AI_CLEANER_LOCK_TIMEOUT', 30)
+        poll_interval = getattr(settings, 'AI_CLEANER_LOCK_POLL_INTERVAL', 0.05)
+        deadline = time.monotonic() + lock_timeout
+
+        # Same protocol as _fetch, polling without blocking the event loop
+        while not await self.cache_manager.aacquire_lock(cache_key_content, self.adapter.model, lock_timeout):
+            cached_result = await self.cache_manager.aget(cache_key_content, self.adapter.model)
+            if cached_result is not None:
+                return cached_result
+            check_budget()
+            if time.monotonic() >= deadline:
+                return await self._acall_and_store(cache_key_content, call, timeout)
+            await asyncio.sleep(poll_interval)
+
+        try:
+            cached_result = await self.cache_manager.aget(cache_key_content, self.adapter.model)
+            if cached_result is not None:
+                return cached_result
+            return await self._acall_and_store(cache_key_content, call, timeout)
+        finally:
+            await self.cache_manager.arelease_lock(cache_key_content, self.adapter.model)
+
+    async def _acall_and_store(self, cache_key_content: str, call, timeout: int = None):
+        try:
+            result = await instrumentation.aobserve_request(call)
+        except Exception as exc:
+            error_timeout = get_error_cache_timeout(exc)
+            if error_timeout:
+                await self.cache_manager.aset_error(
+                    cache_key_content, self.adapter.model, (type(exc).__name__, str(exc)), error_timeout
+                )
+            raise
+        await self.cache_manager.aset(cache_key_content, self.adapter.model, result, timeout)
         return result
+
+    async def _arefresh(self, cache_key_content: str, call, timeout: int = None):
+        lock_timeout = getattr(settings, 'AI_CLEANER_LOCK_TIMEOUT', 30)
+        if not await self.cache_manager.aacquire_lock(cache_key_content, self.adapter.model, lock_timeout):
+            return
+        try:
+            with without_budget():
+                result = await instrumentation.aobserve_request(call)
+            await self.cache_manager.aset(cache_key_content, self.adapter.model, result, timeout)
+        except Exception as exc:
+            logger.warning("Refreshing a stale AI result failed; the stale result is kept: %s", exc)
+        finally:
+            await self.cache_manager.arelease_lock(cache_key_content, self.adapter.model)
@@ -0,0 +1,235 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Tuple, Optional
+from django.conf import settings
+from .adapters import LLMAdapter, estimate_tokens
+
+class ClientRateLimitError(Exception):
+    """Raised when a call would have to wait longer than ``AI_CLEANER_RATE_LIMIT_MAX_WAIT``."""
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"Client-side rate limit reached, retry after {retry_after:.2f}s.")
+
+class TokenBucket:
+    """In-process token bucket holding ``capacity`` tokens, refilled evenly over ``period`` seconds."""
+    def __init__(self, capacity: int, period: float = 60.0, clock=time.monotonic):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, amount: int = 1) -> float:
+        """Take ``amount`` tokens and return 0, or return the seconds to wait before they are available."""
+        # A request larger than the bucket could never pass; let it through once the bucket is full
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+
+class CacheTokenBucket:
+    """
+    Limit shared by every process using the same Django cache (e.g. Redis):
+    at most ``capacity`` tokens per fixed window of ``period`` seconds,
+    counted with atomic ``cache.incr``.
+    """
+    def __init__(self, name: str, capacity: int, period: float = 60.0, clock=time.time):
+        self.name = name
+        self.capacity = capacity
+        self.period = period
+        self.clock = clock
+
+    @property
+    def backend(self):
+        from ..cache import LLMCacheManager
+        return LLMCacheManager().backend
+
+    def try_acquire(self, amount: int = 1) -> float:
+        amount = min(amount, self.capacity)
+        now = self.clock()
+        window = int(now // self.period)
+        key = f"ai_validator:ratelimit:{self.name}:{window}"
+        backend = self.backend
+        backend.add(key, 0, int(self.period * 2))
+        try:
+            count = backend.incr(key, amount)
+        except ValueError:
+            # The key expired between add() and incr()
+            backend.add(key, amount, int(self.period * 2))
+            count = amount
+        if count <= self.capacity:
+            return 0.0
+        backend.decr(key, amount)
+        return (window + 1) * self.period - now
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets plus a max-in-flight
+    semaphore for one provider and model. Callers wait for capacity, up to
+    ``max_wait`` seconds, instead of sending requests the provider would
+    reject with a 429.
+    """
+    def __init__(
+        self,
+        request_bucket=None,
+        token_bucket=None,
+        max_in_flight: int = None,
+        max_wait: float = 30.0,
+        sleep=time.sleep,
+        clock=time.monotonic,
+    ):
+        self.request_bucket = request_bucket
+        self.token_bucket = token_bucket
+        self.semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self.max_wait = max_wait
+        self.sleep = sleep
+        self.clock = clock
+
+    def _next_wait(self, requests: int, tokens: int, state: dict) -> float:
+        # ``state`` remembers which buckets already granted this call
+        for name, bucket, amount in (('requests', self.request_bucket, requests), ('tokens', self.token_bucket, tokens)):
+            if bucket is None or state.get(name):
+                continue
+            wait = bucket.try_acquire(amount)
+            if wait:
+                return wait
+            state[name] = True
+        return 0.0
+
+    def _check_deadline(self, deadline: float, wait: float):
+        if self.clock() + wait > deadline:
+            raise ClientRateLimitError(wait)
+
+    def acquire(self, requests: int = 1, tokens: int = 0):
+        deadline = self.clock() + self.max_wait
+        state = {}
+        while True:
+            wait = self._next_wait(requests, tokens, state)
+            if not wait:
+                break
+            self._check_deadline(deadline, wait)
+            self.sleep(wait)
+        if self.semaphore is not None and not self.semaphore.acquire(timeout=max(deadline - self.clock(), 0)):
+            raise ClientRateLimitError(0.0)
+
+    async def aacquire(self, requests: int = 1, tokens: int = 0):
+        deadline = self.clock() + self.max_wait
+        state = {}
+        while True:
+            wait = self._next_wait(requests, tokens, state)
+            if not wait:
+                break
+            self._check_deadline(deadline, wait)
+            await asyncio.sleep(wait)
+        if self.semaphore is not None:
+            # Never block the event loop on the semaphore
+            while not self.semaphore.acquire(blocking=False):
+                self._check_deadline(deadline, 0.01)
+                await asyncio.sleep(0.01)
+
+    def release(self):
+        if self.semaphore is not None:
+            self.semaphore.release()
+
+    @contextmanager
+    def limit(self, requests: int = 1, tokens: int = 0):
+        self.acquire(requests, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def alimit(self, requests: int = 1, tokens: int = 0):
+        await self.aacquire(requests, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limit_config(provider: str, model: str) -> Optional[dict]:
+    """The ``AI_CLEANER_RATE_LIMITS`` entry for ``"provider:model"``, falling back to ``"provider"``."""
+    limits = getattr(settings, 'AI_CLEANER_RATE_LIMITS', {})
+    return limits.get(f"{provider}:{model}", limits.get(provider))
+
+def get_rate_limiter(provider: str, model: str) -> Optional[RateLimiter]:
+    """The process-wide limiter for a provider and model, or None when no limits are configured."""
+    config = get_rate_limit_config(provider, model)
+    if not config:
+        return None
+    backend = getattr(settings, 'AI_CLEANER_RATE_LIMIT_BACKEND', 'local')
+    key = (provider, model, backend, tuple(sorted(config.items())))
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(
+                    request_bucket=_make_bucket(backend, f"{provider}:{model}:requests", config.get('REQUESTS_PER_MINUTE')),
+                    token_bucket=_make_bucket(backend, f"{provider}:{model}:tokens", config.get('TOKENS_PER_MINUTE')),
+                    max_in_flight=config.get('MAX_IN_FLIGHT'),
+                    max_wait=getattr(settings, 'AI_CLEANER_RATE_LIMIT_MAX_WAIT', 30.0),
+                )
+                _limiters[key] = limiter
+    return limiter
+
+def _make_bucket(backend: str, name: str, per_minute: int = None):
+    if not per_minute:
+        return None
+    if backend == 'cache':
+        return CacheTokenBucket(name, per_minute)
+    return TokenBucket(per_minute)
+
+class ThrottledLLMProxy(LLMAdapter):
+    """
+    Proxy Pattern: Wraps an LLMAdapter so every provider request first takes
+    capacity from a RateLimiter.
+    """
+    def __init__(self, adapter: LLMAdapter, limiter: RateLimiter):
+        self.adapter = adapter
+        self.model = adapter.model
+        self.limiter = limiter
+
+    def _batch_cost(self, values: List[str], prompt_template: str) -> Tuple[int, int]:
+        if self.adapter._supports_batching():
+            requests = len(self.adapter._chunk_values(values))
+        else:
+            requests = len(values)
+        return requests, estimate_tokens(*values) + requests * estimate_tokens(prompt_template)
+
+    def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        with self.limiter.limit(tokens=estimate_tokens(value, prompt_template)):
+            return self.adapter.validate(value, prompt_template)
+
+    def clean(self, value: str, prompt_template: str) -> str:
+        with self.limiter.limit(tokens=estimate_tokens(value, prompt_template)):
+            return self.adapter.clean(value, prompt_template)
+
+    def validate_many(self, values: List[str], prompt_template: str) -> List[Tuple[bool, Optional[str]]]:
+        requests, tokens = self._batch_cost(values, prompt_template)
+        with self.limiter.limit(requests, tokens):
+            return self.adapter.validate_many(values, prompt_template)
+
+    def clean_many(self, values: List[str], prompt_template: str) -> List[str]:
+        requests, tokens = self._batch_cost(values, prompt_template)
+        with self.limiter.limit(requests, tokens):
+            return self.adapter.clean_many(values, prompt_template)
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        async with self.limiter.alimit(tokens=estimate_tokens(value, prompt_template)):
+            return await self.adapter.avalidate(value, prompt_template)
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        async with self.limiter.alimit(tokens=estimate_tokens(value, prompt_template)):
+            return await self.adapter.aclean(value, prompt_template)
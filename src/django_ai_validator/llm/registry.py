@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+from django.conf import settings
+from django.core.signals import setting_changed
+from .adapters import LLMAdapter
+from .factory import LLMFactory
+from .proxy import CachingLLMProxy
+from .ratelimit import ThrottledLLMProxy, get_rate_limiter
+from .resilience import ResilientLLMProxy
+
+def build_adapter(provider: str, factory=None, **kwargs) -> LLMAdapter:
+    """
+    Create a provider's adapter wrapped in its rate limiter and resilience
+    proxies, but without the caching proxy. Composite adapters (such as the
+    router) wrap adapters built here and get neither.
+    """
+    factory = factory or LLMFactory.get_factory(provider)
+    pool_size = getattr(settings, 'AI_CLEANER_HTTP_POOL_SIZE', None)
+    if pool_size and 'pool_size' not in kwargs:
+        kwargs['pool_size'] = pool_size
+
+    adapter = factory.create_adapter(**kwargs)
+    if getattr(adapter, 'composite', False):
+        return adapter
+    limiter = get_rate_limiter(provider, adapter.model)
+    if limiter is not None:
+        # Innermost, so every retry attempt is throttled too
+        adapter = ThrottledLLMProxy(adapter, limiter)
+    if getattr(settings, 'AI_CLEANER_RESILIENCE', True):
+        # Cache hits are served even while the provider's circuit is open
+        adapter = ResilientLLMProxy.from_settings(adapter)
+    return adapter
+
+class AdapterRegistry:
+    """
+    Singleton registry of long-lived, cache-wrapped adapters.
+
+    Adapters own SDK clients (and their keep-alive HTTP connection pools), so
+    they are built once per (provider, model, credentials, host) and shared by
+    every thread in the process. Adapters configured from settings are
+    rebuilt when those settings change, e.g. under ``override_settings``.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(AdapterRegistry, cls).__new__(cls)
+                    instance._clients = {}
+                    instance._lock = threading.Lock()
+                    cls._instance = instance
+        return cls._instance
+
+    def _make_key(self, provider: str, factory, kwargs: dict) -> tuple:
+        parts = []
+        for name, value in sorted(kwargs.items()):
+            if name == 'api_key' and value:
+                # Never keep raw credentials around in the key
+                value = hashlib.sha256(str(value).encode('utf-8')).hexdigest()
+            parts.append((name, value))
+        return (provider, type(factory), tuple(parts))
+
+    def get_client(self, provider: str = None, **kwargs) -> CachingLLMProxy:
+        if not provider:
+            provider = getattr(settings, 'AI_CLEANER_DEFAULT_PROVIDER', 'openai')
+
+        factory = LLMFactory.get_factory(provider)
+        key = self._make_key(provider, factory, kwargs)
+
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = CachingLLMProxy(build_adapter(provider, factory, **kwargs), provider=provider)
+                    self._clients[key] = client
+        return client
+
+    def reset(self):
+        """
+        Drop every cached adapter. Must be called in forked children
+        (gunicorn/celery prefork) so connection pools are not shared with the parent.
+        """
+        self._clients = {}
+        self._lock = threading.Lock()
+
+def reset_adapter_registry():
+    AdapterRegistry().reset()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_adapter_registry)
+
+def _is_adapter_setting(name: str) -> bool:
+    # Credentials, hosts and AI_CLEANER_* options are read when an adapter is built
+    return name.startswith('AI_CLEANER_') or name.endswith('_API_KEY') or name == 'OLLAMA_HOST'
+
+def _reset_on_setting_changed(setting, **kwargs):
+    if _is_adapter_setting(setting):
+        reset_adapter_registry()
+
+setting_changed.connect(_reset_on_setting_changed, dispatch_uid='django_ai_validator_adapter_registry')
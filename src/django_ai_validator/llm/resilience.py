@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import List, Tuple, Optional
+from django.conf import settings
+from .adapters import LLMAdapter, _request_timeout
+from .ratelimit import ClientRateLimitError
+from ..budget import budget_exhausted, cap_timeout, check_budget, remaining_time
+from ..instrumentation import record_retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUTS = {'validate': 10, 'clean': 30, 'batch': 60}
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+RETRYABLE_ERROR_NAMES = ('Timeout', 'Connection', 'RateLimit', 'Unavailable', 'Overloaded', 'ResourceExhausted', 'DeadlineExceeded')
+
+class ProviderUnavailableError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+def get_timeouts() -> dict:
+    return {**DEFAULT_TIMEOUTS, **getattr(settings, 'AI_CLEANER_TIMEOUTS', {})}
+
+def _status_code(exc: Exception):
+    for candidate in (exc, getattr(exc, 'response', None)):
+        for name in ('status_code', 'code'):
+            value = getattr(candidate, name, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+def is_retryable(exc: Exception) -> bool:
+    """Timeouts, connection errors, rate limits and 5xx responses are worth retrying."""
+    if isinstance(exc, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    if getattr(exc, 'retry_after', None) is not None:
+        return True
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    return any(name in type(exc).__name__ for name in RETRYABLE_ERROR_NAMES)
+
+def retry_after(exc: Exception) -> Optional[float]:
+    """The delay requested by the provider, from the exception or its ``Retry-After`` header."""
+    value = getattr(exc, 'retry_after', None)
+    if value is None:
+        headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+        value = headers.get('retry-after')
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        # HTTP-date values are rare for LLM APIs; fall back to our own backoff
+        return None
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of the last ``window`` calls. Once at least
+    ``min_requests`` have been seen and the share of failed (or slower than
+    ``slow_call_duration``) calls reaches ``error_rate``, the circuit opens and
+    calls are refused for ``reset_timeout`` seconds. A single probe call is
+    then let through: success closes the circuit, failure opens it again.
+
+    ``allow()`` returns a permit. A probe that ends without a recorded
+    outcome (cancelled, throttled, cut short) must be handed back with
+    ``release(permit)`` so the next call can probe instead.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_requests: int = 10,
+        error_rate: float = 0.5,
+        slow_call_duration: float = None,
+        reset_timeout: float = 30,
+        clock=time.monotonic,
+    ):
+        self.window = window
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.slow_call_duration = slow_call_duration
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = None
+        self._probe = None
+        self._lock = threading.Lock()
+
+    def allow(self, held=None):
+        """
+        A truthy permit when a call may go ahead, else False. Passing the
+        permit already ``held`` by the caller keeps its probe.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if held is not None and held is self._probe:
+                return held
+            if self.state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe = None
+            if self.state == self.HALF_OPEN and self._probe is None:
+                self._probe = object()
+                return self._probe
+            return False
+
+    def release(self, permit):
+        """Hand back a probe that ended without ``record()``; a no-op for any other permit."""
+        with self._lock:
+            if permit is not None and permit is self._probe:
+                self._probe = None
+
+    def record(self, success: bool, duration: float = 0.0):
+        if success and self.slow_call_duration is not None and duration > self.slow_call_duration:
+            success = False
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probe = None
+                if success:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                self.state == self.CLOSED
+                and len(self._outcomes) >= self.min_requests
+                and failures / len(self._outcomes) >= self.error_rate
+            ):
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self._opened_at = self.clock()
+        logger.warning("AI provider circuit opened; refusing calls for %ss.", self.reset_timeout)
+
+class ResilientLLMProxy(LLMAdapter):
+    """
+    Proxy Pattern: Wraps an LLMAdapter with per-operation timeouts, retries
+    with jittered exponential backoff (honouring ``Retry-After``) and a
+    circuit breaker. Errors that survive the retries are re-raised unchanged;
+    calls refused by an open circuit raise ``ProviderUnavailableError``.
+    """
+    def __init__(
+        self,
+        adapter: LLMAdapter,
+        timeouts: dict = None,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        breaker: CircuitBreaker = None,
+        sleep=time.sleep,
+    ):
+        self.adapter = adapter
+        self.model = adapter.model
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+
+    @classmethod
+    def from_settings(cls, adapter: LLMAdapter) -> 'ResilientLLMProxy':
+        retry = getattr(settings, 'AI_CLEANER_RETRY', {})
+        breaker = getattr(settings, 'AI_CLEANER_CIRCUIT_BREAKER', {})
+        return cls(
+            adapter,
+            timeouts=get_timeouts(),
+            max_attempts=retry.get('MAX_ATTEMPTS', 3),
+            backoff_base=retry.get('BACKOFF_BASE', 0.5),
+            backoff_max=retry.get('BACKOFF_MAX', 10.0),
+            breaker=CircuitBreaker(
+                window=breaker.get('WINDOW', 20),
+                min_requests=breaker.get('MIN_REQUESTS', 10),
+                error_rate=breaker.get('ERROR_RATE', 0.5),
+                slow_call_duration=breaker.get('SLOW_CALL_DURATION'),
+                reset_timeout=breaker.get('RESET_TIMEOUT', 30),
+            ),
+        )
+
+    def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        return self._call('validate', lambda: self.adapter.validate(value, prompt_template))
+
+    def clean(self, value: str, prompt_template: str) -> str:
+        return self._call('clean', lambda: self.adapter.clean(value, prompt_template))
+
+    def validate_many(self, values: List[str], prompt_template: str) -> List[Tuple[bool, Optional[str]]]:
+        return self._call('batch', lambda: self.adapter.validate_many(values, prompt_template))
+
+    def clean_many(self, values: List[str], prompt_template: str) -> List[str]:
+        return self._call('batch', lambda: self.adapter.clean_many(values, prompt_template))
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        return await self._acall('validate', lambda: self.adapter.avalidate(value, prompt_template))
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        return await self._acall('clean', lambda: self.adapter.aclean(value, prompt_template))
+
+    def _retry_delay(self, exc: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up."""
+        if attempt >= self.max_attempts or not is_retryable(exc):
+            return None
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        requested = retry_after(exc)
+        if requested is not None:
+            if requested > self.backoff_max:
+                # Waiting that long would stall the caller; fail now instead
+                return None
+            delay = max(delay, requested)
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            # The retry could not finish within the latency budget
+            return None
+        return delay
+
+    def _check_circuit(self, exc: Exception = None, held=None):
+        permit = self.breaker.allow(held)
+        if not permit:
+            raise ProviderUnavailableError(f"AI provider for model {self.model} is unavailable (circuit open).") from exc
+        return permit
+
+    def _record_failure(self, exc: Exception):
+        # Only provider-side failures count: bad inputs, our own throttling
+        # and calls cut short by the latency budget say nothing about its health
+        if is_retryable(exc) and not isinstance(exc, ClientRateLimitError) and not budget_exhausted():
+            self.breaker.record(False)
+
+    def _call(self, operation: str, call):
+        permit = self._check_circuit()
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                check_budget()
+                token = _request_timeout.set(self.timeouts.get(operation))
+                started = time.monotonic()
+                try:
+                    result = call()
+                except Exception as exc:
+                    self._record_failure(exc)
+                    delay = self._retry_delay(exc, attempt)
+                    if delay is None:
+                        raise
+                    record_retry(attempt, exc)
+                    self.sleep(delay)
+                    permit = self._check_circuit(exc, held=permit)
+                    continue
+                finally:
+                    _request_timeout.reset(token)
+                self.breaker.record(True, time.monotonic() - started)
+                return result
+        finally:
+            # Every exit without a recorded outcome hands the probe back
+            self.breaker.release(permit)
+
+    async def _acall(self, operation: str, call):
+        permit = self._check_circuit()
+        timeout = self.timeouts.get(operation)
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                check_budget()
+                token = _request_timeout.set(timeout)
+                started = time.monotonic()
+                try:
+                    # Enforced here as well, for async clients that ignore per-request timeouts
+                    result = await asyncio.wait_for(call(), cap_timeout(timeout))
+                except Exception as exc:
+                    self._record_failure(exc)
+                    delay = self._retry_delay(exc, attempt)
+                    if delay is None:
+                        raise
+                    record_retry(attempt, exc)
+                    await asyncio.sleep(delay)
+                    permit = self._check_circuit(exc, held=permit)
+                    continue
+                finally:
+                    _request_timeout.reset(token)
+                self.breaker.record(True, time.monotonic() - started)
+                return result
+        finally:
+            # Including cancellation (e.g. a losing hedged request)
+            self.breaker.release(permit)
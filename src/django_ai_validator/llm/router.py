@@ -0,0 +1,283 @@
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Tuple, Optional
+from django.conf import settings
+from .adapters import LLMAdapter
+from ..concurrency import get_max_workers
+
+logger = logging.getLogger(__name__)
+
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """
+    The thread pool running hedged calls. It is shared by every router, so
+    resetting the adapter registry leaks no threads.
+    """
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(max_workers=get_max_workers(), thread_name_prefix='ai-validator-hedge')
+    return _hedge_executor
+
+def shutdown_hedge_executor(wait: bool = True):
+    """Stop the hedge pool, after its running calls with ``wait``; the next hedged call starts a new one."""
+    global _hedge_executor
+    with _hedge_executor_lock:
+        executor, _hedge_executor = _hedge_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+def _forget_hedge_executor():
+    # The parent's worker threads do not exist in a forked child
+    global _hedge_executor
+    _hedge_executor = None
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_hedge_executor)
+
+class ProviderStats:
+    """Rolling latency percentiles and error rate over a provider's last ``window`` calls."""
+    def __init__(self, window: int = 100):
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, success: bool):
+        with self._lock:
+            self._outcomes.append(success)
+            if success:
+                self._latencies.append(latency)
+
+    @property
+    def samples(self) -> int:
+        return len(self._outcomes)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(0.5)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+class RoutingAdapter(LLMAdapter):
+    """
+    Composite adapter that spreads calls over several providers.
+
+    Each call goes to the healthy provider with the lowest rolling p50
+    latency (cheapest first on ties) whose cost fits ``max_cost``, and fails
+    over to the next one on error. Providers with fewer than ``min_samples``
+    calls are tried first so every provider gets measured. With ``hedge``
+    enabled, single ``validate``/``clean`` calls fire a second provider once
+    the first has been running longer than its p95 latency (or
+    ``hedge_delay``) and return whichever answers first.
+    """
+    composite = True
+
+    def __init__(
+        self,
+        adapters: Dict[str, LLMAdapter],
+        costs: Dict[str, float] = None,
+        max_cost: float = None,
+        max_error_rate: float = 0.5,
+        min_samples: int = 5,
+        window: int = 100,
+        hedge: bool = False,
+        hedge_delay: float = None,
+    ):
+        self.adapters = adapters
+        self.model = "router:" + ",".join(adapters)
+        self.costs = costs or {}
+        self.max_cost = max_cost
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.stats = {name: ProviderStats(window) for name in adapters}
+
+    @classmethod
+    def from_settings(cls, **kwargs) -> 'RoutingAdapter':
+        # Provider-level options (pool size, models, keys) come from AI_CLEANER_ROUTER['OPTIONS']
+        from .registry import build_adapter
+        config = getattr(settings, 'AI_CLEANER_ROUTER', {})
+        options = config.get('OPTIONS', {})
+        adapters = {name: build_adapter(name, **options.get(name, {})) for name in config.get('PROVIDERS', [])}
+        if not adapters:
+            raise ValueError("AI_CLEANER_ROUTER['PROVIDERS'] must list at least one provider.")
+        return cls(
+            adapters,
+            costs=config.get('COSTS'),
+            max_cost=config.get('MAX_COST'),
+            max_error_rate=config.get('MAX_ERROR_RATE', 0.5),
+            min_samples=config.get('MIN_SAMPLES', 5),
+            window=config.get('WINDOW', 100),
+            hedge=config.get('HEDGE', False),
+            hedge_delay=config.get('HEDGE_DELAY'),
+        )
+
+    def _is_healthy(self, name: str) -> bool:
+        breaker = getattr(self.adapters[name], 'breaker', None)
+        if breaker is not None and breaker.state == breaker.OPEN:
+            return False
+        stats = self.stats[name]
+        return stats.samples < self.min_samples or stats.error_rate < self.max_error_rate
+
+    def ranked_providers(self) -> List[str]:
+        """Providers in the order they will be tried for the next call."""
+        order = list(self.adapters)
+        affordable = [
+            name for name in order
+            if self.max_cost is None or self.costs.get(name, 0.0) <= self.max_cost
+        ] or order
+
+        def score(name):
+            stats = self.stats[name]
+            latency = stats.p50 if stats.samples >= self.min_samples else 0.0
+            return (latency or 0.0, self.costs.get(name, 0.0), order.index(name))
+
+        healthy = sorted((name for name in affordable if self._is_healthy(name)), key=score)
+        # When everything looks unhealthy, still try in order of preference
+        return healthy or sorted(affordable, key=score)
+
+    def _timed(self, name: str, call):
+        started = time.monotonic()
+        try:
+            result = call(self.adapters[name])
+        except Exception:
+            self.stats[name].record(time.monotonic() - started, False)
+            raise
+        self.stats[name].record(time.monotonic() - started, True)
+        return result
+
+    def _route(self, call):
+        last_error = None
+        for name in self.ranked_providers():
+            try:
+                return self._timed(name, call)
+            except Exception as exc:
+                logger.warning("AI provider %s failed, trying the next one: %s", name, exc)
+                last_error = exc
+        raise last_error
+
+    def _hedge_delay_for(self, name: str) -> Optional[float]:
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        stats = self.stats[name]
+        return stats.p95 if stats.samples >= self.min_samples else None
+
+    def _hedged(self, call):
+        ranked = self.ranked_providers()
+        delay = self._hedge_delay_for(ranked[0]) if self.hedge and len(ranked) > 1 else None
+        if delay is None:
+            return self._route(call)
+
+        executor = get_hedge_executor()
+
+        def submit(name):
+            # Hedged calls run on the pool; carry over context such as instrumentation labels
+            return executor.submit(contextvars.copy_context().run, self._timed, name, call)
+
+        pending = {submit(ranked[0]): ranked[0]}
+        submitted = 1
+        done, _ = wait(pending, timeout=delay)
+        if not done:
+            pending[submit(ranked[1])] = ranked[1]
+            submitted = 2
+
+        last_error = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    # The slower request keeps running in the background; its timing is still recorded
+                    return future.result()
+                except Exception as exc:
+                    logger.warning("AI provider %s failed during a hedged call: %s", name, exc)
+                    last_error = exc
+        # Every hedged request failed: fall back to the providers not tried yet
+        for name in ranked[submitted:]:
+            try:
+                return self._timed(name, call)
+            except Exception as exc:
+                last_error = exc
+        raise last_error
+
+    async def _atimed(self, name: str, call):
+        started = time.monotonic()
+        try:
+            result = await call(self.adapters[name])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats[name].record(time.monotonic() - started, False)
+            raise
+        self.stats[name].record(time.monotonic() - started, True)
+        return result
+
+    async def _ahedged(self, call):
+        ranked = self.ranked_providers()
+        delay = self._hedge_delay_for(ranked[0]) if self.hedge and len(ranked) > 1 else None
+        queue = list(ranked)
+        pending = {asyncio.ensure_future(self._atimed(queue[0], call))}
+        queue.pop(0)
+        last_error = None
+        try:
+            while pending:
+                timeout = delay if delay is not None and queue and len(pending) == 1 else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # The first provider is slower than its p95: hedge with the next one
+                    pending.add(asyncio.ensure_future(self._atimed(queue.pop(0), call)))
+                    continue
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                if not pending and queue:
+                    pending.add(asyncio.ensure_future(self._atimed(queue.pop(0), call)))
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def validate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        return self._hedged(lambda adapter: adapter.validate(value, prompt_template))
+
+    def clean(self, value: str, prompt_template: str) -> str:
+        return self._hedged(lambda adapter: adapter.clean(value, prompt_template))
+
+    def validate_many(self, values: List[str], prompt_template: str) -> List[Tuple[bool, Optional[str]]]:
+        return self._route(lambda adapter: adapter.validate_many(values, prompt_template))
+
+    def clean_many(self, values: List[str], prompt_template: str) -> List[str]:
+        return self._route(lambda adapter: adapter.clean_many(values, prompt_template))
+
+    async def avalidate(self, value: str, prompt_template: str) -> Tuple[bool, Optional[str]]:
+        return await self._ahedged(lambda adapter: adapter.avalidate(value, prompt_template))
+
+    async def aclean(self, value: str, prompt_template: str) -> str:
+        return await self._ahedged(lambda adapter: adapter.aclean(value, prompt_template))
@@ -0,0 +1,50 @@
+from django.apps import apps
+from django.core.management.base import CommandError
+from ...cache import LLMCacheManager
+from ...fields import AICleanedField
+
+def get_model(label: str):
+    try:
+        return apps.get_model(label)
+    except (LookupError, ValueError):
+        raise CommandError(f"Unknown model '{label}'. Use the form app_label.ModelName.")
+
+def get_ai_fields(model, names=None) -> list:
+    """Return the ``AICleanedField``s of ``model`` with a cleaning prompt, optionally restricted to ``names``."""
+    ai_fields = {
+        field.name: field for field in model._meta.concrete_fields
+        if isinstance(field, AICleanedField) and field.cleaning_prompt
+    }
+    if not names:
+        if not ai_fields:
+            raise CommandError(f"{model._meta.label} has no AICleanedField with a cleaning_prompt.")
+        return list(ai_fields.values())
+    unknown = [name for name in names if name not in ai_fields]
+    if unknown:
+        raise CommandError(f"Not an AICleanedField with a cleaning_prompt on {model._meta.label}: {', '.join(unknown)}")
+    return [ai_fields[name] for name in names]
+
+class ThroughputReport:
+    """Tracks rows and cache activity of a bulk run for the final summary line."""
+    def __init__(self, clock):
+        self.clock = clock
+        self.started = clock()
+        self.rows = 0
+        self.updated = 0
+        self.failed = 0
+        self._stats_before = LLMCacheManager().stats()
+
+    def summary(self) -> str:
+        elapsed = max(self.clock() - self.started, 1e-9)
+        stats = LLMCacheManager().stats()
+        delta = {name: stats[name] - self._stats_before[name] for name in stats}
+        hits = delta['l1_hits'] + delta['l2_hits'] + delta['store_hits']
+        # Every L2 miss not found in the result store had to be sent to the provider
+        llm_calls = delta['l2_misses'] - delta['store_hits']
+        lookups = hits + llm_calls
+        hit_rate = hits / lookups if lookups else 0.0
+        return (
+            f"{self.rows} rows ({self.updated} updated, {self.failed} failed) in {elapsed:.1f}s: "
+            f"{self.rows / elapsed:.1f} rows/s, {llm_calls / elapsed:.1f} LLM calls/s, "
+            f"cache hit rate {hit_rate:.0%}"
+        )
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from ...fields import AICleanedField
+from ...llm.batch import get_batch_backend
+from ...models import AIBatchJob
+from ...pipeline import BatchPipeline
+from ._utils import get_model
+
+class Command(BaseCommand):
+    help = (
+        "Clean every distinct value of a field through a provider's batch API, for large offline runs. "
+        "Jobs are recorded in the database and can be resumed with --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', nargs='?', help="Field to clean, as app_label.ModelName.field.")
+        parser.add_argument('--backend', default=None, help="Batch backend: 'openai', 'anthropic', 'local' or a dotted path. Defaults to AI_CLEANER_DEFAULT_PROVIDER.")
+        parser.add_argument('--provider', default=None, help="Provider whose adapter builds the requests. Defaults to the backend's own.")
+        parser.add_argument('--prompt', default=None, help="Cleaning prompt. Defaults to the field's cleaning_prompt.")
+        parser.add_argument('--resume', type=int, default=None, metavar='JOB_ID', help="Continue an existing job instead of starting one.")
+        parser.add_argument('--no-wait', action='store_true', help="Poll a submitted batch once and exit instead of waiting for it.")
+        parser.add_argument('--poll-interval', type=float, default=60, help="Seconds between status checks while waiting.")
+        parser.add_argument('--timeout', type=float, default=None, help="Stop waiting after this many seconds; resume the job later.")
+        parser.add_argument('--chunk-size', type=int, default=500, help="Results written back per bulk_update.")
+
+    def handle(self, *args, **options):
+        job, backend = self._get_job(options)
+        pipeline = BatchPipeline(job, backend=backend, chunk_size=options['chunk_size'])
+        pipeline.run(wait=not options['no_wait'], poll_interval=options['poll_interval'], timeout=options['timeout'])
+
+        if job.status == AIBatchJob.STATUS_FAILED:
+            raise CommandError(f"Batch job {job.pk} failed: {job.error}")
+        if job.status == AIBatchJob.STATUS_APPLIED:
+            self.stdout.write(self.style.SUCCESS(
+                f"Batch job {job.pk} applied: {job.request_count} request(s), {job.rows_updated} row(s) updated, "
+                f"{job.failed_count} failed."
+            ))
+        else:
+            self.stdout.write(f"Batch job {job.pk} is {job.status}. Resume it with --resume {job.pk}.")
+
+    def _get_backend(self, name, provider):
+        try:
+            return get_batch_backend(name, provider or None)
+        except (ValueError, ImportError) as exc:
+            # Unknown backends and providers, or a provider SDK that is not installed
+            raise CommandError(str(exc))
+
+    def _get_job(self, options) -> tuple:
+        """The job to run and its batch backend; the backend is checked before a job is created."""
+        if options['resume'] is not None:
+            try:
+                job = AIBatchJob.objects.get(pk=options['resume'])
+            except AIBatchJob.DoesNotExist:
+                raise CommandError(f"Batch job {options['resume']} does not exist.")
+            return job, self._get_backend(job.backend, job.provider)
+
+        target = options['target']
+        label, _, field_name = (target or '').rpartition('.')
+        if not label:
+            raise CommandError("Give the field to clean as app_label.ModelName.field, or --resume a job.")
+        model = get_model(label)
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            raise CommandError(f"{model._meta.label} has no field '{field_name}'.")
+
+        prompt = options['prompt'] or (field.cleaning_prompt if isinstance(field, AICleanedField) else None)
+        if not prompt:
+            raise CommandError(f"{model._meta.label}.{field.name} has no cleaning prompt; pass --prompt.")
+        backend_name = options['backend'] or getattr(settings, 'AI_CLEANER_DEFAULT_PROVIDER', 'openai')
+        backend = self._get_backend(backend_name, options['provider'])
+        job = AIBatchJob.objects.create(
+            target=f"{model._meta.label}.{field.name}",
+            prompt_template=prompt,
+            backend=backend_name,
+            provider=options['provider'] or '',
+        )
+        return job, backend
@@ -0,0 +1,140 @@
+import time
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from ...cache import LLMCacheManager, cache_key_options
+from ...facade import AICleaningFacade
+from ...fields import AICleanedField
+from ...prefilters import run_cleaning_prefilters, run_validation_prefilters
+from ...validators import get_ai_validators
+from ._utils import get_model
+
+class WarmJob:
+    """One prompt to precompute results for: the field's cleaning prompt or one of its AI validators."""
+    def __init__(self, operation, prompt, facade, prefilters=None, normalizers=None, version=None, prepare=None):
+        self.operation = operation
+        self.prompt = prompt
+        self.facade = facade
+        self.prefilters = prefilters
+        self.normalizers = normalizers
+        self.version = version
+        self.prepare = prepare or str
+
+    def run(self, values, max_workers=None) -> tuple:
+        """Warm the cache for ``values``; returns (values sent to the facade, prefiltered, failed)."""
+        run_prefilters = run_cleaning_prefilters if self.operation == 'clean' else run_validation_prefilters
+        pending, prefiltered = [], 0
+        for value in values:
+            value = self.prepare(value)
+            if run_prefilters(self.prefilters, value) is None:
+                pending.append(value)
+            else:
+                prefiltered += 1
+        if not pending:
+            return 0, prefiltered, 0
+        run_distinct = self.facade.clean_distinct if self.operation == 'clean' else self.facade.validate_distinct
+        with cache_key_options(self.normalizers, self.version):
+            results = run_distinct(pending, self.prompt, max_workers=max_workers)
+        return len(pending), prefiltered, len(pending) - len(results)
+
+class Command(BaseCommand):
+    help = (
+        "Precompute and cache the AI results for the distinct values already stored in a model field, "
+        "e.g. after a deploy or before switching to a new prompt version."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', help="Field to warm, as app_label.ModelName.field.")
+        parser.add_argument('--operation', choices=['clean', 'validate'], default=None, help="Only warm cleaning or validation results. Defaults to both, where configured.")
+        parser.add_argument('--prompt', default=None, help="Warm this prompt instead of the configured one (requires a single operation and validator).")
+        parser.add_argument('--cache-version', default=None, help="Warm this cache version instead of the configured one.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Distinct values fetched and sent per chunk.")
+        parser.add_argument('--workers', type=int, default=None, help="Concurrent LLM requests. Defaults to AI_CLEANER_MAX_WORKERS.")
+        parser.add_argument('--provider', default=None, help="LLM provider. Defaults to the validator's or AI_CLEANER_DEFAULT_PROVIDER.")
+        parser.add_argument('--rate', type=float, default=None, help="Maximum values sent per second, to leave provider quota for live traffic.")
+        parser.add_argument('--limit', type=int, default=None, help="Warm at most this many distinct values.")
+
+    def handle(self, *args, **options):
+        model, field = self._get_field(options['target'])
+        jobs = self._get_jobs(field, options)
+
+        queryset = model._default_manager.order_by().values_list(field.attname, flat=True).distinct()
+        if options['limit']:
+            queryset = queryset[:options['limit']]
+
+        manager = LLMCacheManager()
+        stats_before = manager.stats()
+        started = time.monotonic()
+        totals = {'values': 0, 'sent': 0, 'prefiltered': 0, 'failed': 0}
+        chunk = []
+        for value in queryset.iterator(chunk_size=options['batch_size']):
+            if value in (None, ''):
+                continue
+            chunk.append(value)
+            if len(chunk) >= options['batch_size']:
+                self._warm_chunk(jobs, chunk, options, totals, started)
+                chunk = []
+        if chunk:
+            self._warm_chunk(jobs, chunk, options, totals, started)
+
+        stats = manager.stats()
+        cached = sum(stats[name] - stats_before[name] for name in ('l1_hits', 'l2_hits', 'store_hits'))
+        computed = totals['sent'] - totals['failed'] - cached
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {totals['values']} distinct value(s) for {len(jobs)} prompt(s) in {time.monotonic() - started:.1f}s: "
+            f"{max(computed, 0)} computed, {cached} already cached, {totals['prefiltered']} prefiltered, "
+            f"{totals['failed']} failed."
+        ))
+
+    def _get_field(self, target: str):
+        label, _, field_name = target.rpartition('.')
+        if not label:
+            raise CommandError("Give the field to warm as app_label.ModelName.field.")
+        model = get_model(label)
+        try:
+            return model, model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            raise CommandError(f"{model._meta.label} has no field '{field_name}'.")
+
+    def _get_jobs(self, field, options) -> list:
+        operation = options['operation']
+        jobs = []
+        if operation in (None, 'clean') and isinstance(field, AICleanedField) and field.cleaning_prompt:
+            jobs.append(WarmJob(
+                'clean', field.cleaning_prompt, AICleaningFacade(provider=options['provider']),
+                prefilters=field.prefilters, normalizers=field.cache_normalizers, version=field.cache_version,
+            ))
+        if operation in (None, 'validate'):
+            for validator in get_ai_validators(field.validators):
+                jobs.append(WarmJob(
+                    'validate', validator.prompt_template,
+                    AICleaningFacade(provider=options['provider'] or validator.provider, cascade=validator.cascade),
+                    prefilters=validator.prefilters, normalizers=validator.cache_normalizers,
+                    version=validator.cache_version, prepare=validator.prepare_data,
+                ))
+        if not jobs:
+            raise CommandError(f"{field.model._meta.label}.{field.name} has no AI cleaning prompt or AI validator to warm.")
+
+        if options['prompt'] is not None:
+            if len(jobs) > 1:
+                raise CommandError("--prompt needs a single prompt to replace; narrow it down with --operation.")
+            jobs[0].prompt = options['prompt']
+        if options['cache_version'] is not None:
+            for job in jobs:
+                job.version = options['cache_version']
+        return jobs
+
+    def _warm_chunk(self, jobs, chunk, options, totals, started):
+        totals['values'] += len(chunk)
+        for job in jobs:
+            sent, prefiltered, failed = job.run(chunk, max_workers=options['workers'])
+            totals['sent'] += sent
+            totals['prefiltered'] += prefiltered
+            totals['failed'] += failed
+
+        if options['rate']:
+            # Pace the run so it averages at most --rate values per second
+            ahead = totals['sent'] / options['rate'] - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+        if options['verbosity'] > 1:
+            self.stdout.write(f"Warmed {totals['values']} value(s) so far.")
@@ -0,0 +1,101 @@
+import json
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from ...facade import AICleaningFacade
+from ...fields import mark_cleaned
+from ._utils import ThroughputReport, get_ai_fields, get_model
+
+class Command(BaseCommand):
+    help = (
+        "Clean the AICleanedFields of every row of a model in bulk. Rows are streamed in "
+        "primary key order, identical values are cleaned once per chunk and written back "
+        "with bulk_update."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help="Model to clean, as app_label.ModelName.")
+        parser.add_argument('--field', action='append', dest='fields', help="Field to clean (repeatable). Defaults to every AICleanedField.")
+        parser.add_argument('--only-dirty', action='store_true', help="Only process rows flagged with is_dirty (AIDirtyMixin).")
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows fetched and written per chunk.")
+        parser.add_argument('--workers', type=int, default=None, help="Concurrent LLM requests. Defaults to AI_CLEANER_MAX_WORKERS.")
+        parser.add_argument('--provider', default=None, help="LLM provider. Defaults to AI_CLEANER_DEFAULT_PROVIDER.")
+        parser.add_argument('--start-after', default=None, help="Only process rows with a primary key greater than this.")
+        parser.add_argument('--checkpoint', default=None, help="File recording the last processed primary key, used to resume interrupted runs.")
+
+    def handle(self, *args, **options):
+        model = get_model(options['model'])
+        fields = get_ai_fields(model, options['fields'])
+        has_dirty_flag = any(field.name == 'is_dirty' for field in model._meta.concrete_fields)
+        if options['only_dirty'] and not has_dirty_flag:
+            raise CommandError(f"--only-dirty requires {model._meta.label} to have an is_dirty field (AIDirtyMixin).")
+
+        start_after = options['start_after']
+        if start_after is None and options['checkpoint'] and os.path.exists(options['checkpoint']):
+            with open(options['checkpoint']) as checkpoint:
+                start_after = json.load(checkpoint)['last_pk']
+            self.stdout.write(f"Resuming after primary key {start_after}.")
+
+        queryset = model._default_manager.order_by('pk')
+        if options['only_dirty']:
+            queryset = queryset.filter(is_dirty=True)
+        if start_after is not None:
+            queryset = queryset.filter(pk__gt=start_after)
+        has_dirty_reason = any(field.name == 'dirty_reason' for field in model._meta.concrete_fields)
+        only = [field.name for field in fields] + (['is_dirty'] if has_dirty_flag else [])
+        if has_dirty_reason:
+            only.append('dirty_reason')
+        queryset = queryset.only(*only)
+
+        facade = AICleaningFacade(provider=options['provider'])
+        report = ThroughputReport(time.monotonic)
+        chunk = []
+        for instance in queryset.iterator(chunk_size=options['batch_size']):
+            chunk.append(instance)
+            if len(chunk) >= options['batch_size']:
+                self._process_chunk(model, chunk, fields, has_dirty_flag, facade, options, report)
+                chunk = []
+        if chunk:
+            self._process_chunk(model, chunk, fields, has_dirty_flag, facade, options, report)
+
+        self.stdout.write(self.style.SUCCESS(report.summary()))
+
+    def _process_chunk(self, model, chunk, fields, has_dirty_flag, facade, options, report):
+        changed = {}
+        failed = set()
+        for field in fields:
+            values = [getattr(instance, field.attname) for instance in chunk]
+            cleaned = field.clean_values(values, facade, max_workers=options['workers'])
+            for instance, value in zip(chunk, values):
+                if not value:
+                    continue
+                if value not in cleaned:
+                    failed.add(instance.pk)
+                    continue
+                # AIQuerySet.bulk_update must not clean these values again
+                mark_cleaned(instance, field.attname, cleaned[value])
+                if cleaned[value] != value:
+                    setattr(instance, field.attname, cleaned[value])
+                    changed[instance.pk] = instance
+
+        update_fields = [field.name for field in fields]
+        if has_dirty_flag:
+            update_fields.append('is_dirty')
+            for instance in chunk:
+                # Rows quarantined or pending by AI validation keep their flag
+                if instance.pk not in failed and instance.is_dirty and not getattr(instance, 'dirty_reason', ''):
+                    instance.is_dirty = False
+                    changed[instance.pk] = instance
+
+        if changed:
+            model._default_manager.bulk_update(list(changed.values()), update_fields)
+
+        report.rows += len(chunk)
+        report.updated += len(changed)
+        report.failed += len(failed)
+
+        if options['checkpoint']:
+            with open(options['checkpoint'], 'w') as checkpoint:
+                json.dump({'last_pk': str(chunk[-1].pk)}, checkpoint)
+        if options['verbosity'] > 1:
+            self.stdout.write(f"Processed up to primary key {chunk[-1].pk}: {report.summary()}")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...store import ResultStore
+
+class Command(BaseCommand):
+    help = (
+        "Delete records from the durable AI result store by age, usage or prompt version. "
+        "Records matching every given criterion are deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=float, default=None, metavar='DAYS', help="Records not used for this many days.")
+        parser.add_argument('--min-hits', type=int, default=None, help="Records served from the store fewer than this many times.")
+        parser.add_argument('--prompt-version', default=None, help="Records of this prompt namespace (fingerprint[@version]).")
+        parser.add_argument('--keep', type=int, default=None, help="Records outside the KEEP most used ones.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many records would be deleted.")
+
+    def handle(self, *args, **options):
+        criteria = {name: options[name] for name in ('older_than', 'min_hits', 'prompt_version', 'keep')}
+        if all(value is None for value in criteria.values()):
+            raise CommandError("Give at least one of --older-than, --min-hits, --prompt-version or --keep.")
+
+        count = ResultStore().evict(
+            older_than_days=criteria['older_than'],
+            min_hits=criteria['min_hits'],
+            prompt_version=criteria['prompt_version'],
+            keep=criteria['keep'],
+            dry_run=options['dry_run'],
+        )
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {count} stored result(s)."))
@@ -0,0 +1,65 @@
+from django.db import models
+from django.db.models.expressions import Combinable
+from .facade import AICleaningFacade
+from .fields import AICleanedField, is_marked_cleaned, mark_cleaned
+
+class AIQuerySet(models.QuerySet):
+    """
+    QuerySet whose bulk writes clean ``AICleanedField``s in batches.
+
+    ``bulk_create`` and ``bulk_update`` collect the AI field values of every
+    object, clean each distinct value once through the batched, concurrent
+    facade path and then write everything in one go. ``update`` cleans the
+    plain values it is given. Fields with ``use_async=True`` are left alone.
+
+    Values that could not be cleaned go through ``AI_CLEANER_FAILURE_POLICY``
+    like a single save, so with ``'raise'`` nothing is written.
+    """
+    def _ai_fields(self, names=None) -> list:
+        return [
+            field for field in self.model._meta.concrete_fields
+            if isinstance(field, AICleanedField) and field.cleaning_prompt and not field.use_async
+            and (names is None or field.name in names or field.attname in names)
+        ]
+
+    def _clean_values(self, field, values) -> dict:
+        facade, errors = AICleaningFacade(), {}
+        cleaned = field.clean_values(values, facade, errors=errors)
+        for value, exc in errors.items():
+            cleaned[value] = facade._on_failure('clean', value, exc)
+        return cleaned
+
+    def _clean_objects(self, objs, fields):
+        for field in fields:
+            pending = [
+                (obj, getattr(obj, field.attname)) for obj in objs
+                if not is_marked_cleaned(obj, field.attname, getattr(obj, field.attname))
+            ]
+            cleaned = self._clean_values(field, [value for _, value in pending])
+            for obj, value in pending:
+                if value in cleaned:
+                    setattr(obj, field.attname, cleaned[value])
+                    # Keeps the field's pre_save (called by bulk_create) from cleaning it again
+                    mark_cleaned(obj, field.attname, cleaned[value])
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self._clean_objects(objs, self._ai_fields())
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        self._clean_objects(objs, self._ai_fields(fields))
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        for field in self._ai_fields(kwargs):
+            name = field.name if field.name in kwargs else field.attname
+            value = kwargs[name]
+            # Expressions such as F() are computed by the database and cannot be cleaned here
+            if value and not isinstance(value, Combinable):
+                kwargs[name] = self._clean_values(field, [value])[value]
+        return super().update(**kwargs)
+
+class AIManager(models.Manager.from_queryset(AIQuerySet)):
+    pass
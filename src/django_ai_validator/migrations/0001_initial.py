@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIResultRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Hash of the cache key and model.', max_length=64, unique=True)),
+                ('operation', models.CharField(blank=True, max_length=16)),
+                ('model', models.CharField(max_length=255)),
+                ('prompt_version', models.CharField(blank=True, help_text='Prompt fingerprint and optional version.', max_length=128)),
+                ('result', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='ai_result_last_used_idx'), models.Index(fields=['hit_count', 'last_used_at'], name='ai_result_usage_idx'), models.Index(fields=['prompt_version'], name='ai_result_prompt_idx')],
+            },
+        ),
+    ]
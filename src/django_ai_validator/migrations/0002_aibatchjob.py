@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_ai_validator', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIBatchJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target', models.CharField(help_text='Field to clean, as app_label.ModelName.field.', max_length=255)),
+                ('prompt_template', models.TextField()),
+                ('backend', models.CharField(max_length=255)),
+                ('provider', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('submitted', 'Submitted'), ('completed', 'Completed'), ('applied', 'Applied'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('batch_ids', models.JSONField(blank=True, default=list, help_text="The provider's ids for the submitted batches, in order.")),
+                ('request_count', models.PositiveIntegerField(default=0)),
+                ('results_applied', models.PositiveIntegerField(default=0, help_text='Results already written back.')),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('rows_updated', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status'], name='ai_batch_job_status_idx')],
+            },
+        ),
+    ]
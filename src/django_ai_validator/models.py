@@ -1,7 +1,121 @@
 from django.db import models
 
+PENDING_VALIDATION_REASON = "Pending AI validation."
+
 class AIDirtyMixin(models.Model):
+    """
+    Flags rows that need AI cleaning or validation.
+
+    Saving a row whose deferred validators (``deferred=True``) could not
+    decide a value marks it dirty and validates it in the background once
+    the transaction commits.
+    """
     is_dirty = models.BooleanField(default=False, help_text="Flag indicating if the data needs AI cleaning/validation.")
+    dirty_reason = models.TextField(blank=True, default='', help_text="Why the row is flagged, e.g. a failed AI validation.")
 
     class Meta:
         abstract = True
+
+    def save(self, *args, **kwargs):
+        from .validators import get_deferred_validations, recheck_failures
+        pending = get_deferred_validations(self)
+        failed_fields = self._failed_validation_fields()
+        reasons = []
+        if failed_fields:
+            # Values may have been corrected since they failed: check them again
+            reasons, undecided = recheck_failures(self, failed_fields)
+            pending += undecided
+
+        if pending:
+            self._set_dirty(True, PENDING_VALIDATION_REASON, kwargs)
+        elif reasons:
+            self._set_dirty(True, "\n".join(reasons), kwargs)
+        elif failed_fields or self.dirty_reason == PENDING_VALIDATION_REASON:
+            # Every value now passes, or can be decided without the provider
+            self._set_dirty(False, '', kwargs)
+        super().save(*args, **kwargs)
+        if pending:
+            from .tasks import enqueue_deferred_validation
+            # Failed fields are validated again too, so the verdict covers the whole row
+            enqueue_deferred_validation(self, sorted({field.name for field, _ in pending} | set(failed_fields)))
+
+    def _set_dirty(self, is_dirty, reason, save_kwargs):
+        self.is_dirty, self.dirty_reason = is_dirty, reason
+        if save_kwargs.get('update_fields') is not None:
+            save_kwargs['update_fields'] = {*save_kwargs['update_fields'], 'is_dirty', 'dirty_reason'}
+
+    def _failed_validation_fields(self) -> list:
+        """
+        Fields named by a ``dirty_reason`` that deferred validation wrote,
+        one ``"field: reason"`` line per failure. Empty for any other reason.
+        """
+        from .validators import get_ai_validators
+        if not self.dirty_reason or self.dirty_reason == PENDING_VALIDATION_REASON:
+            return []
+        validated = {field.name for field in self._meta.concrete_fields if get_ai_validators(field.validators)}
+        names = {line.partition(': ')[0] for line in self.dirty_reason.splitlines()}
+        return sorted(names) if names <= validated else []
+
+class AIResultRecord(models.Model):
+    """
+    Durable copy of a validation or cleaning result, consulted when the
+    cache tiers miss (see ``AI_CLEANER_RESULT_STORE``).
+    """
+    key = models.CharField(max_length=64, unique=True, help_text="Hash of the cache key and model.")
+    operation = models.CharField(max_length=16, blank=True)
+    model = models.CharField(max_length=255)
+    prompt_version = models.CharField(max_length=128, blank=True, help_text="Prompt fingerprint and optional version.")
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+    hit_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['last_used_at'], name='ai_result_last_used_idx'),
+            models.Index(fields=['hit_count', 'last_used_at'], name='ai_result_usage_idx'),
+            models.Index(fields=['prompt_version'], name='ai_result_prompt_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.operation or 'result'} {self.key[:12]} ({self.model})"
+
+class AIBatchJob(models.Model):
+    """
+    A provider batch-API cleaning run over one model field. Its status and
+    counters are the resume point: a job picks up from where it stopped.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SUBMITTED = 'submitted'
+    STATUS_COMPLETED = 'completed'
+    STATUS_APPLIED = 'applied'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SUBMITTED, 'Submitted'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_APPLIED, 'Applied'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    target = models.CharField(max_length=255, help_text="Field to clean, as app_label.ModelName.field.")
+    prompt_template = models.TextField()
+    backend = models.CharField(max_length=255)
+    provider = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    batch_ids = models.JSONField(default=list, blank=True, help_text="The provider's ids for the submitted batches, in order.")
+    request_count = models.PositiveIntegerField(default=0)
+    results_applied = models.PositiveIntegerField(default=0, help_text="Results already written back.")
+    failed_count = models.PositiveIntegerField(default=0)
+    rows_updated = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status'], name='ai_batch_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.target} via {self.backend} ({self.status})"
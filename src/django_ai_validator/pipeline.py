@@ -0,0 +1,186 @@
+import glob
+import hashlib
+import itertools
+import json
+import os
+import time
+from django.apps import apps
+from django.db.models import Value
+from .cache import LLMCacheManager, build_cache_key, cache_key_options, get_cache_timeout
+from .llm.batch import BATCH_COMPLETED, BATCH_FAILED, get_batch_backend, get_batch_dir
+from .models import AIBatchJob
+from .prefilters import run_cleaning_prefilters
+from .tasks import _tracking_values
+
+class BatchPipeline:
+    """
+    Cleans every distinct value of a field through a provider's batch API:
+    ``prepare`` writes the requests as JSONL, split to the backend's batch
+    limits, ``submit`` hands each file to the batch backend, ``poll`` waits
+    for every batch to complete and ``apply`` streams the results back into
+    the cache and the table with ``bulk_update``.
+
+    Each step records its progress on the ``AIBatchJob``, so ``run`` resumes
+    an interrupted job instead of paying for its requests again.
+    """
+    def __init__(self, job: AIBatchJob, backend=None, chunk_size: int = 500):
+        self.job = job
+        self.backend = backend or get_batch_backend(job.backend, job.provider or None)
+        self.chunk_size = chunk_size
+        app_label, model_name, field_name = job.target.split('.')
+        self.model = apps.get_model(app_label, model_name)
+        self.field = self.model._meta.get_field(field_name)
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(get_batch_dir(), f"job-{self.job.pk}")
+
+    def requests_path(self, index: int) -> str:
+        return os.path.join(self.directory, f'requests-{index:04d}.jsonl')
+
+    @property
+    def request_paths(self) -> list:
+        return sorted(glob.glob(os.path.join(self.directory, 'requests-*.jsonl')))
+
+    @property
+    def values_path(self) -> str:
+        # custom_id -> value, since batch results only carry the custom_id
+        return os.path.join(self.directory, 'values.jsonl')
+
+    def _save(self, **changes):
+        for name, value in changes.items():
+            setattr(self.job, name, value)
+        self.job.save(update_fields=[*changes, 'updated_at'])
+
+    def run(self, wait: bool = True, poll_interval: float = 60, timeout: float = None) -> AIBatchJob:
+        """Take the job as far as it can go; with ``wait=False`` a running batch is polled only once."""
+        if self.job.status == AIBatchJob.STATUS_PENDING:
+            if not self.job.batch_ids:
+                # Nothing was submitted yet, so the requests can be written afresh
+                self.prepare()
+            if not self.job.request_count:
+                self._save(status=AIBatchJob.STATUS_APPLIED)
+                return self.job
+            self.submit()
+        if self.job.status == AIBatchJob.STATUS_SUBMITTED:
+            if wait:
+                self.wait(poll_interval, timeout)
+            else:
+                self.poll()
+        if self.job.status == AIBatchJob.STATUS_COMPLETED:
+            self.apply()
+        return self.job
+
+    def prepare(self):
+        """
+        Write one request per distinct value that pre-filters cannot settle,
+        starting a new request file whenever the backend's limits are reached.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for path in self.request_paths:
+            os.remove(path)
+        queryset = self.model._default_manager.order_by().values_list(self.field.attname, flat=True).distinct()
+        prefilters = getattr(self.field, 'prefilters', None)
+        max_requests, max_bytes = self.backend.max_requests, self.backend.max_bytes
+        count, file_index, requests = 0, -1, None
+        try:
+            with open(self.values_path, 'w', encoding='utf-8') as values:
+                for value in queryset.iterator(chunk_size=self.chunk_size):
+                    if value in (None, '') or run_cleaning_prefilters(prefilters, value) is not None:
+                        continue
+                    custom_id = hashlib.sha256(value.encode('utf-8')).hexdigest()
+                    request = self.backend.build_request(custom_id, 'clean', value, self.job.prompt_template)
+                    line = (json.dumps(request, ensure_ascii=False) + '\n').encode('utf-8')
+                    if requests is None or (max_requests and file_count >= max_requests) or \
+                            (max_bytes and file_bytes + len(line) > max_bytes):
+                        if requests is not None:
+                            requests.close()
+                        file_index += 1
+                        requests = open(self.requests_path(file_index), 'wb')
+                        file_count, file_bytes = 0, 0
+                    requests.write(line)
+                    values.write(json.dumps([custom_id, value], ensure_ascii=False) + '\n')
+                    count += 1
+                    file_count += 1
+                    file_bytes += len(line)
+        finally:
+            if requests is not None:
+                requests.close()
+        self._save(request_count=count)
+
+    def submit(self):
+        """Submit the request files that have no batch yet, saving each batch id as soon as it exists."""
+        for path in self.request_paths[len(self.job.batch_ids):]:
+            self._save(batch_ids=[*self.job.batch_ids, self.backend.submit(path)])
+        self._save(status=AIBatchJob.STATUS_SUBMITTED)
+
+    def poll(self) -> str:
+        """The job is completed once every batch is, and failed as soon as one fails."""
+        states = [self.backend.poll(batch_id) for batch_id in self.job.batch_ids]
+        errors = [error or "The batch failed." for state, error in states if state == BATCH_FAILED]
+        if errors:
+            self._save(status=AIBatchJob.STATUS_FAILED, error="\n".join(errors))
+        elif all(state == BATCH_COMPLETED for state, _ in states):
+            self._save(status=AIBatchJob.STATUS_COMPLETED)
+        return self.job.status
+
+    def wait(self, poll_interval: float = 60, timeout: float = None):
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self.poll() == AIBatchJob.STATUS_SUBMITTED:
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            time.sleep(poll_interval)
+
+    def apply(self):
+        """Stream the results into the cache and the table, one chunk at a time."""
+        with open(self.values_path, encoding='utf-8') as manifest:
+            values = dict(json.loads(line) for line in manifest if line.strip())
+
+        chunk, position = {}, 0
+        # Batches are read in submission order, so positions stay stable across resumes
+        results = itertools.chain.from_iterable(
+            self.backend.results(batch_id, 'clean') for batch_id in self.job.batch_ids
+        )
+        for custom_id, cleaned in results:
+            position += 1
+            if position <= self.job.results_applied:
+                # Written back before the job was interrupted
+                continue
+            if cleaned is None or custom_id not in values:
+                self.job.failed_count += 1
+            else:
+                chunk[values[custom_id]] = cleaned
+            if position - self.job.results_applied >= self.chunk_size:
+                self._apply_chunk(chunk, position)
+                chunk = {}
+        self._apply_chunk(chunk, position)
+        self._save(status=AIBatchJob.STATUS_APPLIED)
+
+    def _apply_chunk(self, cleaned: dict, position: int):
+        if cleaned:
+            self._populate_cache(cleaned)
+            self.job.rows_updated += self._update_rows(cleaned)
+        self._save(
+            results_applied=position, failed_count=self.job.failed_count, rows_updated=self.job.rows_updated,
+        )
+
+    def _populate_cache(self, cleaned: dict):
+        # The same keys as the per-request path, so later saves are cache hits
+        with cache_key_options(getattr(self.field, 'cache_normalizers', None), getattr(self.field, 'cache_version', None)):
+            entries = {
+                build_cache_key('clean', self.job.prompt_template, value): result for value, result in cleaned.items()
+            }
+        LLMCacheManager().set_many(entries, self.backend.model, get_cache_timeout('clean'))
+
+    def _update_rows(self, cleaned: dict) -> int:
+        attname = self.field.attname
+        changed = {value: result for value, result in cleaned.items() if result != value}
+        if not changed:
+            return 0
+        updated = 0
+        for value, result in changed.items():
+            # Compare-and-set: rows edited since the job read them keep their new value.
+            # Value() also keeps an AIManager's update() from cleaning the result again.
+            updates = {attname: Value(result), **_tracking_values(self.model, self.field.name, result, self.job.prompt_template)}
+            updated += self.model._default_manager.filter(**{attname: value}).update(**updates)
+        return updated
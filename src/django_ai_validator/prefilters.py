@@ -0,0 +1,139 @@
+"""
+Deterministic pre-filters that resolve a validation or cleaning decision
+locally, before any LLM call is made.
+
+Each pre-filter may answer ``validate(value)`` with ``(is_valid, reason)`` and
+``clean(value)`` with the cleaned value, or return None to defer to the next
+pre-filter and finally to the LLM.
+"""
+import re
+from typing import Iterable, List, Optional, Tuple
+from django.utils.deconstruct import deconstructible
+from .instrumentation import record_prefilter
+
+class Prefilter:
+    def validate(self, value: str) -> Optional[Tuple[bool, Optional[str]]]:
+        return None
+
+    def clean(self, value: str) -> Optional[str]:
+        return None
+
+    def __eq__(self, other):
+        # Needed for migrations to detect unchanged validator and field arguments
+        return type(self) is type(other) and self.deconstruct() == other.deconstruct()
+
+    def __hash__(self):
+        return hash(repr(self.deconstruct()))
+
+@deconstructible
+class RegexPrefilter(Prefilter):
+    """
+    Decides values matching ``pattern``: valid when ``valid_on_match`` is
+    True, invalid with ``message`` otherwise. With ``full_match`` a matching
+    value is also considered already clean.
+    """
+    def __init__(self, pattern: str, valid_on_match: bool = True, message: str = None, full_match: bool = False, flags: int = 0):
+        self.pattern = pattern
+        self.valid_on_match = valid_on_match
+        self.message = message
+        self.full_match = full_match
+        self.flags = flags
+        self.regex = re.compile(pattern, flags)
+
+    def _matches(self, value: str) -> bool:
+        return bool(self.regex.fullmatch(value) if self.full_match else self.regex.search(value))
+
+    def validate(self, value):
+        if not self._matches(value):
+            return None
+        if self.valid_on_match:
+            return True, None
+        return False, self.message or "Value is not allowed."
+
+    def clean(self, value):
+        if self.full_match and self.valid_on_match and self._matches(value):
+            return value
+        return None
+
+@deconstructible
+class LengthPrefilter(Prefilter):
+    """Rejects values shorter than ``min_length`` or longer than ``max_length``."""
+    def __init__(self, min_length: int = None, max_length: int = None, message: str = None):
+        self.min_length = min_length
+        self.max_length = max_length
+        self.message = message
+
+    def validate(self, value):
+        if self.min_length is not None and len(value) < self.min_length:
+            return False, self.message or f"Value must be at least {self.min_length} characters long."
+        if self.max_length is not None and len(value) > self.max_length:
+            return False, self.message or f"Value must be at most {self.max_length} characters long."
+        return None
+
+@deconstructible
+class CharsetPrefilter(Prefilter):
+    """Rejects values containing characters outside ``allowed`` (a regex character class body, e.g. ``"A-Za-z0-9 "``)."""
+    def __init__(self, allowed: str, message: str = None):
+        self.allowed = allowed
+        self.message = message
+        self.regex = re.compile(f"[^{allowed}]")
+
+    def validate(self, value):
+        if self.regex.search(value):
+            return False, self.message or "Value contains characters that are not allowed."
+        return None
+
+@deconstructible
+class AllowListPrefilter(Prefilter):
+    """Accepts, and treats as already clean, values in ``values``."""
+    def __init__(self, values: Iterable[str], case_sensitive: bool = True):
+        self.values = list(values)
+        self.case_sensitive = case_sensitive
+        self._lookup = {self._normalize(value) for value in self.values}
+
+    def _normalize(self, value: str) -> str:
+        return value if self.case_sensitive else value.casefold()
+
+    def validate(self, value):
+        return (True, None) if self._normalize(value) in self._lookup else None
+
+    def clean(self, value):
+        return value if self._normalize(value) in self._lookup else None
+
+@deconstructible
+class DenyListPrefilter(AllowListPrefilter):
+    """Rejects values in ``values``."""
+    def __init__(self, values: Iterable[str], case_sensitive: bool = True, message: str = None):
+        super().__init__(values, case_sensitive)
+        self.message = message
+
+    def validate(self, value):
+        return (False, self.message or "Value is not allowed.") if self._normalize(value) in self._lookup else None
+
+    def clean(self, value):
+        return None
+
+@deconstructible
+class NormalFormPrefilter(RegexPrefilter):
+    """Treats values fully matching ``pattern`` as already in normal form, so they skip cleaning."""
+    def __init__(self, pattern: str, flags: int = 0):
+        super().__init__(pattern, full_match=True, flags=flags)
+
+    def validate(self, value):
+        return None
+
+def run_validation_prefilters(prefilters: List[Prefilter], value: str) -> Optional[Tuple[bool, Optional[str]]]:
+    for prefilter in prefilters or ():
+        decision = prefilter.validate(value)
+        if decision is not None:
+            record_prefilter('validate', prefilter)
+            return decision
+    return None
+
+def run_cleaning_prefilters(prefilters: List[Prefilter], value: str) -> Optional[str]:
+    for prefilter in prefilters or ():
+        cleaned = prefilter.clean(value)
+        if cleaned is not None:
+            record_prefilter('clean', prefilter)
+            return cleaned
+    return None
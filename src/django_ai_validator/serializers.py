@@ -0,0 +1,38 @@
+from .validators import get_ai_validators, prefetched_validations
+
+class AIConcurrentSerializerMixin:
+    """
+    Django REST Framework serializer mixin that runs every AI validator of the
+    serializer concurrently during ``is_valid()``.
+
+    Pending AI validations are dispatched in parallel up front; DRF's normal
+    validation then reuses the results and reports errors per field.
+    """
+    ai_max_workers = None
+
+    def get_ai_validation_work(self):
+        from rest_framework.fields import empty
+
+        pending = []
+        for field in self.fields.values():
+            if field.read_only:
+                continue
+            validators = get_ai_validators(field.validators)
+            if not validators:
+                continue
+            primitive = field.get_value(self.initial_data)
+            if primitive is empty or primitive is None:
+                continue
+            try:
+                value = field.to_internal_value(primitive)
+            except Exception:
+                # Invalid input never reaches the validators
+                continue
+            pending.extend((validator, value) for validator in validators)
+        return pending
+
+    def is_valid(self, *, raise_exception=False):
+        if not hasattr(self, 'initial_data'):
+            return super().is_valid(raise_exception=raise_exception)
+        with prefetched_validations(self.get_ai_validation_work(), max_workers=self.ai_max_workers):
+            return super().is_valid(raise_exception=raise_exception)
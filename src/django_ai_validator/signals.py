@@ -0,0 +1,34 @@
+from django.dispatch import Signal
+
+# Sent after every provider request made through CachingLLMProxy.
+# Arguments: provider, model, operation, prompt, duration, prompt_tokens,
+# completion_tokens, batch_size, error (the exception, or None).
+llm_request_finished = Signal()
+
+# Sent for every cache lookup made on behalf of a provider call.
+# Arguments: provider, model, operation, prompt, tier ('l1' or 'l2'), hit, count.
+llm_cache_lookup = Signal()
+
+# Sent when a provider request is retried.
+# Arguments: provider, model, operation, prompt, attempt, error.
+llm_request_retried = Signal()
+
+# Sent when the validation cascade decides whether to escalate.
+# Arguments: provider, model, operation, prompt, escalated, count.
+llm_cascade_decision = Signal()
+
+# Sent when a pre-filter decides a value locally, saving a provider call.
+# Arguments: operation, prefilter (the pre-filter instance).
+llm_call_prefiltered = Signal()
+
+# Sent when a Celery cleaning task starts.
+# Arguments: task, queue_wait (seconds between enqueueing and starting).
+cleaning_task_started = Signal()
+
+# Sent for each value checked by a deferred validator in the background.
+# Arguments: instance, field, value, is_valid, reason.
+deferred_validation_finished = Signal()
+
+# Sent when a validator is skipped because the latency budget is spent.
+# Arguments: validator, value, policy ('skip' or 'defer').
+validation_skipped = Signal()
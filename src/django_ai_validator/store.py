@@ -0,0 +1,120 @@
+"""
+Durable result store behind the cache tiers.
+
+When ``AI_CLEANER_RESULT_STORE`` is enabled, every result written to the
+cache is also saved as an ``AIResultRecord``, and cache misses are looked up
+there before a provider is called. Records never expire on their own; use
+the ``ai_evict_results`` command to prune them by age or usage.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Keeps ``key__in`` lookups under the parameter limits of every database backend
+LOOKUP_CHUNK_SIZE = 500
+
+def is_enabled() -> bool:
+    return getattr(settings, 'AI_CLEANER_RESULT_STORE', False)
+
+def describe(prompt: str) -> tuple:
+    """(operation, prompt namespace) of a cache key built by ``build_cache_key``."""
+    parts = prompt.split(':', 2)
+    if len(parts) != 3:
+        return '', ''
+    return parts[0].lower(), parts[1]
+
+def _decode(result):
+    # JSON turns (is_valid, reason) tuples into lists
+    return tuple(result) if isinstance(result, list) else result
+
+def _chunks(items: list):
+    for start in range(0, len(items), LOOKUP_CHUNK_SIZE):
+        yield items[start:start + LOOKUP_CHUNK_SIZE]
+
+class ResultStore:
+    """Reads and writes ``AIResultRecord``s by hashed cache key."""
+
+    @property
+    def records(self):
+        from .models import AIResultRecord
+        return AIResultRecord.objects
+
+    def get_many(self, keys: list) -> dict:
+        """Returns ``{key: result}`` for stored keys and bumps their usage counters."""
+        found = {}
+        for chunk in _chunks(list(keys)):
+            found.update(self.records.filter(key__in=chunk).values_list('key', 'result'))
+        if found:
+            for chunk in _chunks(list(found)):
+                self.records.filter(key__in=chunk).update(hit_count=F('hit_count') + 1, last_used_at=timezone.now())
+        return {key: _decode(result) for key, result in found.items()}
+
+    def set_many(self, entries: dict, model: str):
+        """Saves ``{(key, prompt): result}`` entries, replacing existing results."""
+        from .models import AIResultRecord
+        records = []
+        for (key, prompt), result in entries.items():
+            operation, prompt_version = describe(prompt)
+            records.append(AIResultRecord(
+                key=key, operation=operation, model=str(model), prompt_version=prompt_version, result=result,
+            ))
+        using = router.db_for_write(AIResultRecord)
+        features = connections[using].features
+        update_fields = ['result', 'model', 'operation', 'prompt_version']
+        # A savepoint keeps a failed write from breaking the caller's transaction
+        with transaction.atomic(using=using):
+            if features.supports_update_conflicts_with_target:
+                # PostgreSQL and SQLite: INSERT ... ON CONFLICT (key) DO UPDATE
+                self.records.db_manager(using).bulk_create(
+                    records, batch_size=LOOKUP_CHUNK_SIZE, update_conflicts=True,
+                    unique_fields=['key'], update_fields=update_fields,
+                )
+            elif features.supports_update_conflicts:
+                # MySQL and MariaDB: ON DUPLICATE KEY UPDATE, which takes no target
+                self.records.db_manager(using).bulk_create(
+                    records, batch_size=LOOKUP_CHUNK_SIZE, update_conflicts=True, update_fields=update_fields,
+                )
+            else:
+                for record in records:
+                    self.records.db_manager(using).update_or_create(
+                        key=record.key, defaults={name: getattr(record, name) for name in update_fields},
+                    )
+
+    async def aget(self, key: str):
+        record = await self.records.filter(key=key).values_list('result', flat=True).afirst()
+        if record is None:
+            return None
+        await self.records.filter(key=key).aupdate(hit_count=F('hit_count') + 1, last_used_at=timezone.now())
+        return _decode(record)
+
+    async def aset(self, key: str, prompt: str, model: str, result):
+        operation, prompt_version = describe(prompt)
+        await self.records.aupdate_or_create(
+            key=key,
+            defaults={'operation': operation, 'model': str(model), 'prompt_version': prompt_version, 'result': result},
+        )
+
+    def evict(self, older_than_days: float = None, min_hits: int = None, prompt_version: str = None,
+              keep: int = None, dry_run: bool = False) -> int:
+        """
+        Delete the records matching every given criterion: unused for
+        ``older_than_days``, hit fewer than ``min_hits`` times, stored for the
+        ``prompt_version`` namespace, or outside the ``keep`` most used.
+        Returns the number of records deleted, or that would be with ``dry_run``.
+        """
+        queryset = self.records.all()
+        if older_than_days is not None:
+            queryset = queryset.filter(last_used_at__lt=timezone.now() - timedelta(days=older_than_days))
+        if min_hits is not None:
+            queryset = queryset.filter(hit_count__lt=min_hits)
+        if prompt_version is not None:
+            queryset = queryset.filter(prompt_version=prompt_version)
+        if keep is not None:
+            kept = self.records.order_by('-hit_count', '-last_used_at').values_list('pk', flat=True)[:keep]
+            queryset = queryset.exclude(pk__in=list(kept))
+        if dry_run:
+            return queryset.count()
+        deleted, _ = queryset.delete()
+        return deleted
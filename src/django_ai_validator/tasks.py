@@ -1,8 +1,35 @@
 from celery import shared_task
 from django.apps import apps
 from django.conf import settings
+from django.db.models import Case, F, Value, When
 from django.utils.module_loading import import_string
 
+def _tracking_columns(Model, field_name) -> list:
+    """Columns written alongside a cleaned field: its fingerprint field and ``is_dirty``."""
+    columns = []
+    fingerprint_field = getattr(Model._meta.get_field(field_name), 'fingerprint_field', None)
+    if fingerprint_field:
+        columns.append(fingerprint_field)
+    if any(field.name == 'is_dirty' for field in Model._meta.concrete_fields):
+        columns.append('is_dirty')
+    return columns
+
+def _cleaned_dirty_flag(Model):
+    """
+    ``is_dirty`` once a row is cleaned. Rows with a ``dirty_reason``, such as
+    a failed or pending AI validation, stay flagged.
+    """
+    if not any(field.name == 'dirty_reason' for field in Model._meta.concrete_fields):
+        return False
+    return Case(When(dirty_reason='', then=Value(False)), default=F('is_dirty'))
+
+def _tracking_values(Model, field_name, cleaned_value, prompt_template) -> dict:
+    from .fields import content_fingerprint
+    values = {}
+    for column in _tracking_columns(Model, field_name):
+        values[column] = _cleaned_dirty_flag(Model) if column == 'is_dirty' else content_fingerprint(cleaned_value, prompt_template)
+    return values
+
 @shared_task
 def ai_clean_model_instance(app_label, model_name, instance_id, field_name, prompt_template):
     Model = apps.get_model(app_label, model_name)
@@ -11,19 +38,125 @@ def ai_clean_model_instance(app_label, model_name, instance_id, field_name, prom
     except Model.DoesNotExist:
         return f"Instance {instance_id} not found."
 
-    # Get LLM Client
-    from .llm.client import LLMClientFactory
-    client = LLMClientFactory.create()
-
     current_value = getattr(instance, field_name)
     if current_value:
-        cleaned_value = client.clean(current_value, prompt_template)
-        setattr(instance, field_name, cleaned_value)
-        
-        # If using AIDirtyMixin, we might want to clear the dirty flag
-        if hasattr(instance, 'is_dirty'):
-            instance.is_dirty = False
-            
-        instance.save()
+        from .facade import AICleaningFacade
+        cleaned_value = AICleaningFacade().clean(current_value, prompt_template)
+
+        # Write back with QuerySet.update() rather than save(): no post_save is
+        # sent (so cleaning doesn't re-trigger itself), only the cleaned columns
+        # are touched, and a value edited in the meantime is not overwritten.
+        updates = {field_name: cleaned_value, **_tracking_values(Model, field_name, cleaned_value, prompt_template)}
+        Model.objects.filter(pk=instance_id, **{field_name: current_value}).update(**updates)
         return f"Cleaned {field_name} for instance {instance_id}"
     return "No value to clean."
+
+class BatchCleaningError(Exception):
+    """Raised once the rows of a cleaning batch still fail after every retry."""
+    def __init__(self, field_name, pks):
+        # Both are kept as args, so the error survives pickling by the result backend
+        super().__init__(field_name, pks)
+        self.field_name, self.pks = field_name, pks
+
+    def __str__(self):
+        return f"Could not clean {self.field_name} for instances {self.pks}"
+
+@shared_task(bind=True, max_retries=5)
+def ai_clean_model_batch(self, app_label, model_name, field_name, prompt_template, instance_ids, enqueued_at=None):
+    """
+    Clean one field for a chunk of rows: fetch them with a single query, clean
+    each distinct value once (batched when the provider supports it) and
+    persist only the cleaned field, its fingerprint and ``is_dirty`` with one
+    ``update()`` per distinct value. Rows whose values failed are retried
+    with backoff, then ``BatchCleaningError`` names them.
+    """
+    from .instrumentation import record_queue_wait
+    record_queue_wait('ai_clean_model_batch', enqueued_at)
+
+    Model = apps.get_model(app_label, model_name)
+    rows = Model.objects.filter(pk__in=instance_ids).values_list('pk', field_name)
+
+    pks_by_value = {}
+    for pk, value in rows:
+        if value:
+            pks_by_value.setdefault(value, []).append(pk)
+    # Pre-filters resolve what they can locally; the rest is cleaned once per distinct value
+    errors = {}
+    cleaned = Model._meta.get_field(field_name).clean_values(pks_by_value, errors=errors)
+
+    updated = 0
+    for value, pks in pks_by_value.items():
+        if value not in cleaned:
+            continue
+        # Compare-and-set: rows edited since they were read keep their new value
+        updates = {field_name: cleaned[value], **_tracking_values(Model, field_name, cleaned[value], prompt_template)}
+        updated += Model.objects.filter(pk__in=pks, **{field_name: value}).update(**updates)
+
+    if errors:
+        from celery.utils.time import get_exponential_backoff_interval
+        failed_pks = [pk for value in errors for pk in pks_by_value[value]]
+        error = BatchCleaningError(field_name, failed_pks)
+        error.__cause__ = next(iter(errors.values()))
+        # Only the failed rows are retried, so cleaned values are not sent again
+        raise self.retry(
+            args=(app_label, model_name, field_name, prompt_template, failed_pks), exc=error,
+            countdown=get_exponential_backoff_interval(1, self.request.retries, 600, full_jitter=True),
+        )
+    return f"Cleaned {field_name} for {updated} of {len(instance_ids)} instances"
+
+def enqueue_deferred_validation(instance, field_names):
+    """Queue background validation of ``field_names`` once the current transaction commits."""
+    import time
+    from django.db import transaction
+    Model = type(instance)
+    args = (Model._meta.app_label, Model._meta.model_name, instance.pk, field_names)
+    transaction.on_commit(
+        lambda: ai_validate_deferred.delay(*args, enqueued_at=time.time()), using=instance._state.db
+    )
+
+# Provider errors are retried with backoff so the verdict is eventually written
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, retry_backoff_max=600, retry_kwargs={'max_retries': 5})
+def ai_validate_deferred(app_label, model_name, instance_id, field_names, enqueued_at=None):
+    """
+    Run the AI validators of a row's fields against the provider and
+    write the verdict back: ``is_dirty`` stays set with the failure reasons
+    in ``dirty_reason``, or both are cleared when every value passed.
+    """
+    from .budget import without_budget
+    from .instrumentation import record_queue_wait
+    from .models import PENDING_VALIDATION_REASON
+    from .signals import deferred_validation_finished
+    from .validators import format_failure, get_ai_validators
+    record_queue_wait('ai_validate_deferred', enqueued_at)
+
+    Model = apps.get_model(app_label, model_name)
+    try:
+        instance = Model._default_manager.get(pk=instance_id)
+    except Model.DoesNotExist:
+        return f"Instance {instance_id} not found."
+
+    checked, results = {}, []
+    # Run eagerly (e.g. CELERY_TASK_ALWAYS_EAGER), a request's latency budget must not apply
+    with without_budget():
+        for field_name in field_names:
+            field = Model._meta.get_field(field_name)
+            value = getattr(instance, field.attname)
+            checked[field.attname] = value
+            for validator in get_ai_validators(field.validators):
+                if not validator.should_skip(value):
+                    # Provider errors must retry the task, not write a failure-policy verdict
+                    is_valid, reason = validator.execute_llm_validation(validator.prepare_data(value), raise_errors=True)
+                    results.append((field, value, is_valid, validator.message or reason))
+
+    reasons = [format_failure(field, reason) for field, _, is_valid, reason in results if not is_valid]
+    # Rows flagged for another reason or edited in the meantime are left alone
+    rows = Model._default_manager.filter(pk=instance_id, dirty_reason=PENDING_VALIDATION_REASON, **checked)
+    if rows.update(is_dirty=bool(reasons), dirty_reason="\n".join(reasons)):
+        instance.is_dirty, instance.dirty_reason = bool(reasons), "\n".join(reasons)
+
+    # Sent after the write-back so receivers (e.g. quarantining invalid rows) have the last word
+    for field, value, is_valid, reason in results:
+        deferred_validation_finished.send(
+            sender=Model, instance=instance, field=field, value=value, is_valid=is_valid, reason=reason,
+        )
+    return f"Validated {len(field_names)} field(s) for instance {instance_id}: {len(reasons)} failed"
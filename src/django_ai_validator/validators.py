@@ -1,7 +1,20 @@
+import asyncio
+import contextvars
+from contextlib import contextmanager
 from django.core.validators import BaseValidator
 from django.core.exceptions import ValidationError
 from django.utils.deconstruct import deconstructible
+from .budget import budget_exhausted, get_budget, latency_budget
+from .cache import cache_key_options
+from .concurrency import run_concurrently
 from .facade import AICleaningFacade
+from .instrumentation import record_budget_skip
+from .prefilters import run_validation_prefilters
+
+# Results computed ahead of time by ``prefetched_validations``, keyed by
+# (id(validator), prepared value). None outside of a prefetch block.
+_prefetched_results = contextvars.ContextVar('ai_validator_prefetched_results', default=None)
+_NOT_PREFETCHED = object()
 
 class BaseAIValidator(BaseValidator):
     """
@@ -9,9 +22,24 @@ class BaseAIValidator(BaseValidator):
     """
     message = None  # Override BaseValidator's message to avoid limit_value dependency
 
-    def __init__(self, prompt_template, provider=None, message=None, code=None):
+    def __init__(
+        self, prompt_template, provider=None, message=None, code=None, cascade=False, prefilters=None,
+        cache_normalizers=None, cache_version=None, deferred=False, budget=None,
+    ):
         self.prompt_template = prompt_template
         self.provider = provider
+        self.cascade = cascade
+        # Deterministic checks that can decide a value without calling the LLM
+        self.prefilters = list(prefilters or [])
+        # Values equal after these normalizers share a cache entry; bumping
+        # the version starts a fresh cache namespace for this prompt
+        self.cache_normalizers = list(cache_normalizers) if cache_normalizers is not None else None
+        self.cache_version = cache_version
+        # Accept values the fast paths cannot decide and validate them in the
+        # background instead (see ``AIDirtyMixin``)
+        self.deferred = deferred
+        # Latency budget in seconds for this validator, within any request budget
+        self.budget = budget
         if code:
             self.code = code
         # BaseValidator expects a limit_value. We pass None, but then we must ensure
@@ -24,20 +52,163 @@ class BaseAIValidator(BaseValidator):
             return
 
         prepared_value = self.prepare_data(value)
-        is_valid, error_reason = self.execute_llm_validation(prepared_value)
+        with latency_budget(self.budget):
+            decision = self.decide(prepared_value)
+        if decision is None:
+            return
+        is_valid, error_reason = decision
         
         if not is_valid:
             self.handle_error(value, error_reason)
 
+    async def acall(self, value):
+        # Async variant of the Template Method, for use from async views/forms
+        if self.should_skip(value):
+            return
+
+        prepared_value = self.prepare_data(value)
+        with latency_budget(self.budget):
+            decision = await self.adecide(prepared_value)
+        if decision is None:
+            return
+        is_valid, error_reason = decision
+
+        if not is_valid:
+            self.handle_error(value, error_reason)
+
+    @classmethod
+    async def avalidate_fields(cls, checks):
+        """
+        Run several AI validators concurrently with ``asyncio.gather``.
+
+        ``checks`` maps a field name to a ``(validator, value)`` pair. Raises a
+        single ``ValidationError`` keyed by field name if any validator fails.
+        """
+        names = list(checks)
+        results = await asyncio.gather(
+            *(validator.acall(value) for validator, value in checks.values()),
+            return_exceptions=True,
+        )
+        errors = {}
+        for name, result in zip(names, results):
+            if isinstance(result, ValidationError):
+                errors[name] = result
+            elif isinstance(result, BaseException):
+                raise result
+        if errors:
+            raise ValidationError(errors)
+
     def should_skip(self, value):
         return value in (None, '')
 
     def prepare_data(self, value):
         return str(value)
 
-    def execute_llm_validation(self, value):
-        facade = AICleaningFacade(provider=self.provider)
-        return facade.validate(value, self.prompt_template)
+    def decide(self, value):
+        """
+        ``(is_valid, reason)`` for ``value``, or None when it is accepted
+        unchecked: deferred validators and spent latency budgets only use
+        the fast paths, and calls cut short by the budget are skipped.
+        """
+        decision = self._prefetched_decision(value)
+        if decision is not _NOT_PREFETCHED:
+            # Decided, or skipped and recorded, while prefetching
+            return decision
+        if self.deferred or budget_exhausted():
+            decision = self.fast_validation(value)
+            if decision is None and not self.deferred:
+                self.record_skip(value)
+            return decision
+        try:
+            return self.execute_llm_validation(value)
+        except Exception:
+            if not budget_exhausted():
+                raise
+            self.record_skip(value)
+            return None
+
+    async def adecide(self, value):
+        if self.deferred or budget_exhausted():
+            decision = await self.afast_validation(value)
+            if decision is None and not self.deferred:
+                self.record_skip(value)
+            return decision
+        try:
+            return await self.aexecute_llm_validation(value)
+        except Exception:
+            if not budget_exhausted():
+                raise
+            self.record_skip(value)
+            return None
+
+    def record_skip(self, value):
+        budget = get_budget()
+        budget.record_skip(self, value)
+        record_budget_skip(self, value, budget.on_exhausted)
+
+    def execute_llm_validation(self, value, raise_errors=False):
+        """
+        Validate ``value`` with the provider. Errors go through
+        ``AI_CLEANER_FAILURE_POLICY``, or propagate with ``raise_errors``.
+        """
+        decision = self._prefetched_decision(value)
+        if decision is not _NOT_PREFETCHED:
+            return decision
+        decision = run_validation_prefilters(self.prefilters, value)
+        if decision is not None:
+            return decision
+        facade = AICleaningFacade(provider=self.provider, cascade=self.cascade)
+        with self.cache_key_options():
+            if raise_errors:
+                return facade._get_client().validate(value, self.prompt_template)
+            return facade.validate(value, self.prompt_template)
+
+    async def aexecute_llm_validation(self, value):
+        decision = run_validation_prefilters(self.prefilters, value)
+        if decision is not None:
+            return decision
+        facade = AICleaningFacade(provider=self.provider, cascade=self.cascade)
+        with self.cache_key_options():
+            return await facade.avalidate(value, self.prompt_template)
+
+    def fast_validation(self, value):
+        """
+        Decide ``value`` from prefetched results, pre-filters or the cache
+        only. Returns None when only a provider call could decide it.
+        """
+        decision = self._prefetched_decision(value)
+        if decision is not _NOT_PREFETCHED:
+            return decision
+        decision = run_validation_prefilters(self.prefilters, value)
+        if decision is not None:
+            return decision
+        facade = AICleaningFacade(provider=self.provider, cascade=self.cascade)
+        with self.cache_key_options():
+            return facade.get_cached('validate', value, self.prompt_template)
+
+    async def afast_validation(self, value):
+        decision = run_validation_prefilters(self.prefilters, value)
+        if decision is not None:
+            return decision
+        facade = AICleaningFacade(provider=self.provider, cascade=self.cascade)
+        with self.cache_key_options():
+            return await facade.aget_cached('validate', value, self.prompt_template)
+
+    def _prefetched_decision(self, value):
+        """
+        The result prefetched for ``value``, or ``_NOT_PREFETCHED``. A call
+        that failed while prefetching raises its error here.
+        """
+        prefetched = _prefetched_results.get()
+        if prefetched is None or (id(self), value) not in prefetched:
+            return _NOT_PREFETCHED
+        result = prefetched[(id(self), value)]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def cache_key_options(self):
+        return cache_key_options(self.cache_normalizers, self.cache_version)
 
     def handle_error(self, value, error_reason):
         raise ValidationError(
@@ -52,7 +223,13 @@ class BaseAIValidator(BaseValidator):
             self.prompt_template == other.prompt_template and
             self.message == other.message and
             self.code == other.code and
-            self.provider == other.provider
+            self.provider == other.provider and
+            self.cascade == other.cascade and
+            self.prefilters == other.prefilters and
+            self.cache_normalizers == other.cache_normalizers and
+            self.cache_version == other.cache_version and
+            self.deferred == other.deferred and
+            self.budget == other.budget
         )
 
     def deconstruct(self):
@@ -65,6 +242,18 @@ class BaseAIValidator(BaseValidator):
             kwargs['message'] = self.message
         if self.code:
             kwargs['code'] = self.code
+        if self.cascade:
+            kwargs['cascade'] = self.cascade
+        if self.prefilters:
+            kwargs['prefilters'] = self.prefilters
+        if self.cache_normalizers is not None:
+            kwargs['cache_normalizers'] = self.cache_normalizers
+        if self.cache_version is not None:
+            kwargs['cache_version'] = self.cache_version
+        if self.deferred:
+            kwargs['deferred'] = self.deferred
+        if self.budget is not None:
+            kwargs['budget'] = self.budget
         return path, args, kwargs
 
 class AISemanticValidator(BaseAIValidator):
@@ -72,3 +261,91 @@ class AISemanticValidator(BaseAIValidator):
     Concrete implementation of the validator.
     """
     pass
+
+def get_ai_validators(validators):
+    return [validator for validator in validators if isinstance(validator, BaseAIValidator)]
+
+def format_failure(field, reason) -> str:
+    """One ``dirty_reason`` line for a failed validation of ``field``."""
+    return f"{field.name}: {' '.join(str(reason).splitlines())}"
+
+def recheck_failures(instance, field_names) -> tuple:
+    """
+    Re-check the AI validators of ``field_names`` from the fast paths only.
+    Returns ``(reasons, undecided)``: ``format_failure`` lines for the values
+    that fail, and the ``(field, validator)`` pairs only the provider can decide.
+    """
+    reasons, undecided = [], []
+    for field_name in field_names:
+        field = instance._meta.get_field(field_name)
+        value = getattr(instance, field.attname)
+        for validator in get_ai_validators(field.validators):
+            if validator.should_skip(value):
+                continue
+            decision = validator.fast_validation(validator.prepare_data(value))
+            if decision is None:
+                undecided.append((field, validator))
+            elif not decision[0]:
+                reasons.append(format_failure(field, validator.message or decision[1]))
+    return reasons, undecided
+
+def get_deferred_validations(instance) -> list:
+    """
+    ``(field, validator)`` pairs of ``instance`` left to check in the
+    background: deferred validators that cannot decide the current value
+    without calling the provider, and checks the latency budget deferred.
+    """
+    budget = get_budget()
+    pending = []
+    for field in instance._meta.concrete_fields:
+        value = getattr(instance, field.attname)
+        for validator in get_ai_validators(field.validators):
+            if validator.should_skip(value):
+                continue
+            prepared_value = validator.prepare_data(value)
+            if validator.deferred:
+                if validator.fast_validation(prepared_value) is None:
+                    pending.append((field, validator))
+            elif budget is not None and budget.is_deferred(validator, prepared_value):
+                pending.append((field, validator))
+    return pending
+
+@contextmanager
+def prefetched_validations(pending, max_workers=None):
+    """
+    Dispatch pending ``(validator, value)`` pairs in parallel on a bounded
+    thread pool. Inside the block, validators called with the same value
+    reuse the prefetched result instead of making their own LLM round-trip,
+    so the normal Django validation flow raises errors exactly as before.
+
+    Each call runs under its validator's ``budget=``, and once the latency
+    budget is spent the remaining pairs only use the fast paths and are
+    recorded as skipped, like a live call.
+    """
+    work = {}
+    for validator, value in pending:
+        # Deferred validators never wait on the provider during validation
+        if validator.deferred or validator.should_skip(value):
+            continue
+        prepared_value = validator.prepare_data(value)
+        work.setdefault((id(validator), prepared_value), (validator, prepared_value))
+
+    keys = list(work)
+    def prefetch(item):
+        validator, prepared_value = item
+        with latency_budget(validator.budget):
+            return validator.decide(prepared_value)
+
+    results = run_concurrently(
+        prefetch,
+        [work[key] for key in keys],
+        max_workers=max_workers,
+    )
+    # Failed calls keep their error, which the validator raises instead of calling again
+    prefetched = dict(zip(keys, results))
+
+    token = _prefetched_results.set(prefetched)
+    try:
+        yield
+    finally:
+        _prefetched_results.reset(token)